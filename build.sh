@@ -6,4 +6,6 @@ pip install -r nails-marketplace/project/requirements.txt
 
 PYTHON_EXEC="python nails-marketplace/project/manage.py"
 
-$PYTHON_EXEC collectstatic --no-input --clear
\ No newline at end of file
+$PYTHON_EXEC collectstatic --no-input --clear
+# Falla el build si un template referencia un estático que no quedó en el manifest
+$PYTHON_EXEC check --deploy --tag staticfiles --fail-level ERROR
@@ -1,4 +1,7 @@
+from decimal import Decimal
 from django.contrib import admin
+from django.db.models import Count, DecimalField, F, Sum
+from config.admin_tools import EstimatedCountPaginator
 from .models import Cart, CartItem
 
 
@@ -8,6 +11,10 @@ class CartItemInline(admin.TabularInline):
     extra = 0
     readonly_fields = ['added_at', 'get_subtotal_display']
     fields = ['product', 'quantity', 'get_subtotal_display', 'added_at']
+    autocomplete_fields = ['product']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('product')
     
     def get_subtotal_display(self, obj):
         if obj.id:
@@ -22,15 +29,32 @@ class CartAdmin(admin.ModelAdmin):
     list_display = ['user', 'get_items_count', 'get_total_display', 'created_at', 'updated_at']
     readonly_fields = ['created_at', 'updated_at', 'get_total_display']
     search_fields = ['user__username', 'user__email']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [CartItemInline]
     
+    def get_queryset(self, request):
+        """Cantidad de items y total calculados en la misma consulta del listado"""
+        return super().get_queryset(request).annotate(
+            items_count=Count('items'),
+            total_amount=Sum(
+                F('items__quantity') * F('items__product__price'),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+    
     def get_items_count(self, obj):
-        return obj.items.count()
+        return obj.items_count
     get_items_count.short_description = 'Cantidad de items'
+    get_items_count.admin_order_field = 'items_count'
     
     def get_total_display(self, obj):
-        return f"${obj.get_total():.2f}"
+        total = obj.total_amount if hasattr(obj, 'total_amount') else obj.get_total()
+        return f"${total or Decimal('0'):.2f}"
     get_total_display.short_description = 'Total'
+    get_total_display.admin_order_field = 'total_amount'
 
 
 @admin.register(CartItem)
@@ -40,7 +64,11 @@ class CartItemAdmin(admin.ModelAdmin):
     readonly_fields = ['added_at', 'get_subtotal_display']
     search_fields = ['cart__user__username', 'product__title']
     list_filter = ['added_at']
+    list_select_related = ['cart__user', 'product']
+    autocomplete_fields = ['cart', 'product']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     def get_subtotal_display(self, obj):
         return f"${obj.get_subtotal():.2f}"
-    get_subtotal_display.short_description = 'Subtotal'
\ No newline at end of file
+    get_subtotal_display.short_description = 'Subtotal'
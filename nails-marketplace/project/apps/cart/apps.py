@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 class CartConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.cart'  
+    name = 'apps.cart'
+
+    def ready(self):
+        """Importar signals cuando la app esté lista"""
+        import apps.cart.signals
@@ -0,0 +1,9 @@
+from .services import get_cart_count
+
+
+def cart(request):
+    """Agregar el contador del carrito al contexto de todos los templates"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {'cart_count': 0}
+    return {'cart_count': get_cart_count(user)}
@@ -17,7 +17,7 @@ class Cart(models.Model):
         """Calcular el total del carrito"""
         from decimal import Decimal
         total = Decimal('0.00')
-        for item in self.items.all():
+        for item in self.items.select_related('product'):
             total += item.get_subtotal()
         return total
 
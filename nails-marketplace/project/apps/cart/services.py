@@ -0,0 +1,66 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, F, Sum
+from apps.monitoring.metrics import record_cache
+from .models import CartItem
+
+
+# Contador de items del carrito que muestra el navbar
+CART_COUNT_CACHE_KEY = 'cart:count:{user_id}'
+CART_COUNT_TIMEOUT = 60 * 60 * 6
+
+
+def cart_count_cache_key(user_id):
+    """Clave de cache del contador del carrito de un usuario"""
+    return CART_COUNT_CACHE_KEY.format(user_id=user_id)
+
+
+def get_cart_count(user):
+    """
+    Cantidad de items en el carrito del usuario.
+    Se lee de cache; solo consulta la base si la entrada no existe.
+    """
+    key = cart_count_cache_key(user.pk)
+    count = cache.get(key)
+    record_cache('cart_count', count is not None)
+    if count is None:
+        count = CartItem.objects.filter(cart__user_id=user.pk).count()
+        cache.set(key, count, CART_COUNT_TIMEOUT)
+    return count
+
+
+def set_cart_count(user_id, count):
+    """Guardar el contador del carrito en cache"""
+    cache.set(cart_count_cache_key(user_id), count, CART_COUNT_TIMEOUT)
+    return count
+
+
+def invalidate_cart_count(user_id):
+    """Borrar el contador cacheado; el próximo get_cart_count lo recalcula"""
+    cache.delete(cart_count_cache_key(user_id))
+
+
+def refresh_cart_count(cart):
+    """
+    Recalcular el contador después de una escritura en el carrito.
+    Llamar desde cada vista que agrega, modifica o elimina items.
+    """
+    return set_cart_count(cart.user_id, cart.items.count())
+
+
+async def aget_cart_summary(user_id):
+    """
+    Resumen del carrito (items, unidades y total) en una sola consulta agregada.
+    Aprovecha para refrescar el contador cacheado del navbar.
+    """
+    summary = await CartItem.objects.filter(cart__user_id=user_id).aaggregate(
+        items=Count('id'),
+        units=Sum('quantity'),
+        amount=Sum(F('quantity') * F('product__price'), output_field=DecimalField(max_digits=12, decimal_places=2)),
+    )
+    await cache.aset(cart_count_cache_key(user_id), summary['items'], CART_COUNT_TIMEOUT)
+    return {
+        'items': summary['items'],
+        'quantity': summary['units'] or 0,
+        'total': (summary['amount'] or Decimal('0')).quantize(Decimal('0.01')),
+    }
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from apps.products.models import Product
+from apps.users.models import User
+from .models import Cart, CartItem
+from .services import invalidate_cart_count
+
+# Borrados en cascada desde estos modelos los cubren sus propios receivers
+CASCADE_ORIGINS = (Cart, User, Product)
+
+
+def invalidate_on_commit(user_id):
+    transaction.on_commit(lambda: invalidate_cart_count(user_id))
+
+
+@receiver(post_delete, sender=Cart)
+def cart_deleted(sender, instance, **kwargs):
+    invalidate_on_commit(instance.user_id)
+
+
+@receiver(pre_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    """Los carritos que tenían el producto pierden un item: una consulta por producto"""
+    for user_id in Cart.objects.filter(items__product=instance).values_list('user_id', flat=True):
+        invalidate_on_commit(user_id)
+
+
+def item_owner(item):
+    # Las vistas y el admin traen el item desde su carrito (cart.items, select_related)
+    cart = item._state.fields_cache.get('cart')
+    if cart is not None:
+        return cart.user_id
+    return Cart.objects.filter(pk=item.cart_id).values_list('user_id', flat=True).first()
+
+
+@receiver(post_save, sender=CartItem)
+def cart_item_saved(sender, instance, created, **kwargs):
+    """Un item nuevo cambia el contador del navbar; cambiar la cantidad no"""
+    if created:
+        invalidate_on_commit(item_owner(instance))
+
+
+@receiver(post_delete, sender=CartItem)
+def cart_item_deleted(sender, instance, origin=None, **kwargs):
+    if getattr(origin, 'model', type(origin)) in CASCADE_ORIGINS:
+        return
+    user_id = item_owner(instance)
+    if user_id is not None:
+        invalidate_on_commit(user_id)
@@ -1,3 +1,152 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from apps.users.authentication import ClaimsRefreshToken
+from apps.users.models import User
+from apps.products.models import Category, Product
+from .context_processors import cart as cart_context
+from .models import Cart, CartItem
+from .services import get_cart_count
 
-# Create your tests here.
+
+class CartCountCacheTests(TestCase):
+    """Contador del carrito cacheado para el navbar"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('compradora', 'compradora@example.com', 'clave-segura-123')
+        seller = User.objects.create_user('vendedora', 'vendedora@example.com', 'clave-segura-123')
+        category = Category.objects.create(name='Esmaltes', slug='esmaltes')
+        self.product = Product.objects.create(
+            seller=seller, category=category, title='Esmalte rosa',
+            description='Esmalte semipermanente', price='1500.00', stock=5
+        )
+
+    def test_context_processor_uses_cache(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        self.assertEqual(cart_context(request), {'cart_count': 0})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cart_context(request), {'cart_count': 0})
+
+    def test_add_and_remove_update_cached_count(self):
+        self.client.force_login(self.user)
+        self.assertEqual(get_cart_count(self.user), 0)
+
+        response = self.client.post(f'/cart/add/{self.product.id}/')
+        self.assertEqual(response.json()['cart_count'], 1)
+
+        # Agregar el mismo producto solo aumenta la cantidad
+        response = self.client.post(f'/cart/add/{self.product.id}/')
+        self.assertEqual(response.json()['cart_count'], 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cart_count(self.user), 1)
+
+        item = self.user.cart.items.get()
+        response = self.client.post(f'/cart/remove/{item.id}/')
+        self.assertEqual(response.json()['cart_count'], 0)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cart_count(self.user), 0)
+
+    def test_add_to_cart_query_count(self):
+        self.client.force_login(self.user)
+        # sesión + usuario + producto + carrito + item + INSERT del item (con savepoints) + COUNT
+        with self.assertNumQueries(12):
+            self.client.post(f'/cart/add/{self.product.id}/')
+        # Sumar cantidad no invalida el contador: sin COUNT ni lookup del carrito
+        with self.assertNumQueries(6), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/cart/add/{self.product.id}/')
+        self.assertEqual(response.json()['cart_count'], 1)
+
+    def test_cascade_deletes_invalidate_cached_count(self):
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.product)
+        self.assertEqual(get_cart_count(self.user), 1)
+
+        # Borrar el producto elimina el item por cascada, sin pasar por las vistas
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.delete()
+        self.assertEqual(get_cart_count(self.user), 0)
+
+        product = Product.objects.create(
+            seller=self.product.seller, category=self.product.category, title='Lima',
+            description='Lima 180', price='300.00', stock=5
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            CartItem.objects.create(cart=cart, product=product)
+        self.assertEqual(get_cart_count(self.user), 1)
+
+        # Borrar el carrito (o la usuaria) también
+        with self.captureOnCommitCallbacks(execute=True):
+            cart.delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_cart_count(self.user), 0)
+
+    def test_async_summary(self):
+        self.assertEqual(self.client.get('/api/v1/cart/summary/').status_code, 401)
+
+        self.client.force_login(self.user)
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.product, quantity=3)
+
+        response = self.client.get('/api/v1/cart/summary/')
+
+        self.assertEqual(response.json(), {'items': 1, 'quantity': 3, 'total': '4500.00'})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cart_count(self.user), 1)
+
+
+    async def test_async_summary_rejects_writes(self):
+        token = await sync_to_async(lambda: str(ClaimsRefreshToken.for_user(self.user).access_token))()
+        response = await self.async_client.post(
+            '/api/v1/cart/summary/', headers={'Authorization': f'Bearer {token}'}
+        )
+        self.assertEqual(response.status_code, 405)
+
+
+class CartAdminTests(TestCase):
+    """Listado de carritos: cantidad y total anotados, sin consultas por fila"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'clave-segura-123'))
+        seller = User.objects.create_user('vendedora', 'vendedora@example.com', 'clave-segura-123')
+        category = Category.objects.create(name='Esmaltes', slug='esmaltes')
+        self.products = [
+            Product.objects.create(
+                seller=seller, category=category, title=f'Esmalte {n}',
+                description='Esmalte semipermanente', price=f'{n + 1}000.00', stock=5
+            )
+            for n in range(2)
+        ]
+        self.add_carts(2)
+
+    def add_carts(self, count):
+        start = Cart.objects.count()
+        for n in range(start, start + count):
+            user = User.objects.create(username=f'compradora{n}', email=f'compradora{n}@example.com')
+            cart = Cart.objects.create(user=user)
+            CartItem.objects.create(cart=cart, product=self.products[0], quantity=2)
+            CartItem.objects.create(cart=cart, product=self.products[1], quantity=1)
+
+    def changelist(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/admin/cart/cart/')
+        return response, len(captured)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.changelist()  # primera carga: cachea permisos y content types
+        _, before = self.changelist()
+        self.add_carts(10)
+        response, after = self.changelist()
+
+        self.assertEqual(after, before)
+        cart = response.context['cl'].result_list[0]
+        self.assertEqual(cart.items_count, 2)
+        self.assertEqual(cart.total_amount, Decimal('4000.00'))
+        self.assertContains(response, '$4000.00')
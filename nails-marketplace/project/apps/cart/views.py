@@ -1,9 +1,11 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_safe
 from apps.products.models import Product
 from .models import Cart, CartItem
+from apps.users.authentication import get_request_user_id
+from .services import aget_cart_summary, refresh_cart_count, set_cart_count
 
 
 def cart_detail(request):
@@ -39,7 +41,7 @@ def add_to_cart(request, product_id):
         return JsonResponse({
             'success': True,
             'message': f'{product.title} agregado al carrito',
-            'cart_count': cart.total_items,
+            'cart_count': refresh_cart_count(cart),
             'item': {
                 'id': cart_item.id,
                 'product_id': product.id,
@@ -60,7 +62,7 @@ def update_cart_item(request, item_id):
     """Actualizar cantidad de un item"""
     try:
         cart_item = get_object_or_404(
-            CartItem,
+            CartItem.objects.select_related('cart'),
             id=item_id,
             cart__user=request.user
         )
@@ -78,7 +80,7 @@ def update_cart_item(request, item_id):
         return JsonResponse({
             'success': True,
             'message': message,
-            'cart_count': cart_item.cart.total_items,
+            'cart_count': refresh_cart_count(cart_item.cart),
             'subtotal': float(cart_item.cart.subtotal),
             'iva': float(cart_item.cart.iva),
             'total': float(cart_item.cart.total)
@@ -94,7 +96,7 @@ def remove_from_cart(request, item_id):
     """Eliminar item del carrito"""
     try:
         cart_item = get_object_or_404(
-            CartItem,
+            CartItem.objects.select_related('cart'),
             id=item_id,
             cart__user=request.user
         )
@@ -105,7 +107,7 @@ def remove_from_cart(request, item_id):
         return JsonResponse({
             'success': True,
             'message': 'Producto eliminado del carrito',
-            'cart_count': cart.total_items,
+            'cart_count': refresh_cart_count(cart),
             'subtotal': float(cart.subtotal),
             'iva': float(cart.iva),
             'total': float(cart.total)
@@ -160,6 +162,7 @@ def clear_cart(request):
     try:
         cart = Cart.objects.get(user=request.user)
         cart.items.all().delete()
+        set_cart_count(request.user.pk, 0)
         
         return JsonResponse({
             'success': True,
@@ -169,4 +172,13 @@ def clear_cart(request):
         return JsonResponse({
             'success': True,
             'message': 'El carrito ya estaba vacío'
-        })
\ No newline at end of file
+        })
+
+
+@require_safe
+async def cart_summary(request):
+    """Resumen del carrito para el navbar y el checkout (vista async)"""
+    user_id = await get_request_user_id(request)
+    if user_id is None:
+        return JsonResponse({'error': 'Autenticación requerida'}, status=401)
+    return JsonResponse(await aget_cart_summary(user_id))
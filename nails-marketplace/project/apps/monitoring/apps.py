@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.monitoring'
+    verbose_name = 'Monitoreo'
+
+    def ready(self):
+        """Instrumentar conexiones, cache, storage, templates y DRF"""
+        from django.db.backends.signals import connection_created
+        from .queries import install_dispatch
+        from .tracing import install
+        connection_created.connect(install_dispatch, dispatch_uid='monitoring_track_queries')
+        install()
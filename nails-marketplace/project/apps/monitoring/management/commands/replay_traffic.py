@@ -0,0 +1,124 @@
+import glob
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode
+from django.core.management.base import BaseCommand, CommandError
+from apps.monitoring.ndjson import read_records
+from apps.monitoring.traffic import REDACTED
+
+
+def replay_query(query_string):
+    """Query string grabado sin los parámetros redactados (su valor real no existe)"""
+    params = parse_qsl(query_string, keep_blank_values=True)
+    return urlencode([(name, value) for name, value in params if value != REDACTED], safe=',')
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Reproduce tráfico grabado por TrafficRecorderMiddleware contra una instancia local, '
+        'respetando los tiempos originales (acelerados con --speed), y reporta throughput '
+        'y latencia por ruta'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Archivos NDJSON (se aceptan globs)')
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Instancia contra la que reproducir')
+        parser.add_argument('--concurrency', type=int, default=8, help='Requests simultáneos como máximo')
+        parser.add_argument(
+            '--speed', type=float, default=1.0,
+            help='Aceleración respecto de los tiempos grabados (0 = lo más rápido posible)'
+        )
+        parser.add_argument('--methods', default='GET,HEAD', help='Métodos a reproducir (sin cuerpo no tiene sentido POST)')
+        parser.add_argument('--limit', type=int, default=0, help='Reproducir solo los primeros N requests')
+        parser.add_argument('--token', default='', help='JWT para los requests grabados como "jwt"')
+        parser.add_argument('--timeout', type=float, default=30, help='Timeout por request en segundos')
+
+    def handle(self, *args, **options):
+        paths = sorted({path for pattern in options['files'] for path in glob.glob(pattern)})
+        if not paths:
+            raise CommandError('No se encontraron archivos de tráfico')
+
+        methods = {method.strip().upper() for method in options['methods'].split(',')}
+        records = [record for record in read_records(paths) if record['m'] in methods]
+        if options['limit']:
+            records = records[:options['limit']]
+        if not records:
+            raise CommandError('No hay requests reproducibles en los archivos')
+
+        self.options = options
+        self.base_url = options['base_url'].rstrip('/')
+        self.results = defaultdict(list)
+        self.lock = threading.Lock()
+
+        self.stdout.write(
+            f'→ Reproduciendo {len(records)} requests de {len(paths)} archivo(s) contra {self.base_url} '
+            f'(concurrencia {options["concurrency"]}, velocidad {options["speed"] or "máxima"})'
+        )
+        start = time.perf_counter()
+        first = records[0]['t']
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            for record in records:
+                pool.submit(self.replay, record, start, first)
+        elapsed = time.perf_counter() - start
+
+        self.report(elapsed)
+
+    def replay(self, record, start, first):
+        """Esperar el momento que le corresponde al request y ejecutarlo"""
+        speed = self.options['speed']
+        if speed:
+            delay = start + (record['t'] - first) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        query = replay_query(record.get('q', ''))
+        url = self.base_url + record['p'] + (f'?{query}' if query else '')
+        request = urllib.request.Request(url, method=record['m'])
+        if record.get('a') == 'jwt' and self.options['token']:
+            request.add_header('Authorization', f"Bearer {self.options['token']}")
+
+        began = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.options['timeout']) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            status = error.code
+        except OSError:
+            status = 0
+        latency = (time.perf_counter() - began) * 1000
+
+        with self.lock:
+            self.results[record.get('r') or record['p']].append((latency, status))
+
+    def report(self, elapsed):
+        total = sum(len(samples) for samples in self.results.values())
+        errors = sum(1 for samples in self.results.values() for _, status in samples if status == 0 or status >= 500)
+
+        self.stdout.write(f"\n{'ruta':<40}{'req':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errores':>9}")
+        for route, samples in sorted(self.results.items(), key=lambda item: -len(item[1])):
+            latencies = [latency for latency, _ in samples]
+            route_errors = sum(1 for _, status in samples if status == 0 or status >= 500)
+            self.stdout.write(
+                f'{route[:39]:<40}{len(samples):>7}{len(samples) / elapsed:>9.1f}'
+                f'{percentile(latencies, 50):>9.1f}{percentile(latencies, 95):>9.1f}'
+                f'{percentile(latencies, 99):>9.1f}{route_errors:>9}'
+            )
+
+        all_latencies = [latency for samples in self.results.values() for latency, _ in samples]
+        style = self.style.SUCCESS if not errors else self.style.WARNING
+        self.stdout.write(style(
+            f'\n✓ {total} requests en {elapsed:.1f} s ({total / elapsed:.1f} req/s), '
+            f'p50 {statistics.median(all_latencies):.1f} ms, p95 {percentile(all_latencies, 95):.1f} ms, '
+            f'{errors} errores'
+        ))
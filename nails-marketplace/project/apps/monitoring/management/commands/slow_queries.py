@@ -0,0 +1,59 @@
+import time
+from collections import Counter
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.monitoring.ndjson import read_records
+
+
+class Command(BaseCommand):
+    help = 'Consultas lentas registradas (SLOW_QUERY_LOG_DIR) agrupadas por forma, ordenadas por tiempo total'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Cantidad de consultas a mostrar')
+        parser.add_argument('--hours', type=float, default=0, help='Solo registros de las últimas N horas (0 = todos)')
+        parser.add_argument('--plans', action='store_true', help='Mostrar el último plan de cada consulta')
+        parser.add_argument('--dir', default=None, help='Directorio de logs (default: SLOW_QUERY_LOG_DIR)')
+
+    def handle(self, *args, **options):
+        directory = Path(options['dir'] or settings.SLOW_QUERY_LOG_DIR)
+        records = read_records(sorted(directory.glob('slow-queries-*.ndjson*'))) if directory.is_dir() else []
+        if options['hours']:
+            since = time.time() - options['hours'] * 3600
+            records = [record for record in records if record['t'] >= since]
+        if not records:
+            self.stdout.write(self.style.WARNING(f'No hay consultas lentas registradas en {directory}'))
+            return
+
+        groups = {}
+        for record in records:
+            group = groups.setdefault((record['db'], record['sql']), {
+                'count': 0, 'total': 0.0, 'max': 0.0, 'routes': Counter(), 'callers': Counter(), 'plan': '',
+            })
+            group['count'] += 1
+            group['total'] += record['ms']
+            group['max'] = max(group['max'], record['ms'])
+            group['routes'][record['route'] or record['view'] or '-'] += 1
+            if record['caller']:
+                group['callers'][record['caller']] += 1
+            group['plan'] = record['plan'] or group['plan']
+
+        worst = sorted(groups.items(), key=lambda item: -item[1]['total'])[:options['limit']]
+        self.stdout.write(
+            f'{len(records)} consultas lentas, {len(groups)} formas distintas. '
+            f'Top {len(worst)} por tiempo total:\n'
+        )
+        for rank, ((db, sql), group) in enumerate(worst, 1):
+            self.stdout.write(self.style.WARNING(
+                f"{rank}. {group['total']:.1f} ms en total · {group['count']}x · "
+                f"media {group['total'] / group['count']:.1f} ms · máx {group['max']:.1f} ms · {db}"
+            ))
+            route, _ = group['routes'].most_common(1)[0]
+            self.stdout.write(f'   ruta: {route}')
+            if group['callers']:
+                self.stdout.write(f"   origen: {group['callers'].most_common(1)[0][0]}")
+            self.stdout.write(f'   {sql[:400]}')
+            if options['plans'] and group['plan']:
+                for line in group['plan'].splitlines():
+                    self.stdout.write(f'     | {line}')
+            self.stdout.write('')
@@ -0,0 +1,236 @@
+"""
+Registro de métricas en proceso, expuesto en formato de texto de Prometheus.
+
+Contadores e histogramas de buckets fijos en memoria (un lock, sin I/O por request).
+Con METRICS_DIR configurado cada proceso vuelca su registro a metrics-<pid>.json
+cada METRICS_FLUSH_SECONDS, y el endpoint suma los archivos de todos los workers.
+Los archivos de workers que terminaron se consolidan en metrics-archive.json
+(hook child_exit de gunicorn.conf.py) para que los contadores no retrocedan.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from django.conf import settings
+
+# nombre: (tipo, descripción)
+METRICS = {
+    'http_requests_total': ('counter', 'Requests HTTP atendidos por ruta, método y status'),
+    'http_request_duration_seconds': ('histogram', 'Latencia de los requests por ruta'),
+    'db_queries_per_request': ('histogram', 'Consultas SQL por request, por ruta'),
+    'db_queries_total': ('counter', 'Consultas SQL ejecutadas por ruta'),
+    'db_query_duration_seconds_total': ('counter', 'Tiempo total en consultas SQL por ruta'),
+    'db_slow_queries_total': ('counter', 'Consultas que superaron SLOW_QUERY_MS por ruta'),
+    'cache_requests_total': ('counter', 'Lecturas de cache por cache y resultado (hit/miss)'),
+}
+
+BUCKETS = {
+    'http_request_duration_seconds': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    'db_queries_per_request': (1, 2, 5, 10, 20, 30, 50, 100),
+}
+
+ARCHIVE_FILE = 'metrics-archive.json'
+
+
+def labels_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class MetricsRegistry:
+    """Contadores, histogramas y gauges de un proceso"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        # (nombre, labels): [conteo por bucket..., conteo +Inf, suma]
+        self.histograms = {}
+        # nombre: (descripción, callback sin argumentos que devuelve el valor actual)
+        self.gauges = {}
+        self.last_flush = time.monotonic()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, labels_key(labels))
+        with self.lock:
+            self.counters[key] += value
+
+    def observe(self, name, value, **labels):
+        key = (name, labels_key(labels))
+        buckets = BUCKETS[name]
+        index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+        with self.lock:
+            entry = self.histograms.get(key)
+            if entry is None:
+                entry = self.histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def register_gauge(self, name, help_text, callback):
+        """Gauge leído al momento del scrape (profundidad de colas, buffers, etc.)"""
+        self.gauges[name] = (help_text, callback)
+
+    def snapshot(self):
+        """Estado serializable del registro"""
+        gauges = []
+        for name, (_, callback) in self.gauges.items():
+            try:
+                gauges.append([name, [], float(callback())])
+            except Exception:
+                continue
+        with self.lock:
+            return {
+                'pid': os.getpid(),
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(entry)] for (name, labels), entry in self.histograms.items()],
+                'gauges': gauges,
+            }
+
+    def flush(self, force=False):
+        """Volcar el registro a METRICS_DIR (como mucho cada METRICS_FLUSH_SECONDS)"""
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_flush < settings.METRICS_FLUSH_SECONDS:
+            return
+        self.last_flush = now
+        write_json(Path(directory) / f'metrics-{os.getpid()}.json', self.snapshot())
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+registry = MetricsRegistry()
+
+
+def record_cache(cache_name, hit):
+    registry.inc('cache_requests_total', cache=cache_name, result='hit' if hit else 'miss')
+
+
+def write_json(path, data):
+    # Escritura atómica: el endpoint nunca lee un archivo a medio escribir
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_text(json.dumps(data, separators=(',', ':')))
+    os.replace(tmp, path)
+
+
+def read_json(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def merge(snapshots):
+    """Sumar contadores e histogramas de varios procesos (gauges solo de procesos vivos)"""
+    counters = defaultdict(float)
+    histograms = {}
+    gauges = defaultdict(float)
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get('counters', []):
+            counters[(name, tuple(map(tuple, labels)))] += value
+        for name, labels, entry in snapshot.get('histograms', []):
+            key = (name, tuple(map(tuple, labels)))
+            current = histograms.setdefault(key, [0] * len(entry))
+            for i, value in enumerate(entry):
+                current[i] += value
+        pid = snapshot.get('pid')
+        if pid == os.getpid() or (pid and process_alive(pid)):
+            for name, labels, value in snapshot.get('gauges', []):
+                gauges[(name, tuple(map(tuple, labels)))] += value
+    return counters, histograms, gauges
+
+
+def collect():
+    """Métricas de todos los procesos: el propio en vivo más los archivos de METRICS_DIR"""
+    snapshots = [registry.snapshot()]
+    if settings.METRICS_DIR:
+        registry.flush(force=True)
+        own = f'metrics-{os.getpid()}.json'
+        for path in Path(settings.METRICS_DIR).glob('metrics-*.json'):
+            if path.name != own:
+                snapshot = read_json(path)
+                if snapshot:
+                    snapshots.append(snapshot)
+    return merge(snapshots)
+
+
+def archive_process(pid, directory=None):
+    """Consolidar el archivo de un worker que terminó en metrics-archive.json"""
+    directory = Path(directory or settings.METRICS_DIR)
+    path = directory / f'metrics-{pid}.json'
+    snapshot = read_json(path)
+    if snapshot is None:
+        return
+    archive = read_json(directory / ARCHIVE_FILE) or {}
+    counters, histograms, _ = merge([archive, snapshot])
+    write_json(directory / ARCHIVE_FILE, {
+        'pid': None,
+        'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(labels), entry] for (name, labels), entry in histograms.items()],
+        'gauges': [],
+    })
+    path.unlink(missing_ok=True)
+
+
+def clear_directory(directory):
+    """Borrar los archivos de una corrida anterior (al arrancar el master)"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob('*metrics-*.json*'):
+        path.unlink(missing_ok=True)
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(counters, histograms, gauges):
+    """Texto en formato de exposición de Prometheus (0.0.4)"""
+    by_name = defaultdict(list)
+    for (name, labels), value in {**counters, **gauges}.items():
+        by_name[name].append((labels, value))
+    for (name, labels), entry in histograms.items():
+        by_name[name].append((labels, entry))
+
+    lines = []
+    for name in sorted(by_name):
+        kind, help_text = METRICS.get(name) or ('gauge', registry.gauges.get(name, ('',))[0])
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name[name], key=lambda item: item[0]):
+            if kind != 'histogram':
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS[name] + ('+Inf',), value[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels, [("le", bound)])} {format_value(cumulative)}')
+            lines.append(f'{name}_sum{format_labels(labels)} {format_value(value[-1])}')
+            lines.append(f'{name}_count{format_labels(labels)} {format_value(cumulative)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,261 @@
+import logging
+import random
+import time
+from django.conf import settings
+from config.middleware import HybridMiddleware
+from .metrics import registry
+from .profiling import RequestProfile, _profile_lock, aprofile_requested, profile_requested
+from .queries import QueryStats, track_queries
+from .slow_queries import SlowQueryLogger
+from .tracing import SERVER, Span, Trace, TraceQueries, parse_traceparent, write_trace
+from .traffic import TrafficLog, auth_class, redact_path, redact_query
+
+logger = logging.getLogger('apps.monitoring')
+
+
+def route_name(request):
+    """Nombre de la ruta resuelta (o el path si no resolvió)"""
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else request.path
+
+
+class TracingMiddleware(HybridMiddleware):
+    """
+    Traza una fracción TRACE_SAMPLE_RATE de los requests, o los que llegan con un
+    traceparent muestreado (se continúa esa traza). Ver apps/monitoring/tracing.py.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        root = self.start(request)
+        if root is None:
+            return self.get_response(request)
+        with root, track_queries(TraceQueries()):
+            response = self.get_response(request)
+        self.finish(request, response, root)
+        return response
+
+    async def __acall__(self, request):
+        root = self.start(request)
+        if root is None:
+            return await self.get_response(request)
+        with root, track_queries(TraceQueries()):
+            response = await self.get_response(request)
+        self.finish(request, response, root)
+        return response
+
+    def start(self, request):
+        """Span raíz del request, o None si no se traza"""
+        parent = parse_traceparent(request.META.get('HTTP_TRACEPARENT', ''))
+        if parent and parent[2]:
+            trace, parent_id = Trace(parent[0]), parent[1]
+        elif settings.TRACE_SAMPLE_RATE and random.random() < settings.TRACE_SAMPLE_RATE:
+            trace, parent_id = Trace(), None
+        else:
+            return None
+        return Span(trace, parent_id, request.method, SERVER, {
+            'http.request.method': request.method,
+            'url.path': request.path,
+        })
+
+    def finish(self, request, response, root):
+        route = route_name(request)
+        root.name = f'{request.method} {route}'
+        root.set(**{'http.route': route, 'http.response.status_code': response.status_code})
+        write_trace(root.trace, root)
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """
+    Latencia, status y consultas SQL por ruta en el registro de métricas.
+    Va antes de QueryBudgetMiddleware para leer request.query_stats.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, elapsed):
+        # Las rutas que no resuelven van juntas: un scanner no debe crear una serie por path
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else '<unmatched>'
+        registry.inc('http_requests_total', route=route, method=request.method, status=response.status_code)
+        registry.observe('http_request_duration_seconds', elapsed, route=route)
+
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            registry.observe('db_queries_per_request', stats.count, route=route)
+            registry.inc('db_queries_total', stats.count, route=route)
+            registry.inc('db_query_duration_seconds_total', stats.duration, route=route)
+
+        registry.flush()
+
+
+class QueryBudgetMiddleware(HybridMiddleware):
+    """
+    Cuenta consultas y tiempo de base por request.
+
+    - Header Server-Timing (db y app) si SERVER_TIMING_HEADER está activo
+    - Warning si la ruta supera su presupuesto (QUERY_BUDGETS / QUERY_BUDGET_DEFAULT)
+    - Warning por cada forma de SQL repetida N_PLUS_ONE_THRESHOLD veces o más
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = request.query_stats = QueryStats()
+        start = time.perf_counter()
+        with track_queries(stats):
+            response = self.get_response(request)
+        self.finish(request, response, stats, (time.perf_counter() - start) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        stats = request.query_stats = QueryStats()
+        start = time.perf_counter()
+        with track_queries(stats):
+            response = await self.get_response(request)
+        self.finish(request, response, stats, (time.perf_counter() - start) * 1000)
+        return response
+
+    def finish(self, request, response, stats, elapsed_ms):
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = (
+                f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", '
+                f'app;dur={elapsed_ms:.1f}'
+            )
+        self.check_budget(request, stats)
+
+    def check_budget(self, request, stats):
+        route = route_name(request)
+        budget = settings.QUERY_BUDGETS.get(route, settings.QUERY_BUDGET_DEFAULT)
+        if stats.count > budget:
+            logger.warning(
+                'Presupuesto de consultas excedido en %s (%s %s): %d > %d\n%s',
+                route, request.method, request.path, stats.count, budget, stats.report()
+            )
+
+        for shape, times in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+            logger.warning('Posible N+1 en %s: %dx %s', route, times, shape[:300])
+
+
+class SlowQueryMiddleware(HybridMiddleware):
+    """Registra las consultas del request que superan SLOW_QUERY_MS (0 = apagado)"""
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.SLOW_QUERY_MS:
+            return self.get_response(request)
+        with track_queries(SlowQueryLogger(request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not settings.SLOW_QUERY_MS:
+            return await self.get_response(request)
+        with track_queries(SlowQueryLogger(request)):
+            return await self.get_response(request)
+
+
+class TrafficRecorderMiddleware(HybridMiddleware):
+    """
+    Graba una muestra (TRAFFIC_RECORD_RATE) de los requests en NDJSON para
+    reproducirlos con replay_traffic. Con rate 0 no hace nada.
+    Las páginas de cuentas (allauth) no se graban: llevan claves de reseteo y de
+    confirmación en el path y no tiene sentido reproducirlas.
+    """
+    IGNORED_PREFIXES = ('/static/', '/media/', '/admin/', '/accounts/', '/api-auth/')
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.log = TrafficLog()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled(request):
+            return self.get_response(request)
+
+        started = time.time()
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, started, start)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled(request):
+            return await self.get_response(request)
+
+        started = time.time()
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, started, start)
+        return response
+
+    def sampled(self, request):
+        rate = settings.TRAFFIC_RECORD_RATE
+        return bool(rate) and random.random() < rate and not request.path.startswith(self.IGNORED_PREFIXES)
+
+    def record(self, request, response, started, start):
+        self.log.write({
+            't': round(started, 3),
+            'm': request.method,
+            'p': redact_path(request),
+            'q': redact_query(request.META.get('QUERY_STRING', '')),
+            'r': route_name(request),
+            'a': auth_class(request),
+            's': response.status_code,
+            'd': round((time.perf_counter() - start) * 1000, 1),
+        })
+
+
+class ProfilerMiddleware(HybridMiddleware):
+    """
+    Perfila el request cuando lo pide staff (X-Profile: 1 o ?_profile=1) o cae en el
+    muestreo de PROFILER_SAMPLE_EVERY. Va al final de MIDDLEWARE: el perfil cubre la
+    vista, el render de templates y la serialización de DRF. Devuelve X-Profile-Id.
+    En una vista async se perfila el thread del event loop: el perfil incluye lo
+    que corran los otros requests de ese worker mientras tanto.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        # Un perfil a la vez por proceso; si hay otro en curso el request sigue normal
+        if not profile_requested(request) or not _profile_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            with RequestProfile() as profile:
+                response = self.get_response(request)
+            response['X-Profile-Id'] = profile.save(route_name(request))
+        finally:
+            _profile_lock.release()
+        return response
+
+    async def __acall__(self, request):
+        if not await aprofile_requested(request) or not _profile_lock.acquire(blocking=False):
+            return await self.get_response(request)
+        try:
+            with RequestProfile() as profile:
+                response = await self.get_response(request)
+            response['X-Profile-Id'] = profile.save(route_name(request))
+        finally:
+            _profile_lock.release()
+        return response
@@ -0,0 +1,60 @@
+"""
+Archivos NDJSON rotativos por proceso, para los registros de monitoreo
+(tráfico grabado, consultas lentas).
+"""
+import json
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from django.conf import settings
+
+
+class NdjsonLog:
+    """
+    Archivo NDJSON rotativo por proceso (<prefix>-<pid>.ndjson), configurado con
+    <SETTING>_LOG_DIR, <SETTING>_LOG_MAX_BYTES y <SETTING>_LOG_BACKUPS.
+    Un archivo por worker evita que dos procesos roten el mismo archivo.
+    """
+
+    def __init__(self, setting, prefix):
+        self.setting = setting
+        self.prefix = prefix
+        self.opened = None
+        self.logger = None
+
+    def get_logger(self):
+        # Con preload_app el objeto se crea en el master: abrir el archivo en cada worker
+        # (y de nuevo si cambia el directorio, p. ej. con override_settings)
+        directory = Path(getattr(settings, f'{self.setting}_LOG_DIR'))
+        pid = os.getpid()
+        if self.opened != (pid, directory):
+            self.opened = (pid, directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                directory / f'{self.prefix}-{pid}.ndjson',
+                maxBytes=getattr(settings, f'{self.setting}_LOG_MAX_BYTES'),
+                backupCount=getattr(settings, f'{self.setting}_LOG_BACKUPS'),
+                encoding='utf-8',
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger = logging.getLogger(f'apps.monitoring.{self.prefix}.{pid}')
+            for old in self.logger.handlers:
+                old.close()
+            self.logger.handlers = [handler]
+            self.logger.propagate = False
+            self.logger.setLevel(logging.INFO)
+        return self.logger
+
+    def write(self, record):
+        self.get_logger().info(json.dumps(record, separators=(',', ':'), ensure_ascii=False))
+
+
+def read_records(paths):
+    """Registros de uno o más archivos NDJSON, ordenados por tiempo"""
+    records = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record['t'])
+    return records
@@ -0,0 +1,172 @@
+"""
+Profiling bajo demanda de requests en vivo.
+
+Staff lo activa con el header X-Profile: 1 o con ?_profile=1; además se perfila
+automáticamente 1 de cada PROFILER_SAMPLE_EVERY requests (0 = nunca).
+Cada perfil deja dos archivos en PROFILER_DIR (como mucho PROFILER_MAX_FILES perfiles):
+
+- <id>.pstats: cProfile (python -m pstats, snakeviz)
+- <id>.collapsed: stacks muestreados, una línea "a;b;c N" (flamegraph.pl, speedscope)
+"""
+import cProfile
+import itertools
+import re
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from apps.users.authentication import ClaimsJWTAuthentication
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+EXTENSIONS = ('.pstats', '.collapsed')
+_PROFILE_ID = re.compile(r'^[\w.-]+$')
+
+# cProfile no admite dos perfiles simultáneos en el mismo proceso (Python 3.12+)
+_profile_lock = threading.Lock()
+_sample_counter = itertools.count(1)
+
+_PATH_PREFIXES = sorted(
+    {str(Path(path)) + '/' for path in sysconfig.get_paths().values()} | {str(settings.BASE_DIR) + '/'},
+    key=len, reverse=True,
+)
+
+
+def short_path(filename):
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def is_staff_request(request):
+    """Staff por sesión o por JWT (claim is_staff)"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    try:
+        result = ClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return bool(result and result[0].is_staff)
+
+
+def explicitly_requested(request):
+    return request.META.get(PROFILE_HEADER) == '1' or request.GET.get(PROFILE_PARAM) == '1'
+
+
+def sample_due():
+    every = settings.PROFILER_SAMPLE_EVERY
+    return bool(every) and next(_sample_counter) % every == 0
+
+
+def profile_requested(request):
+    """Pedido explícito de staff o muestreo automático"""
+    if explicitly_requested(request):
+        return is_staff_request(request)
+    return sample_due()
+
+
+async def aprofile_requested(request):
+    """profile_requested para la cadena async: el chequeo de staff puede consultar la base"""
+    if explicitly_requested(request):
+        return await sync_to_async(is_staff_request)(request)
+    return sample_due()
+
+
+class StackSampler(threading.Thread):
+    """Muestrea el stack de un thread cada `interval` segundos y cuenta stacks colapsados"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class RequestProfile:
+    """cProfile y muestreo de stacks alrededor de un bloque"""
+
+    def __enter__(self):
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), settings.PROFILER_SAMPLE_INTERVAL)
+        self.sampler.start()
+        self.start = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.disable()
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
+        self.sampler.stop()
+        return False
+
+    def save(self, route):
+        """Guardar los dos archivos y devolver el id del perfil"""
+        directory = Path(settings.PROFILER_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^\w-]+', '_', route).strip('_')[:60] or 'root'
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')[:-3]
+        profile_id = f'{stamp}-{slug}-{self.elapsed_ms:.0f}ms'
+        self.profiler.dump_stats(directory / f'{profile_id}.pstats')
+        (directory / f'{profile_id}.collapsed').write_text(self.sampler.collapsed(), encoding='utf-8')
+        prune(directory, settings.PROFILER_MAX_FILES)
+        return profile_id
+
+
+def list_profiles(directory=None):
+    """Perfiles guardados, del más nuevo al más viejo: [(id, tamaño en bytes, mtime)]"""
+    directory = Path(directory or settings.PROFILER_DIR)
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in directory.glob('*.pstats'):
+        collapsed = path.with_suffix('.collapsed')
+        try:
+            stat = path.stat()
+            size = stat.st_size + (collapsed.stat().st_size if collapsed.exists() else 0)
+        except FileNotFoundError:
+            # Otro worker lo borró mientras listábamos
+            continue
+        profiles.append((path.stem, size, stat.st_mtime))
+    return sorted(profiles, key=lambda profile: profile[2], reverse=True)
+
+
+def prune(directory, keep):
+    """Borrar los perfiles más viejos por encima de `keep`"""
+    for profile_id, _, _ in list_profiles(directory)[keep:]:
+        for extension in EXTENSIONS:
+            (Path(directory) / f'{profile_id}{extension}').unlink(missing_ok=True)
+
+
+def profile_path(profile_id, extension):
+    """Ruta de un archivo de perfil, o None si el id o la extensión no son válidos"""
+    if extension not in EXTENSIONS or not _PROFILE_ID.match(profile_id) or profile_id.startswith('.'):
+        return None
+    path = Path(settings.PROFILER_DIR) / f'{profile_id}{extension}'
+    return path if path.is_file() else None
@@ -0,0 +1,95 @@
+"""
+Conteo de consultas SQL por bloque de código (request, test, comando).
+
+Se engancha con connection.execute_wrapper, así que mide todas las consultas
+del ORM y del SQL crudo sin depender de DEBUG. Los bloques activos viven en una
+ContextVar: en una vista async las consultas corren en el thread de
+sync_to_async (con su propia conexión) y se siguen atribuyendo al request.
+"""
+import functools
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import connections
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_SPACES = re.compile(r'\s+')
+
+
+def sql_shape(sql):
+    """
+    Forma normalizada de una consulta: sin literales ni largo de listas IN.
+    Dos consultas con la misma forma difieren solo en sus parámetros.
+    """
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('(...)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+class QueryStats:
+    """Cantidad, tiempo y formas de las consultas ejecutadas"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def repeated(self, threshold):
+        """Formas que se repiten al menos `threshold` veces (candidatas a N+1)"""
+        return [(shape, times) for shape, times in self.shapes.most_common() if times >= threshold]
+
+    def report(self, limit=5):
+        """Resumen legible para logs y mensajes de tests"""
+        lines = [f'{self.count} consultas en {self.duration_ms:.1f} ms']
+        for shape, times in self.shapes.most_common(limit):
+            lines.append(f'  {times}x {shape[:200]}')
+        return '\n'.join(lines)
+
+
+_trackers = ContextVar('monitoring_query_trackers', default=())
+
+
+def dispatch_queries(execute, sql, params, many, context):
+    """Execute wrapper fijo de cada conexión: pasa la consulta por los bloques activos"""
+    # El primer bloque abierto queda más afuera, igual que execute_wrapper anidados
+    for tracker in reversed(_trackers.get()):
+        execute = functools.partial(tracker, execute)
+    return execute(sql, params, many, context)
+
+
+def install_dispatch(connection, **kwargs):
+    """Receiver de connection_created; también se llama para las conexiones ya abiertas"""
+    # Al principio de la lista: execute_wrapper() de Django saca el último al salir
+    if dispatch_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, dispatch_queries)
+
+
+@contextmanager
+def track_queries(stats=None):
+    """Registrar en `stats` las consultas de todas las bases dentro del bloque"""
+    stats = stats if stats is not None else QueryStats()
+    for connection in connections.all(initialized_only=True):
+        install_dispatch(connection)
+    token = _trackers.set(_trackers.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _trackers.reset(token)
@@ -0,0 +1,101 @@
+"""
+Registro de consultas lentas, opcionalmente con su plan de ejecución.
+
+Con SLOW_QUERY_MS > 0 las consultas que tardan eso o más se escriben en
+SLOW_QUERY_LOG_DIR/slow-queries-<pid>.ndjson (rotativo, acotado por tamaño):
+    {"t": 1718000000.1, "db": "default", "ms": 412.3, "sql": "<forma normalizada>",
+     "route": "products:product-list", "view": "apps.products.views.ProductViewSet",
+     "caller": "apps/products/views.py:88 in get_queryset", "plan": "SCAN products_product"}
+
+Se guarda solo la forma parametrizada del SQL, nunca los parámetros. El plan
+(EXPLAIN) se pide únicamente con SLOW_QUERY_EXPLAIN, porque corre dentro del request
+ya lento y en PostgreSQL muestra los valores filtrados.
+
+`python manage.py slow_queries` resume los peores por tiempo total.
+"""
+import time
+import traceback
+from django.conf import settings
+from .metrics import registry
+from .ndjson import NdjsonLog
+from .queries import sql_shape
+
+slow_query_log = NdjsonLog('SLOW_QUERY', 'slow-queries')
+
+_EXPLAINABLE = ('SELECT', 'WITH')
+
+
+def explain(connection, sql, params):
+    """
+    Plan de una consulta de lectura (EXPLAIN QUERY PLAN en SQLite, EXPLAIN en el resto).
+    Usa un cursor crudo: el EXPLAIN no pasa por los execute wrappers, así que no se
+    cuenta en QueryStats ni se vuelve a registrar como consulta lenta.
+    """
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return ''
+    prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    try:
+        cursor = connection.create_cursor()
+        try:
+            cursor.execute(f'{prefix} {sql}', params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except connection.Database.Error:
+        return ''
+    # SQLite: (id, parent, notused, detalle); PostgreSQL/MySQL: una columna o varias por paso
+    if connection.vendor == 'sqlite':
+        return '\n'.join(row[-1] for row in rows)
+    return '\n'.join(' '.join(str(value) for value in row if value is not None) for row in rows)
+
+
+def middleware_files():
+    """Archivos de los middlewares de MIDDLEWARE: pasan el request, no originan consultas"""
+    return {path.rsplit('.', 1)[0].replace('.', '/') + '.py' for path in settings.MIDDLEWARE}
+
+
+def caller():
+    """
+    Frame más cercano del código de la app (apps/ o config/, fuera de monitoring,
+    los tests y los middlewares) que disparó la consulta. Vacío si vino de código
+    de terceros (p. ej. el paginador de DRF).
+    """
+    base = f'{settings.BASE_DIR}/'
+    skipped = middleware_files()
+    for frame in reversed(traceback.extract_stack()):
+        path = frame.filename[len(base):] if frame.filename.startswith(base) else ''
+        if path.startswith(('apps/', 'config/')) and not path.startswith('apps/monitoring/') \
+                and path not in skipped and not path.endswith('tests.py'):
+            return f'{path}:{frame.lineno} in {frame.name}'
+    return ''
+
+
+class SlowQueryLogger:
+    """Execute wrapper que registra las consultas de un request que superan SLOW_QUERY_MS"""
+
+    def __init__(self, request=None):
+        self.request = request
+        self.threshold = settings.SLOW_QUERY_MS / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        if duration >= self.threshold:
+            self.record(context['connection'], sql, params, many, duration)
+        return result
+
+    def record(self, connection, sql, params, many, duration):
+        match = getattr(self.request, 'resolver_match', None)
+        route = match.view_name if match else ''
+        registry.inc('db_slow_queries_total', route=route or '<unmatched>')
+        slow_query_log.write({
+            't': round(time.time(), 3),
+            'db': connection.alias,
+            'ms': round(duration * 1000, 1),
+            'sql': sql_shape(sql),
+            'route': route,
+            'view': match._func_path if match else '',
+            'caller': caller(),
+            'plan': explain(connection, sql, params) if settings.SLOW_QUERY_EXPLAIN and not many else '',
+        })
@@ -0,0 +1,26 @@
+"""
+Máximo de consultas por endpoint (correr con pytest en CI).
+
+Los máximos no dependen de la cantidad de productos: si alguno crece con los
+datos, es un N+1.
+"""
+import pytest
+from django.core.management import call_command
+
+CEILINGS = [
+    ('/api/v1/products/', 3),
+    ('/api/v1/products/featured/', 2),
+    ('/api/v1/categories/', 2),
+    ('/api/v1/catalog/products/', 3),
+    ('/api/v1/catalog/categories/', 1),
+]
+
+
+@pytest.fixture
+def catalog(db):
+    call_command('seed_catalog', '--demo', verbosity=0)
+
+
+@pytest.mark.parametrize('url,ceiling', CEILINGS)
+def test_endpoint_query_ceiling(catalog, query_ceiling, url, ceiling):
+    query_ceiling(url, ceiling)
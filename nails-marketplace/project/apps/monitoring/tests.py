@@ -0,0 +1,355 @@
+import json
+import pstats
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import LiveServerTestCase, RequestFactory, TestCase, override_settings
+from django.urls import resolve
+from apps.products.models import Category
+from apps.products.views import CategoryViewSet
+from apps.users.models import User
+from .metrics import MetricsRegistry, archive_process, collect, merge, registry, render, write_json
+from .ndjson import read_records
+from .queries import sql_shape, track_queries
+from .slow_queries import middleware_files
+from .tracing import span
+from .traffic import redact_path, redact_query
+
+
+class SqlShapeTests(TestCase):
+    """Normalización de consultas para detectar N+1"""
+
+    def test_literals_and_in_lists_collapse(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"),
+            sql_shape('SELECT * FROM t WHERE id IN (%s) AND name = \'y\' LIMIT 5'),
+        )
+
+    def test_track_queries_counts_shapes(self):
+        with track_queries() as stats:
+            for slug in ('a', 'b', 'c'):
+                Category.objects.filter(slug=slug).exists()
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(len(stats.repeated(3)), 1)
+
+
+@override_settings(SERVER_TIMING_HEADER=True, N_PLUS_ONE_THRESHOLD=3)
+class QueryBudgetMiddlewareTests(TestCase):
+    """Middleware de presupuesto de consultas"""
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/v1/catalog/categories/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="1 queries", app;dur=[\d.]+$')
+
+    async def test_async_chain_counts_queries(self):
+        # La consulta corre en el thread de sync_to_async, no en el del middleware
+        response = await self.async_client.get('/api/v1/catalog/categories/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="1 queries"')
+
+    @override_settings(QUERY_BUDGETS={'catalog_categories': 0})
+    def test_budget_exceeded_is_logged(self):
+        with self.assertLogs('apps.monitoring', 'WARNING') as logs:
+            self.client.get('/api/v1/catalog/categories/')
+        self.assertIn('catalog_categories', logs.output[0])
+
+    def test_repeated_queries_are_reported(self):
+        for n in range(3):
+            Category.objects.create(name=f'Categoría {n}', slug=f'categoria-{n}')
+
+        # Sin la anotación del ViewSet, el serializer hace un COUNT por categoría
+        plain = Category.objects.filter(is_active=True).order_by('name')
+        with patch.object(CategoryViewSet, 'queryset', plain), \
+                self.assertLogs('apps.monitoring', 'WARNING') as logs:
+            self.client.get('/api/v1/categories/')
+        self.assertTrue(any('Posible N+1' in line for line in logs.output))
+
+
+class TrafficRecorderTests(TestCase):
+    """Grabación de tráfico muestreado"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_redact_query(self):
+        self.assertEqual(
+            redact_query('search=gel&access_token=abc&page=2'),
+            'search=gel&access_token=REDACTED&page=2',
+        )
+
+    def test_account_keys_are_never_written(self):
+        with override_settings(TRAFFIC_RECORD_RATE=1, TRAFFIC_LOG_DIR=self.tmp.name):
+            self.client.get('/accounts/password/reset/key/1-set-password/')
+            self.client.get('/accounts/confirm-email/MQ:1clave-secreta/')
+        self.assertEqual(list(Path(self.tmp.name).glob('traffic-*.ndjson')), [])
+
+        request = RequestFactory().get('/accounts/password/reset/key/1-abc123-clave/')
+        request.resolver_match = resolve(request.path)
+        self.assertEqual(redact_path(request), '/accounts/password/reset/key/REDACTED-REDACTED/')
+
+    def test_disabled_by_default(self):
+        with override_settings(TRAFFIC_LOG_DIR=self.tmp.name):
+            self.client.get('/api/v1/catalog/categories/')
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+
+    def test_records_sampled_request(self):
+        with override_settings(TRAFFIC_RECORD_RATE=1, TRAFFIC_LOG_DIR=self.tmp.name):
+            self.client.get('/api/v1/catalog/categories/?search=gel&token=abc')
+            self.client.get('/static/css/style.css')
+
+        [record] = read_records(Path(self.tmp.name).glob('traffic-*.ndjson'))
+        self.assertEqual(record['m'], 'GET')
+        self.assertEqual(record['p'], '/api/v1/catalog/categories/')
+        self.assertEqual(record['q'], 'search=gel&token=REDACTED')
+        self.assertEqual(record['r'], 'catalog_categories')
+        self.assertEqual((record['a'], record['s']), ('anon', 200))
+
+
+class ReplayTrafficTests(LiveServerTestCase):
+    """Reproducción de un archivo grabado contra el live server"""
+
+    def test_replay_reports_per_route(self):
+        records = [
+            {'t': 100.0, 'm': 'GET', 'p': '/api/v1/catalog/categories/', 'q': '', 'r': 'catalog_categories', 'a': 'anon'},
+            {'t': 100.1, 'm': 'GET', 'p': '/api/v1/catalog/products/', 'q': 'token=REDACTED', 'r': 'catalog_products', 'a': 'anon'},
+            {'t': 100.2, 'm': 'POST', 'p': '/cart/add/1/', 'q': '', 'r': 'cart:add_to_cart', 'a': 'session'},
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as f:
+            f.write('\n'.join(json.dumps(record) for record in records))
+        self.addCleanup(Path(f.name).unlink)
+
+        out = StringIO()
+        call_command('replay_traffic', f.name, base_url=self.live_server_url, speed=0, stdout=out)
+        output = out.getvalue()
+        self.assertIn('catalog_categories', output)
+        self.assertIn('catalog_products', output)
+        self.assertNotIn('cart:add_to_cart', output)
+        self.assertIn('2 requests', output)
+        self.assertIn('0 errores', output)
+
+
+class MetricsTests(TestCase):
+    """Registro de métricas y endpoint Prometheus"""
+
+    def setUp(self):
+        registry.clear()
+        self.addCleanup(registry.clear)
+
+    def test_histogram_is_cumulative(self):
+        metrics = MetricsRegistry()
+        for seconds in (0.003, 0.02, 0.02, 30):
+            metrics.observe('http_request_duration_seconds', seconds, route='home')
+        text = render(*merge([metrics.snapshot()]))
+        self.assertIn('http_request_duration_seconds_bucket{route="home",le="0.005"} 1', text)
+        self.assertIn('http_request_duration_seconds_bucket{route="home",le="0.025"} 3', text)
+        self.assertIn('http_request_duration_seconds_bucket{route="home",le="+Inf"} 4', text)
+        self.assertIn('http_request_duration_seconds_count{route="home"} 4', text)
+
+    def test_endpoint_requires_staff(self):
+        self.assertIn(self.client.get('/metrics/').status_code, (401, 403))
+
+        user = User.objects.create_user('ops', 'ops@example.com', 'x', is_staff=True)
+        self.client.force_login(user)
+        self.client.get('/api/v1/catalog/categories/')
+        response = self.client.get('/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn('http_requests_total{method="GET",route="catalog_categories",status="200"} 1', text)
+        self.assertIn('db_queries_total{route="catalog_categories"} 1', text)
+        self.assertIn('# TYPE db_queries_per_request histogram', text)
+
+    def test_files_of_other_workers_are_summed(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(METRICS_DIR=tmp):
+            other = MetricsRegistry()
+            other.inc('cache_requests_total', 2, cache='cart_count', result='hit')
+            write_json(Path(tmp) / 'metrics-999999.json', {**other.snapshot(), 'pid': 999999})
+            archive_process(999999)
+            registry.inc('cache_requests_total', cache='cart_count', result='hit')
+
+            counters, _, _ = collect()
+
+        self.assertEqual(counters[('cache_requests_total', (('cache', 'cart_count'), ('result', 'hit')))], 3)
+
+
+class ProfilerTests(TestCase):
+    """Profiling bajo demanda"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.settings_override = override_settings(PROFILER_DIR=tmp.name, PROFILER_SAMPLE_INTERVAL=0.001)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.dir = Path(tmp.name)
+        self.staff = User.objects.create_user('ops', 'ops@example.com', 'x', is_staff=True)
+
+    def test_anonymous_cannot_trigger(self):
+        response = self.client.get('/api/v1/catalog/categories/?_profile=1')
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+    def test_staff_header_saves_pstats_and_collapsed(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/v1/categories/', HTTP_X_PROFILE='1')
+
+        profile_id = response['X-Profile-Id']
+        self.assertIn('category-list', profile_id)
+        stats = pstats.Stats(str(self.dir / f'{profile_id}.pstats'))
+        self.assertTrue(any(name == 'list' for _, _, name in stats.stats))
+        self.assertTrue((self.dir / f'{profile_id}.collapsed').exists())
+
+    @override_settings(PROFILER_SAMPLE_EVERY=1, PROFILER_MAX_FILES=2)
+    def test_sampling_keeps_directory_bounded(self):
+        for _ in range(4):
+            self.assertIn('X-Profile-Id', self.client.get('/api/v1/catalog/categories/'))
+        self.assertEqual(len(list(self.dir.glob('*.pstats'))), 2)
+        self.assertEqual(len(list(self.dir.glob('*.collapsed'))), 2)
+
+    def test_admin_page_lists_and_downloads(self):
+        self.client.force_login(self.staff)
+        profile_id = self.client.get('/api/v1/catalog/categories/?_profile=1')['X-Profile-Id']
+
+        self.assertContains(self.client.get('/admin/profiles/'), profile_id)
+        response = self.client.get(f'/admin/profiles/{profile_id}.collapsed')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertEqual(self.client.get('/admin/profiles/..%2Fsecret.pstats').status_code, 404)
+        self.assertEqual(self.client.get(f'/admin/profiles/{profile_id}.py').status_code, 404)
+
+        self.client.logout()
+        self.assertEqual(self.client.get('/admin/profiles/').status_code, 302)
+
+
+class SlowQueryLogTests(TestCase):
+    """Registro de consultas lentas con EXPLAIN"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        # Umbral mínimo: toda consulta cuenta como lenta
+        self.settings_override = override_settings(
+            SLOW_QUERY_MS=0.0001, SLOW_QUERY_EXPLAIN=True, SLOW_QUERY_LOG_DIR=tmp.name
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        Category.objects.create(name='Geles', slug='geles')
+
+    def records(self):
+        return read_records(self.dir.glob('slow-queries-*.ndjson'))
+
+    def test_records_shape_route_caller_and_plan(self):
+        response = self.client.get('/api/v1/products/?search=gel')
+        self.assertEqual(response.status_code, 200)
+
+        # Sin productos el paginador solo hace el COUNT
+        [record] = [r for r in self.records() if 'products_product' in r['sql']]
+        self.assertEqual(record['route'], 'products:product-list')
+        self.assertIn('ProductViewSet', record['view'])
+        self.assertIn('LIKE', record['sql'])
+        self.assertNotIn('%gel%', record['sql'])
+        self.assertIn('products_product', record['plan'])
+        # El COUNT lo dispara el paginador de DRF: no hay frame propio que señalar
+        self.assertEqual(record['caller'], '')
+
+    @override_settings(SLOW_QUERY_EXPLAIN=False)
+    def test_plan_and_params_are_opt_in(self):
+        self.client.get('/api/v1/catalog/products/?search=secreto@example.com')
+        record = next(r for r in self.records() if 'LIKE' in r['sql'])
+        self.assertEqual(record['plan'], '')
+        self.assertNotIn('secreto', json.dumps(self.records()))
+
+    def test_middleware_frames_are_skipped(self):
+        files = middleware_files()
+        self.assertTrue({'config/compression.py', 'config/db_router.py'} <= files)
+        # Sin el middleware en MIDDLEWARE su frame vuelve a contar
+        with override_settings(MIDDLEWARE=[]):
+            self.assertEqual(middleware_files(), set())
+
+    def test_caller_points_to_project_code(self):
+        self.client.get('/categories/')
+        [record] = [r for r in self.records() if 'products_category' in r['sql']]
+        self.assertTrue(record['caller'].startswith('config/views.py:'), record['caller'])
+
+    @override_settings(SERVER_TIMING_HEADER=True)
+    def test_explain_is_not_counted(self):
+        response = self.client.get('/api/v1/catalog/categories/')
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+        self.assertEqual(len(self.records()), 1)
+
+    def test_command_reports_top_offenders(self):
+        for _ in range(3):
+            self.client.get('/api/v1/catalog/categories/')
+        out = StringIO()
+        call_command('slow_queries', '--plans', stdout=out)
+        output = out.getvalue()
+        self.assertIn('3x', output)
+        self.assertIn('ruta: catalog_categories', output)
+        self.assertIn('products_category', output)
+
+
+class TracingTests(TestCase):
+    """Trazas de requests en JSON de OTLP"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.settings_override = override_settings(TRACE_LOG_DIR=tmp.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        Category.objects.create(name='Geles', slug='geles')
+
+    def traces(self):
+        lines = []
+        for path in self.dir.glob('traces-*.ndjson'):
+            lines.extend(json.loads(line) for line in path.read_text().splitlines())
+        return [trace['resourceSpans'][0]['scopeSpans'][0]['spans'] for trace in lines]
+
+    def test_not_sampled_by_default(self):
+        self.client.get('/api/v1/categories/')
+        self.assertEqual(self.traces(), [])
+
+    @override_settings(TRACE_SAMPLE_RATE=1)
+    def test_nested_spans_in_otlp_format(self):
+        self.client.get('/api/v1/categories/')
+        [spans] = self.traces()
+
+        by_name = {s['name']: s for s in spans}
+        root = by_name['GET products:category-list']
+        self.assertEqual(root['kind'], 2)
+        self.assertNotIn('parentSpanId', root)
+        self.assertEqual(len(root['traceId']), 32)
+        self.assertIn({'key': 'http.response.status_code', 'value': {'intValue': '200'}}, root['attributes'])
+
+        query, serializer, render = by_name['db.query'], by_name['serializer.data'], by_name['drf.render']
+        for child in (query, serializer, render):
+            self.assertEqual(child['parentSpanId'], root['spanId'])
+            self.assertEqual(child['traceId'], root['traceId'])
+            self.assertGreaterEqual(int(child['startTimeUnixNano']), int(root['startTimeUnixNano']))
+            self.assertLessEqual(int(child['endTimeUnixNano']), int(root['endTimeUnixNano']))
+        attributes = {a['key']: a['value'] for a in query['attributes']}
+        self.assertEqual(attributes['db.system'], {'stringValue': 'sqlite'})
+        self.assertIn('products_category', attributes['db.statement']['stringValue'])
+
+    def test_sampled_traceparent_is_continued(self):
+        trace_id, parent_id = 'ab' * 16, 'cd' * 8
+        self.client.force_login(User.objects.create_user('ana', 'ana@example.com', 'x'))
+        self.client.get('/categories/', HTTP_TRACEPARENT=f'00-{trace_id}-{parent_id}-01')
+        [spans] = self.traces()
+
+        root = next(s for s in spans if s['kind'] == 2)
+        self.assertEqual((root['traceId'], root['parentSpanId']), (trace_id, parent_id))
+        template = next(s for s in spans if s['name'] == 'template.render')
+        self.assertIn({'key': 'template.name', 'value': {'stringValue': 'products/categories.html'}},
+                      template['attributes'])
+        # Contador del carrito del navbar
+        self.assertIn('cache.get', {s['name'] for s in spans})
+
+    def test_custom_spans_are_noops_outside_a_trace(self):
+        with span('nada') as current:
+            self.assertIsNone(current)
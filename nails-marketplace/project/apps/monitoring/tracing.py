@@ -0,0 +1,244 @@
+"""
+Trazas livianas de un request: spans anidados con tiempos y atributos.
+
+Se traza una fracción TRACE_SAMPLE_RATE de los requests (o los que llegan con un
+header traceparent W3C marcado como muestreado). Cada traza terminada se escribe
+como una línea de TRACE_LOG_DIR/traces-<pid>.ndjson en el formato JSON de OTLP
+(ExportTraceServiceRequest), el mismo que produce el file exporter del
+OpenTelemetry Collector y que su receptor otlpjson puede leer.
+
+Spans que se registran solos dentro de un request trazado:
+- el request (SERVER), desde TracingMiddleware
+- cada consulta SQL (execute wrapper)
+- operaciones de cache y del storage de media (url, save, open, delete...)
+- render de templates, serializer.data y render JSON de DRF
+
+Código propio puede agregar spans con `with span('nombre', atributo=valor):`.
+Fuera de un request trazado cada punto instrumentado cuesta una lectura de ContextVar.
+"""
+import functools
+import os
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from django.conf import settings
+from .ndjson import NdjsonLog
+from .queries import sql_shape
+
+# SpanKind de OTLP
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+STATUS_ERROR = 2
+
+_current_span = ContextVar('monitoring_current_span', default=None)
+_null_span = nullcontext()
+trace_log = NdjsonLog('TRACE', 'traces')
+
+
+def new_id(size):
+    return os.urandom(size).hex()
+
+
+class Trace:
+    """Spans terminados de un request (acotados a TRACE_MAX_SPANS)"""
+
+    def __init__(self, trace_id=None):
+        self.trace_id = trace_id or new_id(16)
+        self.spans = []
+        self.dropped = 0
+        self.max_spans = settings.TRACE_MAX_SPANS
+
+    def add(self, span):
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+    def export(self):
+        """ExportTraceServiceRequest en JSON de OTLP"""
+        return {'resourceSpans': [{
+            'resource': {'attributes': otlp_attributes({
+                'service.name': settings.TRACE_SERVICE_NAME,
+                'process.pid': os.getpid(),
+            })},
+            'scopeSpans': [{
+                'scope': {'name': __name__},
+                'spans': [span.export() for span in self.spans],
+            }],
+        }]}
+
+
+class Span:
+    """Context manager: mide el bloque y lo agrega a la traza al salir"""
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'kind', 'attributes', 'start', 'end', 'error', 'token')
+
+    def __init__(self, trace, parent_id, name, kind=INTERNAL, attributes=None):
+        self.trace = trace
+        self.span_id = new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.error = None
+
+    def __enter__(self):
+        self.token = _current_span.set(self)
+        self.start = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.time_ns()
+        _current_span.reset(self.token)
+        if exc_type is not None:
+            self.error = f'{exc_type.__name__}: {exc}'[:300]
+        self.trace.add(self)
+        return False
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def export(self):
+        data = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            data['parentSpanId'] = self.parent_id
+        if self.error:
+            data['status'] = {'code': STATUS_ERROR, 'message': self.error}
+        return data
+
+
+def otlp_attributes(attributes):
+    """Dict → lista de KeyValue de OTLP"""
+    values = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            value = {'boolValue': value}
+        elif isinstance(value, int):
+            value = {'intValue': str(value)}
+        elif isinstance(value, float):
+            value = {'doubleValue': value}
+        else:
+            value = {'stringValue': str(value)}
+        values.append({'key': key, 'value': value})
+    return values
+
+
+def current_span():
+    return _current_span.get()
+
+
+def span(name, kind=INTERNAL, **attributes):
+    """Span hijo del actual; fuera de una traza no hace nada"""
+    parent = _current_span.get()
+    if parent is None:
+        return _null_span
+    return Span(parent.trace, parent.span_id, name, kind, attributes)
+
+
+def parse_traceparent(header):
+    """(trace_id, parent_span_id, muestreado) de un header traceparent W3C, o None"""
+    parts = header.split('-')
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or parts[1] == '0' * 32:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+def write_trace(trace, root):
+    if trace.dropped:
+        root.set(**{'trace.dropped_spans': trace.dropped})
+    trace_log.write(trace.export())
+
+
+class TraceQueries:
+    """Execute wrapper: un span CLIENT por consulta SQL"""
+
+    def __call__(self, execute, sql, params, many, context):
+        connection = context['connection']
+        with span('db.query', CLIENT, **{
+            'db.system': connection.vendor,
+            'db.name': connection.alias,
+            'db.statement': sql_shape(sql)[:1000],
+        }):
+            return execute(sql, params, many, context)
+
+
+# ==========================================
+# Instrumentación de librerías
+# ==========================================
+
+def traced(name, kind=INTERNAL, attributes=None):
+    """Decorador: span alrededor de la función solo si hay una traza activa"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = _current_span.get()
+            if parent is None:
+                return func(*args, **kwargs)
+            attrs = attributes(*args, **kwargs) if attributes else {}
+            with Span(parent.trace, parent.span_id, name, kind, attrs):
+                return func(*args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def instrument(cls, method, name, kind=INTERNAL, attributes=None):
+    original = getattr(cls, method, None)
+    if original is None or getattr(original, '__traced__', False):
+        return
+    setattr(cls, method, traced(name, kind, attributes)(original))
+
+
+def instrument_property(cls, prop, name, attributes=None):
+    original = cls.__dict__.get(prop)
+    if not isinstance(original, property) or getattr(original.fget, '__traced__', False):
+        return
+    setattr(cls, prop, property(traced(name, INTERNAL, attributes)(original.fget)))
+
+
+CACHE_METHODS = ('get', 'set', 'add', 'delete', 'get_many', 'set_many', 'delete_many', 'incr', 'touch', 'has_key')
+STORAGE_METHODS = ('url', 'save', 'open', 'delete', 'exists', 'size')
+
+
+def install():
+    """Instrumentar cache, storage, templates y DRF (idempotente; se llama desde AppConfig.ready)"""
+    from django.core.cache import caches
+    from django.core.files.storage import storages
+    from django.template.backends.django import Template
+    from rest_framework import renderers, serializers
+    from rest_framework.settings import api_settings
+
+    for alias in settings.CACHES:
+        backend = type(caches[alias])
+        for method in CACHE_METHODS:
+            instrument(backend, method, f'cache.{method}', CLIENT,
+                       lambda self, *args, **kwargs: {'cache.backend': type(self).__name__})
+
+    storage = type(storages['default'])
+    for method in STORAGE_METHODS:
+        instrument(storage, method, f'storage.{method}', CLIENT,
+                   lambda self, name=None, *args, **kwargs: {
+                       'storage.backend': type(self).__name__, 'storage.name': str(name or '')[:200],
+                   })
+
+    instrument(Template, 'render', 'template.render',
+               attributes=lambda self, *args, **kwargs: {'template.name': self.origin.template_name or ''})
+    instrument_property(serializers.Serializer, 'data', 'serializer.data',
+                        lambda self: {'serializer.class': type(self).__name__})
+    instrument_property(serializers.ListSerializer, 'data', 'serializer.data',
+                        lambda self: {'serializer.class': type(self.child).__name__, 'serializer.many': True})
+    instrument(renderers.JSONRenderer, 'render', 'drf.render')
+    for renderer in api_settings.DEFAULT_RENDERER_CLASSES:
+        if issubclass(renderer, renderers.JSONRenderer):
+            instrument(renderer, 'render', 'drf.render')
@@ -0,0 +1,66 @@
+"""
+Grabación de tráfico real en NDJSON compacto, para reproducirlo con replay_traffic.
+
+Cada línea es un request muestreado:
+    {"t": 1718000000.123, "m": "GET", "p": "/api/v1/products/", "q": "search=gel&page=2",
+     "r": "products:product-list", "a": "jwt", "s": 200, "d": 12.4}
+
+No se guardan cuerpos, headers, cookies, IPs ni ids de usuario. Los parámetros de
+query y los argumentos de la URL con nombres sensibles se reemplazan por REDACTED.
+"""
+from urllib.parse import parse_qsl, urlencode
+from django.conf import settings
+from django.urls import NoReverseMatch, reverse
+from .ndjson import NdjsonLog
+
+REDACTED = 'REDACTED'
+# Fragmentos de nombre de parámetro que nunca se graban con su valor
+SENSITIVE_PARAMS = ('token', 'password', 'secret', 'key', 'uid', 'email', 'code', 'state', 'session', 'auth',
+                    'phone')
+
+
+def sensitive(name):
+    return any(part in name.lower() for part in SENSITIVE_PARAMS)
+
+
+def redact_query(query_string):
+    """Query string con los valores sensibles reemplazados"""
+    if not query_string:
+        return ''
+    params = [
+        (name, REDACTED if sensitive(name) else value)
+        for name, value in parse_qsl(query_string, keep_blank_values=True)
+    ]
+    return urlencode(params, safe=',')
+
+
+def redact_path(request):
+    """
+    Path con los argumentos sensibles de la ruta resuelta reemplazados
+    (p. ej. <key> de un link de reseteo de contraseña)
+    """
+    match = getattr(request, 'resolver_match', None)
+    if not match or not any(sensitive(name) for name in match.kwargs):
+        return request.path
+    kwargs = {name: REDACTED if sensitive(name) else value for name, value in match.kwargs.items()}
+    try:
+        return reverse(match.view_name, args=match.args, kwargs=kwargs)
+    except NoReverseMatch:
+        # El patrón no admite el reemplazo: mejor la ruta sin valores que la clave
+        return '/' + match.route
+
+
+def auth_class(request):
+    """Tipo de autenticación del request, sin identificar al usuario"""
+    if request.META.get('HTTP_AUTHORIZATION', '').startswith('Bearer '):
+        return 'jwt'
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return 'session'
+    return 'anon'
+
+
+class TrafficLog(NdjsonLog):
+    """traffic-<pid>.ndjson en TRAFFIC_LOG_DIR"""
+
+    def __init__(self):
+        super().__init__('TRAFFIC', 'traffic')
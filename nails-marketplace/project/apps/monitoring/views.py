@@ -0,0 +1,44 @@
+from datetime import datetime
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import render as render_template
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from .metrics import collect, render
+from .profiling import list_profiles, profile_path
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """
+    Métricas de todos los workers en formato de texto de Prometheus.
+    Solo staff: sesión del admin o JWT con is_staff.
+    """
+    return HttpResponse(render(*collect()), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@staff_member_required
+def profile_list(request):
+    """Página del admin con los perfiles guardados"""
+    profiles = [
+        {'id': profile_id, 'size_kb': size / 1024, 'created': datetime.fromtimestamp(mtime)}
+        for profile_id, size, mtime in list_profiles()
+    ]
+    return render_template(request, 'admin/monitoring/profiles.html', {
+        **admin.site.each_context(request),
+        'title': 'Perfiles de requests',
+        'profiles': profiles,
+    })
+
+
+@staff_member_required
+def profile_download(request, profile_id, extension):
+    """Descargar el .pstats o el .collapsed de un perfil"""
+    path = profile_path(profile_id, f'.{extension}')
+    if path is None:
+        raise Http404('Perfil no encontrado')
+    return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
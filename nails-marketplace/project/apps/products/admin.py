@@ -1,19 +1,20 @@
 from django.contrib import admin
+from django.db import transaction
 from django.db.models import Count
+from config.admin_tools import EstimatedCountPaginator, PaginatedTabularInline
 from .models import Category, Product, ProductImage, ProductView
+from .services import catalog_bulk_updated
 
 
-class ProductInline(admin.TabularInline):
-    """Mostrar productos dentro de cada categoría"""
+class ProductInline(PaginatedTabularInline):
+    """Productos de la categoría, de a una página por vez"""
     model = Product
-    extra = 0
     fields = ('title', 'price', 'stock', 'status', 'seller')
     readonly_fields = ('title', 'price', 'stock', 'status', 'seller')
-    can_delete = False
     show_change_link = True  # ← Link para editar el producto
-    
-    def has_add_permission(self, request, obj=None):
-        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('seller')
 
 
 class ProductImageInline(admin.TabularInline):
@@ -59,6 +60,10 @@ class ProductAdmin(admin.ModelAdmin):
     ]
     search_fields = ['title', 'description', 'seller__username', 'brand']
     readonly_fields = ['views', 'created_at', 'updated_at']
+    list_select_related = ['seller', 'category']
+    autocomplete_fields = ['seller', 'category']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     inlines = [ProductImageInline]
     
@@ -91,18 +96,21 @@ class ProductAdmin(admin.ModelAdmin):
     def mark_as_available(self, request, queryset):
         """Marcar productos como disponibles"""
         updated = queryset.update(status='available')
+        transaction.on_commit(catalog_bulk_updated)  # update() no dispara signals
         self.message_user(request, f'{updated} productos marcados como disponibles.')
     mark_as_available.short_description = 'Marcar como disponibles'
     
     def mark_as_sold(self, request, queryset):
         """Marcar productos como vendidos"""
         updated = queryset.update(status='sold')
+        transaction.on_commit(catalog_bulk_updated)
         self.message_user(request, f'{updated} productos marcados como vendidos.')
     mark_as_sold.short_description = 'Marcar como vendidos'
     
     def mark_as_inactive(self, request, queryset):
         """Marcar productos como inactivos"""
         updated = queryset.update(status='inactive')
+        transaction.on_commit(catalog_bulk_updated)
         self.message_user(request, f'{updated} productos marcados como inactivos.')
     mark_as_inactive.short_description = 'Marcar como inactivos'
 
@@ -114,6 +122,9 @@ class ProductViewAdmin(admin.ModelAdmin):
     list_filter = ['viewed_at']
     search_fields = ['product__title', 'user__username', 'ip_address']
     readonly_fields = ['product', 'user', 'ip_address', 'user_agent', 'viewed_at']
+    list_select_related = ['product', 'user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     def has_add_permission(self, request):
         return False
\ No newline at end of file
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.products'
-    verbose_name = 'Productos'
\ No newline at end of file
+    verbose_name = 'Productos'
+
+    def ready(self):
+        """Importar signals cuando la app esté lista"""
+        import apps.products.signals
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+Vistas asíncronas de solo lectura para el catálogo (servidas por ASGI).
+
+Usan el ORM async de Django y lanzan en paralelo (asyncio.gather) las consultas
+independientes, así un worker ASGI atiende muchos clientes lentos a la vez sin
+bloquear un thread por request. Solo aceptan GET/HEAD: las escrituras siguen en
+los ViewSets de DRF.
+"""
+import asyncio
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_safe
+from rest_framework.utils.urls import replace_query_param
+from apps.users.authentication import get_request_user_id
+from apps.users.models import Reputation
+from .models import Category, Product, ProductView
+
+PAGE_SIZE = settings.REST_FRAMEWORK['PAGE_SIZE']
+MAX_PAGE_SIZE = 100
+SIMILAR_LIMIT = 4
+
+
+def client_ip(request):
+    """Obtener IP del cliente"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0]
+    return request.META.get('REMOTE_ADDR')
+
+
+def image_url(request, product):
+    """Imagen principal (o la primera) desde las imágenes precargadas"""
+    images = list(product.images.all())
+    image = next((img for img in images if img.is_primary), images[0] if images else None)
+    return request.build_absolute_uri(image.image.url) if image else None
+
+
+def product_summary(request, product):
+    """Mismos campos que ProductListSerializer, sin consultas extra"""
+    return {
+        'id': product.id,
+        'title': product.title,
+        'price': product.price,
+        'product_type': product.product_type,
+        'condition': product.condition,
+        'status': product.status,
+        'category_name': product.category.name,
+        'seller_username': product.seller.username,
+        'primary_image': image_url(request, product),
+        'city': product.city,
+        'views': product.views,
+        'created_at': product.created_at,
+    }
+
+
+def available_products():
+    return (
+        Product.objects.filter(status='available')
+        .select_related('seller', 'category')
+        .prefetch_related('images')
+    )
+
+
+def page_number(request, name, default):
+    try:
+        return max(1, int(request.GET.get(name, default)))
+    except ValueError:
+        return default
+
+
+@require_safe
+async def product_list(request):
+    """
+    GET /api/v1/catalog/products/?page=&page_size=&search=&category=
+
+    Listado paginado de productos disponibles (misma forma que el de DRF).
+    El conteo y la página se consultan en paralelo.
+    """
+    products = available_products().order_by('-created_at')
+
+    search = request.GET.get('search', '').strip()
+    if search:
+        products = products.filter(
+            Q(title__icontains=search) | Q(description__icontains=search) | Q(brand__icontains=search)
+        )
+    category = request.GET.get('category')
+    if category:
+        products = products.filter(category__slug=category)
+
+    page = page_number(request, 'page', 1)
+    size = min(page_number(request, 'page_size', PAGE_SIZE), MAX_PAGE_SIZE)
+    offset = (page - 1) * size
+
+    async def fetch_page():
+        return [product async for product in products[offset:offset + size]]
+
+    count, items = await asyncio.gather(products.acount(), fetch_page())
+
+    url = request.build_absolute_uri()
+    return JsonResponse({
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if offset + size < count else None,
+        'previous': replace_query_param(url, 'page', page - 1) if page > 1 else None,
+        'results': [product_summary(request, product) for product in items],
+    })
+
+
+@require_safe
+async def product_detail(request, pk):
+    """
+    GET /api/v1/catalog/products/{id}/
+
+    Detalle con productos similares y datos del vendedor. Una vez obtenido el
+    producto, similares, reputación, cantidad de publicaciones del vendedor y el
+    registro de la visita se lanzan juntos.
+    """
+    try:
+        product = await (
+            Product.objects.select_related('seller', 'category')
+            .prefetch_related('images')
+            .aget(pk=pk)
+        )
+    except Product.DoesNotExist:
+        raise Http404('Producto no encontrado')
+
+    user_id = await get_request_user_id(request)
+
+    async def similar():
+        queryset = available_products().filter(category_id=product.category_id).exclude(pk=product.pk)
+        return [item async for item in queryset[:SIMILAR_LIMIT]]
+
+    async def record_view():
+        # Mismo criterio que la vista sync: el vendedor no suma visitas
+        if user_id == product.seller_id:
+            return
+        await Product.objects.filter(pk=product.pk).aupdate(views=F('views') + 1)
+        await ProductView.objects.acreate(
+            product_id=product.pk,
+            user_id=user_id,
+            ip_address=client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', '')
+        )
+
+    similar_products, reputation, seller_products, _ = await asyncio.gather(
+        similar(),
+        Reputation.objects.filter(user_id=product.seller_id)
+        .values('average_rating', 'positive_reviews', 'negative_reviews', 'is_verified_seller')
+        .afirst(),
+        Product.objects.filter(seller_id=product.seller_id, status='available').acount(),
+        record_view(),
+    )
+
+    data = product_summary(request, product)
+    data.update({
+        'description': product.description,
+        'stock': product.stock,
+        'brand': product.brand,
+        'color': product.color,
+        'size': product.size,
+        'state': product.state,
+        'category': {'id': product.category_id, 'name': product.category.name, 'slug': product.category.slug},
+        'images': [request.build_absolute_uri(image.image.url) for image in product.images.all()],
+        'is_owner': user_id == product.seller_id,
+        'seller': {
+            'id': product.seller_id,
+            'username': product.seller.username,
+            'reputation': reputation,
+            'available_products': seller_products,
+        },
+        'similar': [product_summary(request, item) for item in similar_products],
+    })
+    return JsonResponse(data)
+
+
+@require_safe
+async def category_list(request):
+    """
+    GET /api/v1/catalog/categories/
+
+    Categorías activas con la cantidad de productos disponibles en una sola
+    consulta (el CategorySerializer hace un COUNT por categoría).
+    """
+    categories = (
+        Category.objects.filter(is_active=True)
+        .annotate(products_count=Count('products', filter=Q(products__status='available')))
+        .values('id', 'name', 'slug', 'description', 'icon', 'products_count')
+    )
+    return JsonResponse({'results': [category async for category in categories]})
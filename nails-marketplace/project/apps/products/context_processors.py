@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from .services import fragment_version
+
+
+def fragments(request):
+    """
+    Versión y duración de los fragmentos cacheados ({% cache %}).
+    fragment_release cambia solo con cada deploy (fragmentos sin datos del catálogo);
+    fragment_version además con el catálogo y se lee del cache solo si el template la usa.
+    """
+    return {
+        'fragment_cache_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+        'fragment_release': settings.FRAGMENT_CACHE_VERSION,
+        'fragment_version': SimpleLazyObject(fragment_version),
+    }
@@ -0,0 +1,341 @@
+import random
+import time
+from itertools import accumulate
+from contextlib import contextmanager
+from datetime import datetime, time as dtime, timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.cart.models import Cart, CartItem
+from apps.products.models import Category, Product, ProductImage, ProductView
+from apps.products.services import catalog_bulk_updated
+from apps.users.models import User, Profile, Reputation, Review
+
+
+# Ciudades con peso aproximado por población: (ciudad, provincia, lat, lon, peso)
+CITIES = [
+    ('Palermo', 'CABA', -34.5889, -58.4306, 14),
+    ('Caballito', 'CABA', -34.6189, -58.4429, 10),
+    ('La Plata', 'Buenos Aires', -34.9214, -57.9544, 8),
+    ('Mar del Plata', 'Buenos Aires', -38.0055, -57.5426, 6),
+    ('Quilmes', 'Buenos Aires', -34.7206, -58.2546, 6),
+    ('Córdoba', 'Córdoba', -31.4201, -64.1888, 12),
+    ('Rosario', 'Santa Fe', -32.9442, -60.6505, 10),
+    ('Santa Fe', 'Santa Fe', -31.6333, -60.7000, 4),
+    ('Mendoza', 'Mendoza', -32.8895, -68.8458, 7),
+    ('San Miguel de Tucumán', 'Tucumán', -26.8083, -65.2176, 5),
+    ('Salta', 'Salta', -24.7821, -65.4232, 4),
+    ('Neuquén', 'Neuquén', -38.9516, -68.0591, 3),
+    ('Bahía Blanca', 'Buenos Aires', -38.7196, -62.2724, 3),
+    ('Corrientes', 'Corrientes', -27.4692, -58.8306, 3),
+    ('Posadas', 'Misiones', -27.3621, -55.9009, 2),
+    ('San Juan', 'San Juan', -31.5375, -68.5364, 2),
+    ('Ushuaia', 'Tierra del Fuego', -54.8019, -68.3030, 1),
+]
+
+CITY_WEIGHTS = list(accumulate(city[4] for city in CITIES))
+
+FIRST_NAMES = [
+    'Lucía', 'Martina', 'Camila', 'Valentina', 'Sofía', 'Julieta', 'Florencia', 'Agustina',
+    'Micaela', 'Rocío', 'Milagros', 'Belén', 'Carla', 'Daniela', 'Paula', 'Romina', 'Natalia',
+]
+LAST_NAMES = [
+    'González', 'Rodríguez', 'Gómez', 'Fernández', 'López', 'Díaz', 'Martínez', 'Pérez',
+    'Romero', 'Sosa', 'Álvarez', 'Torres', 'Ruiz', 'Ramírez', 'Benítez', 'Acosta', 'Medina',
+]
+
+BRANDS = [
+    'Meliné', 'Cherimoya', 'Mia Secret', 'Sun', 'Sapucai', 'Cuccio', 'OPI', 'Essie',
+    'Masglo', 'Idraet', 'Kiss', 'Revel', 'Bluesky', 'Canni', 'Vogue', '',
+]
+
+COLORS = ['rosa nude', 'rojo clásico', 'blanco', 'negro', 'bordó', 'lila', 'coral', 'transparente', 'glitter dorado', 'azul francia']
+SIZES = ['7ml', '10ml', '15ml', '30ml', '50g', 'x100', 'x500']
+
+# Plantillas de título y rango de precio por categoría (slug)
+TEMPLATES = {
+    'esmaltes-lacas': (['Esmalte semipermanente {color}', 'Esmalte tradicional {color}', 'Gel polish {color}'], 2500, 9000),
+    'sistemas-unas': (['Polygel {color}', 'Acrílico en polvo {color}', 'Tips soft gel x{n}', 'Kit sistema ruso'], 4000, 35000),
+    'herramientas-basicas': (['Lima 100/180 x{n}', 'Alicate de cutícula acero', 'Empujador doble punta', 'Palitos de naranjo x{n}'], 800, 12000),
+    'equipamiento-profesional': (['Lámpara UV/LED {n}W', 'Torno profesional 35000 rpm', 'Aspiradora de polvo para uñas', 'Esterilizador de bolitas'], 15000, 180000),
+    'cuidado-unas': (['Aceite de cutícula {color}', 'Crema nutritiva de manos', 'Fortalecedor de uñas', 'Removedor sin acetona'], 1500, 9000),
+    'arte-decoracion': (['Set de strass x{n}', 'Foil transfer {color}', 'Stickers 3D flores', 'Glitter {color}'], 900, 7000),
+    'preparacion-acabado': (['Top coat brillo extremo', 'Base coat rubber {color}', 'Primer ácido', 'Deshidratador'], 2500, 11000),
+    'pinceles-aplicadores': (['Pincel liner {n}mm', 'Set de pinceles x{n}', 'Dotting tools x5', 'Pincel para gel plano'], 1200, 15000),
+    'organizacion-mobiliario': (['Exhibidor para {n} esmaltes', 'Organizador acrílico', 'Mesa de manicura plegable', 'Lámpara de escritorio LED'], 8000, 250000),
+    'insumos-sanitarios': (['Guantes de nitrilo x{n}', 'Alcohol 70% 1L', 'Toallas descartables x{n}', 'Barbijos x50'], 1000, 15000),
+}
+
+# Distribuciones (valores, pesos acumulados) para random.choices
+PRODUCT_TYPES = (['sale', 'exchange', 'both'], list(accumulate([80, 5, 15])))
+CONDITIONS = (['new', 'like_new', 'good', 'fair'], list(accumulate([70, 15, 10, 5])))
+STATUSES = (['available', 'sold', 'reserved', 'inactive'], list(accumulate([85, 10, 3, 2])))
+RATINGS = ([5, 4, 3, 2, 1], list(accumulate([55, 25, 10, 5, 5])))
+
+USER_AGENTS = [
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14; SM-A546E) Chrome/126.0 Mobile',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/126.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) Safari/605.1.15',
+]
+
+# Campos auto_now/auto_now_add que se completan a mano para tener historial realista
+TIMESTAMP_FIELDS = [
+    (User, 'created_at'), (Product, 'created_at'), (Product, 'updated_at'),
+    (Review, 'created_at'), (ProductView, 'viewed_at'),
+]
+
+
+@contextmanager
+def manual_timestamps():
+    """Desactivar auto_now/auto_now_add mientras se generan los datos"""
+    fields = [model._meta.get_field(name) for model, name in TIMESTAMP_FIELDS]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def chunks(total, size):
+    """Rangos [inicio, fin) de a `size` elementos"""
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera un catálogo sintético reproducible (usuarios, productos, imágenes, carritos, '
+        'reseñas y visitas) con bulk_create por lotes, para pruebas de carga y escala'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Usuarios a crear (default: 1000)')
+        parser.add_argument('--products', type=int, default=10000, help='Productos a crear (default: 10000)')
+        parser.add_argument('--reviews', type=int, default=None, help='Reseñas (default: 2 por usuario)')
+        parser.add_argument('--views', type=int, default=None, help='Visitas registradas (default: 3 por producto)')
+        parser.add_argument('--carts', type=int, default=None, help='Carritos con items (default: 1 cada 4 usuarios)')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador (default: 42)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Filas por INSERT (default: 5000)')
+        parser.add_argument('--prefix', default='fake-', help='Prefijo de username de los usuarios generados')
+        parser.add_argument('--purge', action='store_true', help='Borrar antes los datos generados con el mismo prefijo')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        self.timings = []
+        # Fechas relativas al inicio del día: misma semilla y mismo día, mismos datos
+        self.now = timezone.make_aware(datetime.combine(timezone.localdate(), dtime.min))
+
+        users = options['users']
+        products = options['products']
+        if users < 2 or products < 1:
+            raise CommandError('Se necesitan al menos 2 usuarios y 1 producto')
+
+        existing = User.objects.filter(username__startswith=self.prefix)
+        if existing.exists():
+            if not options['purge']:
+                raise CommandError(f'Ya hay usuarios "{self.prefix}*". Usar --purge o otro --prefix')
+            with self.phase('borrado previo'):
+                existing.delete()
+
+        call_command('seed_catalog', verbosity=0)
+        self.categories = list(Category.objects.filter(slug__in=TEMPLATES).values_list('id', 'slug'))
+
+        with manual_timestamps():
+            with self.phase('usuarios'):
+                sellers = self.create_users(users)
+            with self.phase('productos e imágenes'):
+                product_ids = self.create_products(products, sellers)
+            with self.phase('carritos'):
+                self.create_carts(options['carts'] if options['carts'] is not None else users // 4, product_ids)
+            with self.phase('reseñas'):
+                self.create_reviews(options['reviews'] if options['reviews'] is not None else users * 2)
+            with self.phase('visitas'):
+                self.create_views(options['views'] if options['views'] is not None else products * 3, product_ids)
+        catalog_bulk_updated()
+
+        for name, seconds in self.timings:
+            self.stdout.write(f'   ⏱  {name}: {seconds:.1f} s')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Catálogo sintético: {users} usuarios, {products} productos (semilla {options["seed"]})'
+        ))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        yield
+        self.timings.append((name, time.perf_counter() - start))
+
+    def past(self, days):
+        """Fecha aleatoria dentro de los últimos `days` días"""
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def pick(self, distribution):
+        values, cum_weights = distribution
+        return self.rng.choices(values, cum_weights=cum_weights)[0]
+
+    def location(self):
+        city, state, lat, lon, _ = self.rng.choices(CITIES, cum_weights=CITY_WEIGHTS)[0]
+        jitter = lambda: Decimal(self.rng.uniform(-0.05, 0.05)).quantize(Decimal('0.000001'))
+        return city, state, Decimal(str(lat)) + jitter(), Decimal(str(lon)) + jitter()
+
+    def create_users(self, total):
+        """Usuarios con Profile y Reputation; 1 de cada 3 es vendedora"""
+        # Un solo hash para todos: se puede iniciar sesión con la misma clave en pruebas de carga
+        password = make_password('clave-de-prueba-123')
+        self.user_ids = []
+        sellers = []
+
+        for start, end in chunks(total, self.batch_size):
+            users, locations = [], []
+            for n in range(start, end):
+                username = f'{self.prefix}{n:07d}'
+                first_name = self.rng.choice(FIRST_NAMES)
+                users.append(User(
+                    username=username, email=f'{username}@example.com', password=password,
+                    first_name=first_name, last_name=self.rng.choice(LAST_NAMES),
+                    role='seller' if n % 3 == 0 else 'buyer', is_verified=self.rng.random() < 0.7,
+                    created_at=self.past(730),
+                ))
+                locations.append(self.location())
+
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                Profile.objects.bulk_create([
+                    Profile(user_id=user.pk, city=city, state=state, latitude=lat, longitude=lon)
+                    for user, (city, state, lat, lon) in zip(users, locations)
+                ])
+                Reputation.objects.bulk_create([
+                    Reputation(user_id=user.pk, is_verified_seller=user.role == 'seller' and user.is_verified)
+                    for user in users
+                ])
+
+            self.user_ids.extend(user.pk for user in users)
+            sellers.extend(
+                (user.pk, location) for user, location in zip(users, locations) if user.role == 'seller'
+            )
+        return sellers
+
+    def product_fields(self):
+        category_id, slug = self.rng.choice(self.categories)
+        templates, low, high = TEMPLATES[slug]
+        color = self.rng.choice(COLORS)
+        title = self.rng.choice(templates).format(color=color, n=self.rng.choice([5, 10, 24, 48, 100]))
+        brand = self.rng.choice(BRANDS)
+        if brand:
+            title = f'{title} {brand}'
+        # Distribución sesgada hacia precios bajos dentro del rango de la categoría
+        price = Decimal(round(low + (high - low) * self.rng.random() ** 2, -1)).quantize(Decimal('0.01'))
+        return category_id, slug, title, brand, color, price
+
+    def create_products(self, total, sellers):
+        """Productos (con la ubicación de su vendedora) e imágenes, por lotes"""
+        product_ids = []
+
+        for start, end in chunks(total, self.batch_size):
+            products, slugs = [], []
+            for _ in range(start, end):
+                seller_id, (city, state, lat, lon) = self.rng.choice(sellers)
+                category_id, slug, title, brand, color, price = self.product_fields()
+                created_at = self.past(365)
+                products.append(Product(
+                    seller_id=seller_id, category_id=category_id, title=title,
+                    description=f'{title}. Publicado por una vendedora de {city}.',
+                    product_type=self.pick(PRODUCT_TYPES),
+                    condition=self.pick(CONDITIONS),
+                    status=self.pick(STATUSES),
+                    price=price, stock=self.rng.randint(0, 50), brand=brand, color=color,
+                    size=self.rng.choice(SIZES), city=city, state=state, latitude=lat, longitude=lon,
+                    created_at=created_at, updated_at=created_at,
+                ))
+                slugs.append(slug)
+
+            with transaction.atomic():
+                Product.objects.bulk_create(products)
+                images = []
+                for product, slug in zip(products, slugs):
+                    for order in range(self.rng.randint(0, 3)):
+                        images.append(ProductImage(
+                            product_id=product.pk, order=order, is_primary=order == 0,
+                            image=f'products/fake/{slug}-{self.rng.randint(1, 20):02d}.jpg',
+                            alt_text=product.title[:200],
+                        ))
+                ProductImage.objects.bulk_create(images, batch_size=self.batch_size)
+
+            product_ids.extend(product.pk for product in products)
+        return product_ids
+
+    def popular_product(self, product_ids):
+        """Producto con popularidad sesgada: pocos productos concentran la mayoría de visitas"""
+        return product_ids[int(len(product_ids) * self.rng.random() ** 3)]
+
+    def create_carts(self, total, product_ids):
+        buyers = self.rng.sample(self.user_ids, min(total, len(self.user_ids)))
+        for start, end in chunks(len(buyers), self.batch_size):
+            with transaction.atomic():
+                carts = Cart.objects.bulk_create([Cart(user_id=user_id) for user_id in buyers[start:end]])
+                items = []
+                for cart in carts:
+                    chosen = {self.popular_product(product_ids) for _ in range(self.rng.randint(1, 5))}
+                    items.extend(
+                        CartItem(cart_id=cart.pk, product_id=product_id, quantity=self.rng.randint(1, 3))
+                        for product_id in chosen
+                    )
+                CartItem.objects.bulk_create(items, batch_size=self.batch_size)
+
+    def create_reviews(self, total):
+        """Reseñas entre pares únicos; la reputación se recalcula al final en bloque"""
+        pairs = set()
+        max_pairs = len(self.user_ids) * (len(self.user_ids) - 1)
+        reviews = []
+        while len(pairs) < min(total, max_pairs):
+            reviewer, reviewed = self.rng.sample(self.user_ids, 2)
+            if (reviewer, reviewed) in pairs:
+                continue
+            pairs.add((reviewer, reviewed))
+            reviews.append(Review(
+                reviewer_id=reviewer, reviewed_id=reviewed,
+                rating=self.pick(RATINGS),
+                comment=self.rng.choice(['Excelente vendedora', 'Todo perfecto', 'Tardó en responder', '']),
+                created_at=self.past(365),
+            ))
+            if len(reviews) >= self.batch_size:
+                Review.objects.bulk_create(reviews)
+                reviews = []
+        Review.objects.bulk_create(reviews)
+
+        # bulk_create no pasa por Review.save(): recalcular reputaciones de una vez
+        call_command('recompute_reputation', batch_size=self.batch_size, stdout=self.stdout)
+
+    def create_views(self, total, product_ids):
+        """Historial de visitas de los últimos 90 días; luego sincroniza Product.views"""
+        for start, end in chunks(total, self.batch_size):
+            ProductView.objects.bulk_create([
+                ProductView(
+                    product_id=self.popular_product(product_ids),
+                    user_id=self.rng.choice(self.user_ids) if self.rng.random() < 0.5 else None,
+                    ip_address=f'10.{self.rng.randrange(256)}.{self.rng.randrange(256)}.{self.rng.randrange(1, 255)}',
+                    user_agent=self.rng.choice(USER_AGENTS),
+                    viewed_at=self.past(90),
+                )
+                for _ in range(start, end)
+            ])
+
+        # Un único UPDATE con subconsulta para que el contador coincida con el historial
+        counts = (
+            ProductView.objects.filter(product_id=OuterRef('pk'))
+            .order_by().values('product_id').annotate(total=Count('id')).values('total')
+        )
+        Product.objects.filter(seller__username__startswith=self.prefix).update(
+            views=Coalesce(Subquery(counts), 0)
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from apps.products.models import SiteCounter
+from apps.products.services import refresh_site_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcular los contadores del home (SiteCounter) con conteos exactos. '
+        'Las signals los mantienen al día; correrlo periódicamente corrige el desvío '
+        'de update() y bulk_create()'
+    )
+
+    def handle(self, *args, **options):
+        before = dict(SiteCounter.objects.values_list('name', 'value'))
+        for name, value in refresh_site_counters().items():
+            drift = value - before.get(name, 0)
+            self.stdout.write(self.style.SUCCESS(f'✓ {name}: {value} (desvío {drift:+d})'))
@@ -0,0 +1,175 @@
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.products.models import Category, Product
+from apps.products.services import bump_catalog_version, catalog_bulk_updated
+from apps.users.models import User, Profile, Reputation
+
+
+# Categorías iniciales del marketplace (clave: slug)
+CATEGORIES = [
+    {
+        'name': 'Esmaltes y Lacas',
+        'slug': 'esmaltes-lacas',
+        'description': 'Esmaltes tradicionales, semipermanentes, en gel, vinílicos. Todas las marcas y colores.',
+    },
+    {
+        'name': 'Sistemas de Uñas',
+        'slug': 'sistemas-unas',
+        'description': 'Acrílico, polygel, sistema ruso, tips, moldes y todo para construcción de uñas.',
+    },
+    {
+        'name': 'Herramientas Básicas',
+        'slug': 'herramientas-basicas',
+        'description': 'Limas, cortaúñas, alicates, empujadores de cutícula, palitos de naranjo.',
+    },
+    {
+        'name': 'Equipamiento Profesional',
+        'slug': 'equipamiento-profesional',
+        'description': 'Lámparas UV/LED, tornos, pulidoras, aspiradores de polvo, esterilizadores.',
+    },
+    {
+        'name': 'Cuidado de Uñas',
+        'slug': 'cuidado-unas',
+        'description': 'Aceites de cutícula, cremas nutritivas, tratamientos fortalecedores, removedores.',
+    },
+    {
+        'name': 'Arte y Decoración',
+        'slug': 'arte-decoracion',
+        'description': 'Stickers, calcomanías, strass, brillos, glitters, plantillas, accesorios 3D, foils.',
+    },
+    {
+        'name': 'Preparación y Acabado',
+        'slug': 'preparacion-acabado',
+        'description': 'Primers, base coat, top coat, deshidratadores, limpiadores, buff, brillos finales.',
+    },
+    {
+        'name': 'Pinceles y Aplicadores',
+        'slug': 'pinceles-aplicadores',
+        'description': 'Pinceles para arte, gel, acrílico. Dotting tools, esponjas, degradadores.',
+    },
+    {
+        'name': 'Organización y Mobiliario',
+        'slug': 'organizacion-mobiliario',
+        'description': 'Exhibidores, organizadores, porta esmaltes, mesas, sillas, lámparas de trabajo.',
+    },
+    {
+        'name': 'Insumos Sanitarios',
+        'slug': 'insumos-sanitarios',
+        'description': 'Desinfectantes, alcohol, guantes, barbijos, toallas desechables, papel camilla.',
+    },
+]
+
+# Vendedoras de demostración (clave: username)
+DEMO_SELLERS = [
+    {'username': 'demo-unas-palermo', 'email': 'demo-palermo@example.com', 'first_name': 'Lucía'},
+    {'username': 'demo-nails-cordoba', 'email': 'demo-cordoba@example.com', 'first_name': 'Martina'},
+    {'username': 'demo-insumos-rosario', 'email': 'demo-rosario@example.com', 'first_name': 'Camila'},
+]
+
+# Productos de demostración (clave: vendedora + título)
+DEMO_PRODUCTS = [
+    ('demo-unas-palermo', 'esmaltes-lacas', 'Esmalte semipermanente rosa nude 10ml', 'Meliné', '4500.00', 'Palermo', 'CABA'),
+    ('demo-unas-palermo', 'preparacion-acabado', 'Top coat brillo extremo 15ml', 'Cherimoya', '6200.00', 'Palermo', 'CABA'),
+    ('demo-unas-palermo', 'arte-decoracion', 'Set de strass cristal 1440 piezas', '', '3800.00', 'Palermo', 'CABA'),
+    ('demo-nails-cordoba', 'equipamiento-profesional', 'Lámpara UV/LED 48W con sensor', 'Sun', '28500.00', 'Córdoba', 'Córdoba'),
+    ('demo-nails-cordoba', 'sistemas-unas', 'Kit polygel 6 colores con slip', 'Mia Secret', '19900.00', 'Córdoba', 'Córdoba'),
+    ('demo-nails-cordoba', 'herramientas-basicas', 'Alicate de cutícula acero inoxidable', 'Sapucai', '7400.00', 'Córdoba', 'Córdoba'),
+    ('demo-insumos-rosario', 'cuidado-unas', 'Aceite de cutícula almendras 30ml', 'Cuccio', '3100.00', 'Rosario', 'Santa Fe'),
+    ('demo-insumos-rosario', 'pinceles-aplicadores', 'Set de pinceles liner x5', '', '5200.00', 'Rosario', 'Santa Fe'),
+    ('demo-insumos-rosario', 'insumos-sanitarios', 'Guantes de nitrilo x100 talle S', '', '8900.00', 'Rosario', 'Santa Fe'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Carga o actualiza las categorías (y opcionalmente datos demo) de forma idempotente'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--demo',
+            action='store_true',
+            help='Cargar también vendedoras y productos de demostración'
+        )
+
+    def handle(self, *args, **options):
+        categories = self.seed_categories()
+        if options['demo']:
+            with transaction.atomic():
+                self.seed_demo(categories)
+            # bulk_create/bulk_update no disparan signals: invalidar fragmentos y recalcular contadores acá
+            catalog_bulk_updated()
+
+    def seed_categories(self):
+        """Upsert de categorías por slug. Sin cambios: una sola consulta."""
+        existing = {
+            category.slug: category
+            for category in Category.objects.only('id', 'slug', 'name', 'description')
+        }
+        changed = [
+            data for data in CATEGORIES
+            if data['slug'] not in existing
+            or (existing[data['slug']].name, existing[data['slug']].description) != (data['name'], data['description'])
+        ]
+
+        if not changed:
+            self.stdout.write(self.style.SUCCESS(f'✓ Categorías al día ({len(existing)} en la base)'))
+            return existing
+
+        Category.objects.bulk_create(
+            [Category(**data) for data in changed],
+            update_conflicts=True,
+            unique_fields=['slug'],
+            update_fields=['name', 'description'],
+        )
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f'✓ Categorías creadas/actualizadas: {len(changed)}'))
+        return {category.slug: category for category in Category.objects.only('id', 'slug')}
+
+    def seed_demo(self, categories):
+        """Vendedoras (upsert por username) y productos demo"""
+        User.objects.bulk_create(
+            [User(role='seller', is_verified=True, password='!', **data) for data in DEMO_SELLERS],
+            update_conflicts=True,
+            unique_fields=['username'],
+            update_fields=['email', 'first_name', 'role'],
+        )
+        sellers = dict(
+            User.objects.filter(username__in=[data['username'] for data in DEMO_SELLERS])
+            .values_list('username', 'id')
+        )
+
+        # bulk_create no dispara post_save: crear Profile/Reputation acá
+        Profile.objects.bulk_create([Profile(user_id=user_id) for user_id in sellers.values()], ignore_conflicts=True)
+        Reputation.objects.bulk_create([Reputation(user_id=user_id) for user_id in sellers.values()], ignore_conflicts=True)
+
+        # Product no tiene slug: se identifica por vendedora + título
+        existing = {
+            (product.seller_id, product.title): product
+            for product in Product.objects.filter(seller_id__in=sellers.values())
+        }
+        to_create, to_update = [], []
+        for username, category_slug, title, brand, price, city, state in DEMO_PRODUCTS:
+            values = {
+                'category_id': categories[category_slug].id,
+                'brand': brand,
+                'price': Decimal(price),
+                'city': city,
+                'state': state,
+            }
+            product = existing.get((sellers[username], title))
+            if product is None:
+                to_create.append(Product(
+                    seller_id=sellers[username], title=title, stock=10,
+                    description=f'{title}. Producto de demostración.', **values
+                ))
+            elif any(getattr(product, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(product, field, value)
+                to_update.append(product)
+
+        Product.objects.bulk_create(to_create)
+        Product.objects.bulk_update(to_update, ['category', 'brand', 'price', 'city', 'state'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Demo: {len(sellers)} vendedoras, {len(to_create)} productos creados, '
+            f'{len(to_update)} actualizados'
+        ))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_counters(apps, schema_editor):
+    """Valores iniciales de los contadores (desde ahí los mantienen las signals)"""
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Product = apps.get_model('products', 'Product')
+    SiteCounter = apps.get_model('products', 'SiteCounter')
+    SiteCounter.objects.bulk_create([
+        SiteCounter(name='users', value=User.objects.count()),
+        SiteCounter(name='available_products', value=Product.objects.filter(status='available').count()),
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_alter_product_product_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Nombre')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Valor')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+            ],
+            options={
+                'verbose_name': 'Contador del sitio',
+                'verbose_name_plural': 'Contadores del sitio',
+            },
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
@@ -104,6 +104,13 @@ class Product(models.Model):
     def __str__(self):
         return f"{self.title} - ${self.price}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Recordar el estado leído de la base (signals de contadores del sitio)"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def is_available(self):
         """Verificar si el producto está disponible"""
         return self.status == 'available' and self.stock > 0
@@ -155,4 +162,22 @@ class ProductView(models.Model):
     
     def __str__(self):
         return f"{self.product.title} - {self.viewed_at}"
- 
\ No newline at end of file
+ 
+
+
+class SiteCounter(models.Model):
+    """
+    Contadores del sitio que muestra el home (usuarios, productos disponibles).
+    Los mantienen las signals con UPDATE incrementales; refresh_site_counters
+    los recalcula para corregir lo que no pasa por signals (update, bulk_create).
+    """
+    name = models.CharField(max_length=50, primary_key=True, verbose_name='Nombre')
+    value = models.BigIntegerField(default=0, verbose_name='Valor')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
+
+    class Meta:
+        verbose_name = 'Contador del sitio'
+        verbose_name_plural = 'Contadores del sitio'
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
@@ -14,6 +14,9 @@ class CategorySerializer(serializers.ModelSerializer):
     
     def get_products_count(self, obj):
         """Contar productos activos en la categoría"""
+        # El ViewSet lo anota en la misma consulta; contar solo si no viene anotado
+        if hasattr(obj, 'available_count'):
+            return obj.available_count
         return obj.products.filter(status='available').count()
 
 
@@ -43,24 +46,18 @@ class ProductListSerializer(serializers.ModelSerializer):
     
     def get_primary_image(self, obj):
         """Obtener imagen principal del producto"""
-        # Primero buscar imagen marcada como principal
-        primary_image = obj.images.filter(is_primary=True).first()
-        
-        if primary_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(primary_image.image.url)
-            return primary_image.image.url
-        
-        # Si no hay imagen principal, tomar la primera imagen disponible
-        first_image = obj.images.first()
-        if first_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(first_image.image.url)
-            return first_image.image.url
-        
-        return None
+        # Recorrer obj.images.all() usa el prefetch del queryset en lugar de
+        # dos consultas por producto
+        images = list(obj.images.all())
+        # Primero buscar imagen marcada como principal; si no, la primera
+        image = next((img for img in images if img.is_primary), images[0] if images else None)
+        if image is None:
+            return None
+
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(image.image.url)
+        return image.image.url
 
 
 class ProductDetailSerializer(serializers.ModelSerializer):
@@ -0,0 +1,89 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from apps.monitoring.metrics import record_cache
+from apps.users.models import User
+from .models import Product, SiteCounter
+
+
+# Sello de versión del catálogo: forma parte de la clave de los fragmentos
+# cacheados de los templates ({% cache %}), así un cambio en categorías o
+# productos los invalida a todos sin tener que borrarlos uno por uno
+CATALOG_VERSION_CACHE_KEY = 'catalog:version'
+
+
+def get_catalog_version():
+    """
+    Versión actual del catálogo.
+    Si la entrada no existe (cache vacío o desalojado) se crea una nueva,
+    distinta de cualquier anterior, para no reutilizar fragmentos viejos.
+    """
+    version = cache.get(CATALOG_VERSION_CACHE_KEY)
+    record_cache('catalog_version', version is not None)
+    if version is None:
+        version = str(time.time_ns())
+        if not cache.add(CATALOG_VERSION_CACHE_KEY, version, None):
+            version = cache.get(CATALOG_VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidar los fragmentos que dependen del catálogo"""
+    cache.set(CATALOG_VERSION_CACHE_KEY, str(time.time_ns()), None)
+
+
+def fragment_version():
+    """Clave de versión de los fragmentos: deploy + catálogo"""
+    return f'{settings.FRAGMENT_CACHE_VERSION}:{get_catalog_version()}'
+
+
+def catalog_bulk_updated():
+    """Después de update()/bulk_create(), que no disparan signals"""
+    bump_catalog_version()
+    refresh_site_counters()
+
+
+# ==========================================
+# Contadores del home
+# ==========================================
+
+SITE_COUNTERS = ('users', 'available_products')
+# Copia en memoria del proceso: {'values': {...}, 'expires': monotonic}
+_site_counters = {'values': None, 'expires': 0.0}
+
+
+def get_site_counters():
+    """
+    Contadores del home sin consultas de conteo: lee SiteCounter por clave primaria
+    y lo guarda en memoria SITE_COUNTERS_TTL segundos.
+    """
+    now = time.monotonic()
+    if _site_counters['values'] is None or now >= _site_counters['expires']:
+        values = dict.fromkeys(SITE_COUNTERS, 0)
+        values.update(SiteCounter.objects.filter(name__in=SITE_COUNTERS).values_list('name', 'value'))
+        _site_counters.update(values=values, expires=now + settings.SITE_COUNTERS_TTL)
+    return _site_counters['values']
+
+
+def adjust_site_counter(name, delta):
+    """Sumar delta con un UPDATE atómico, sin leer el valor"""
+    if delta:
+        SiteCounter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def count_site_counters():
+    """Conteo exacto: recorre las tablas, no usar en requests"""
+    return {
+        'users': User.objects.count(),
+        'available_products': Product.objects.filter(status='available').count(),
+    }
+
+
+def refresh_site_counters():
+    """Recalcular los contadores (corrige el desvío de update/bulk_create)"""
+    values = count_site_counters()
+    for name, value in values.items():
+        SiteCounter.objects.update_or_create(name=name, defaults={'value': value})
+    _site_counters['expires'] = 0.0
+    return values
@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.users.models import User
+from .models import Category, Product
+from .services import adjust_site_counter, bump_catalog_version
+
+# Guardados que no cambian los fragmentos cacheados ni los contadores del sitio
+IGNORED_PRODUCT_FIELDS = frozenset({'views'})
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def catalog_changed(sender, **kwargs):
+    """
+    Subir la versión del catálogo cuando se confirma la transacción,
+    para que ningún request vuelva a cachear el estado anterior con la versión nueva.
+    Los update()/bulk_create() no disparan signals: llamar catalog_bulk_updated a mano.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Contador de productos disponibles y versión del catálogo.
+    El contador de vistas se guarda en cada visita: no cambia nada de eso.
+    """
+    if update_fields and set(update_fields) <= IGNORED_PRODUCT_FIELDS:
+        return
+    if not update_fields or 'status' in update_fields:
+        # _loaded_status lo deja Product.from_db; un producto nuevo no estaba disponible
+        was_available = not created and getattr(instance, '_loaded_status', None) == 'available'
+        adjust_site_counter('available_products', (instance.status == 'available') - was_available)
+        instance._loaded_status = instance.status
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    if getattr(instance, '_loaded_status', instance.status) == 'available':
+        adjust_site_counter('available_products', -1)
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_site_counter('users', 1)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    adjust_site_counter('users', -1)
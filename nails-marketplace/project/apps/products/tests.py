@@ -0,0 +1,312 @@
+from io import StringIO
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, override_settings
+from apps.users.authentication import ClaimsRefreshToken
+from apps.users.models import User, Profile, Reputation
+from .models import Category, Product, ProductImage, ProductView, SiteCounter
+from .services import get_catalog_version, get_site_counters
+
+
+class SeedCatalogTests(TestCase):
+    """Comando seed_catalog"""
+
+    def test_seed_is_idempotent(self):
+        call_command('seed_catalog', '--demo', stdout=StringIO())
+        categories = Category.objects.count()
+        products = Product.objects.count()
+
+        # Sin cambios: una sola consulta de lectura
+        with self.assertNumQueries(1):
+            call_command('seed_catalog', stdout=StringIO())
+
+        call_command('seed_catalog', '--demo', stdout=StringIO())
+        self.assertEqual(Category.objects.count(), categories)
+        self.assertEqual(Product.objects.count(), products)
+
+    def test_seed_updates_changed_category(self):
+        call_command('seed_catalog', stdout=StringIO())
+        Category.objects.filter(slug='esmaltes-lacas').update(description='desactualizada')
+
+        call_command('seed_catalog', stdout=StringIO())
+
+        self.assertNotEqual(Category.objects.get(slug='esmaltes-lacas').description, 'desactualizada')
+
+
+class GenerateFakeCatalogTests(TestCase):
+    """Comando generate_fake_catalog"""
+
+    def generate(self, *args):
+        call_command(
+            'generate_fake_catalog', '--users', '12', '--products', '40', '--batch-size', '7',
+            *args, stdout=StringIO()
+        )
+
+    def test_generates_related_rows(self):
+        self.generate()
+
+        users = User.objects.filter(username__startswith='fake-')
+        self.assertEqual(users.count(), 12)
+        self.assertEqual(Profile.objects.filter(user__in=users).count(), 12)
+        self.assertEqual(Reputation.objects.filter(user__in=users).count(), 12)
+        self.assertEqual(Product.objects.count(), 40)
+        self.assertEqual(ProductView.objects.count(), 120)
+        self.assertTrue(ProductImage.objects.exists())
+        self.assertFalse(Product.objects.filter(city='').exists())
+
+    def test_same_seed_is_reproducible(self):
+        self.generate()
+        first = list(Product.objects.order_by('id').values_list('title', 'price', 'city', 'views'))
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+        self.generate('--purge')
+        second = list(Product.objects.order_by('id').values_list('title', 'price', 'city', 'views'))
+        self.assertEqual(first, second)
+
+
+class AsyncCatalogTests(TestCase):
+    """Endpoints async del catálogo"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create_user('vendedora', 'vendedora@example.com', 'clave-segura-123')
+        cls.category = Category.objects.create(name='Esmaltes', slug='esmaltes')
+        cls.products = [
+            Product.objects.create(
+                seller=cls.seller, category=cls.category, title=f'Esmalte {n}',
+                description='Esmalte semipermanente', price='1500.00', stock=5
+            )
+            for n in range(3)
+        ]
+        Product.objects.create(
+            seller=cls.seller, category=cls.category, title='Vendido',
+            description='Ya no está', price='900.00', status='sold'
+        )
+
+    async def test_product_list_paginates_available(self):
+        response = await self.async_client.get('/api/v1/catalog/products/', {'page_size': 2})
+
+        data = response.json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNotNone(data['next'])
+        self.assertEqual(data['results'][0]['category_name'], 'Esmaltes')
+
+    async def test_product_detail_includes_similar_and_seller(self):
+        product = self.products[0]
+        response = await self.async_client.get(f'/api/v1/catalog/products/{product.pk}/')
+
+        data = response.json()
+        self.assertEqual(data['seller']['username'], 'vendedora')
+        self.assertEqual(data['seller']['available_products'], 3)
+        self.assertEqual(len(data['similar']), 2)
+        await product.arefresh_from_db()
+        self.assertEqual(product.views, 1)
+        self.assertEqual(await ProductView.objects.filter(product=product).acount(), 1)
+
+    async def test_writes_are_rejected_before_authenticating(self):
+        # Con JWT, authenticate() en una escritura usaría el ORM sync (500)
+        token = ClaimsRefreshToken.for_user(self.seller).access_token
+        product = self.products[0]
+        response = await self.async_client.post(
+            f'/api/v1/catalog/products/{product.pk}/', headers={'Authorization': f'Bearer {token}'}
+        )
+
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(await ProductView.objects.filter(product=product).acount(), 0)
+
+    async def test_product_detail_not_found(self):
+        response = await self.async_client.get('/api/v1/catalog/products/999999/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_categories_single_query(self):
+        Category.objects.create(name='Geles', slug='geles')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/catalog/categories/')
+
+        counts = {c['slug']: c['products_count'] for c in response.json()['results']}
+        self.assertEqual(counts, {'esmaltes': 3, 'geles': 0})
+
+
+class FragmentCacheTests(TestCase):
+    """Fragmentos cacheados de los templates (navbar y sidebar de categorías)"""
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user('vendedora', 'vendedora@example.com', 'clave-segura-123')
+        self.category = Category.objects.create(name='Esmaltes', slug='esmaltes')
+        self.other = Category.objects.create(name='Geles', slug='geles')
+        self.product = Product.objects.create(
+            seller=self.seller, category=self.other, title='Gel builder',
+            description='Gel de construcción', price='2500.00'
+        )
+
+    def sidebar(self):
+        return self.client.get(f'/category/{self.category.slug}/').content.decode()
+
+    def test_sidebar_reused_until_catalog_changes(self):
+        self.assertIn('Geles', self.sidebar())
+
+        # update() no dispara signals: el fragmento sigue vigente
+        Category.objects.filter(pk=self.other.pk).update(name='Geles UV')
+        self.assertNotIn('Geles UV', self.sidebar())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Tips', slug='tips')
+        html = self.sidebar()
+        self.assertIn('Geles UV', html)
+        self.assertIn('Tips', html)
+
+    def test_product_changes_bump_version_except_views(self):
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.increment_views()
+        self.assertEqual(get_catalog_version(), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.status = 'sold'
+            self.product.save()
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_navbar_cached_per_auth_state(self):
+        self.assertIn('Ingresar', self.client.get('/').content.decode())
+
+        self.client.force_login(self.seller)
+        html = self.client.get('/').content.decode()
+        self.assertNotIn('Ingresar', html)
+        self.assertIn('vendedora', html)
+
+        other = User.objects.create_user('compradora', 'compradora@example.com', 'clave-segura-123')
+        self.client.force_login(other)
+        html = self.client.get('/').content.decode()
+        self.assertIn('compradora', html)
+        self.assertNotIn('vendedora', html)
+
+    def test_navbar_survives_catalog_changes(self):
+        self.client.get('/')
+        key = make_template_fragment_key('navbar', [False, settings.FRAGMENT_CACHE_VERSION])
+        html = cache.get(key)
+        self.assertIn('Ingresar', html)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Tips', slug='tips')
+        # Marcar la copia cacheada para ver que se reutiliza
+        cache.set(key, html.replace('Ingresar', 'Ingresar (cache)'))
+        self.assertIn('Ingresar (cache)', self.client.get('/').content.decode())
+
+
+@override_settings(SITE_COUNTERS_TTL=0)
+class SiteCounterTests(TestCase):
+    """Contadores del home mantenidos por signals"""
+
+    def setUp(self):
+        call_command('refresh_site_counters', stdout=StringIO())
+        self.seller = User.objects.create_user('vendedora', 'vendedora@example.com', 'clave-segura-123')
+        self.category = Category.objects.create(name='Esmaltes', slug='esmaltes')
+
+    def create_product(self, **kwargs):
+        return Product.objects.create(
+            seller=self.seller, category=self.category, title='Esmalte',
+            description='Esmalte semipermanente', price='1500.00', **kwargs
+        )
+
+    def test_signals_track_available_products(self):
+        start = get_site_counters()['available_products']
+        product = self.create_product()
+        self.create_product(status='inactive')
+        self.assertEqual(get_site_counters()['available_products'], start + 1)
+
+        product = Product.objects.get(pk=product.pk)
+        product.status = 'sold'
+        product.save()
+        product.save()
+        self.assertEqual(get_site_counters()['available_products'], start)
+
+        product.status = 'available'
+        product.save(update_fields=['status'])
+        product.delete()
+        self.assertEqual(get_site_counters()['available_products'], start)
+
+    def test_signals_track_users(self):
+        start = get_site_counters()['users']
+        user = User.objects.create_user('compradora', 'compradora@example.com', 'clave-segura-123')
+        self.assertEqual(get_site_counters()['users'], start + 1)
+        user.delete()
+        self.assertEqual(get_site_counters()['users'], start)
+
+    def test_refresh_fixes_drift_from_update(self):
+        self.create_product()
+        Product.objects.update(status='sold')
+        self.assertEqual(get_site_counters()['available_products'], 1)
+
+        out = StringIO()
+        call_command('refresh_site_counters', stdout=out)
+        self.assertEqual(SiteCounter.objects.get(name='available_products').value, 0)
+        self.assertIn('available_products: 0 (desvío -1)', out.getvalue())
+
+    @override_settings(SITE_COUNTERS_TTL=60)
+    def test_home_without_counting_queries(self):
+        self.create_product()
+        self.client.get('/')
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/')
+        self.assertEqual(response.context['total_users'], User.objects.count())
+        self.assertEqual(response.context['total_products'], 1)
+
+
+class AdminQueryTests(TestCase):
+    """Changelists del admin con cantidad de consultas fija"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'clave-segura-123'))
+        self.category = Category.objects.create(name='Esmaltes', slug='esmaltes')
+        self.add_products(2)
+
+    def add_products(self, count):
+        start = Product.objects.count()
+        for n in range(start, start + count):
+            seller = User.objects.create(username=f'vendedora{n}', email=f'vendedora{n}@example.com')
+            product = Product.objects.create(
+                seller=seller, category=self.category, title=f'Esmalte {n}',
+                description='Esmalte semipermanente', price='1500.00'
+            )
+            ProductView.objects.create(product=product, user=seller, ip_address='127.0.0.1')
+
+    def queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(captured)
+
+    def test_changelists_do_not_grow_with_rows(self):
+        urls = ['/admin/products/product/', '/admin/products/productview/', '/admin/products/category/',
+                f'/admin/products/category/{self.category.pk}/change/']
+        self.queries(urls[0])  # primera carga: cachea permisos y content types
+        before = [self.queries(url) for url in urls]
+        self.add_products(25)
+        self.assertEqual([self.queries(url) for url in urls], before)
+
+    def test_category_inline_is_paginated(self):
+        self.add_products(23)
+        url = f'/admin/products/category/{self.category.pk}/change/'
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.context['inline_admin_formsets'][0].formset.forms), 20)
+        self.assertContains(response, 'Página 1 de 2')
+
+        response = self.client.get(url, {'products-page': 2})
+        self.assertEqual(len(response.context['inline_admin_formsets'][0].formset.forms), 5)
+
+    def test_product_form_uses_autocomplete(self):
+        response = self.client.get('/admin/products/product/add/')
+        self.assertNotContains(response, 'vendedora1@example.com')
+        self.assertContains(response, 'admin-autocomplete')
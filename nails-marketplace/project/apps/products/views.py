@@ -1,7 +1,9 @@
+from decimal import Decimal
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from django.db.models import Count, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Category, Product, ProductImage, ProductView
 from .serializers import (
@@ -21,7 +23,9 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /api/v1/categories/{id}/ - Detalle de una categoría
     - GET /api/v1/categories/{id}/products/ - Productos de una categoría
     """
-    queryset = Category.objects.filter(is_active=True)
+    queryset = Category.objects.filter(is_active=True).annotate(
+        available_count=Count('products', filter=Q(products__status='available'))
+    ).order_by('name')
     serializer_class = CategorySerializer
     lookup_field = 'slug'
     
@@ -32,7 +36,7 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
         products = Product.objects.filter(
             category=category,
             status='available'
-        ).order_by('-created_at')
+        ).select_related('seller', 'category').prefetch_related('images').order_by('-created_at')
         
         # Aplicar filtros
         filterset = ProductFilter(request.GET, queryset=products)
@@ -99,7 +103,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         if request.user != instance.seller:
             ProductView.objects.create(
                 product=instance,
-                user=request.user if request.user.is_authenticated else None,
+                user_id=request.user.pk if request.user.is_authenticated else None,
                 ip_address=self.get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', '')
             )
@@ -128,7 +132,7 @@ class ProductViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_products(self, request):
         """Listar productos del usuario actual"""
-        products = self.get_queryset().filter(seller=request.user)
+        products = self.get_queryset().filter(seller_id=request.user.pk)
         
         page = self.paginate_queryset(products)
         if page is not None:
@@ -147,11 +151,11 @@ class ProductViewSet(viewsets.ModelViewSet):
         similar_products = Product.objects.filter(
             category=product.category,
             status='available'
-        ).exclude(
+        ).select_related('seller', 'category').prefetch_related('images').exclude(
             id=product.id
         ).filter(
-            price__gte=product.price * 0.7,  # ±30% del precio
-            price__lte=product.price * 1.3
+            price__gte=product.price * Decimal('0.7'),  # ±30% del precio
+            price__lte=product.price * Decimal('1.3')
         )[:6]
         
         serializer = ProductListSerializer(
@@ -166,7 +170,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         """Productos destacados (más vistos)"""
         featured = Product.objects.filter(
             status='available'
-        ).order_by('-views')[:10]
+        ).select_related('seller', 'category').prefetch_related('images').order_by('-views')[:10]
         
         serializer = ProductListSerializer(
             featured,
@@ -201,7 +205,7 @@ class ProductImageViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filtrar solo imágenes de productos del usuario"""
         if self.request.user.is_authenticated:
-            return self.queryset.filter(product__seller=self.request.user)
+            return self.queryset.filter(product__seller_id=self.request.user.pk)
         return self.queryset.none()
     
     def perform_create(self, serializer):
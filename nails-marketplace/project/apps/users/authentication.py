@@ -0,0 +1,231 @@
+import copy
+import time
+from functools import cached_property
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.monitoring.metrics import record_cache
+from .models import User
+
+
+# Claims que viajan en el token y alcanzan para la mayoría de las lecturas
+USER_CLAIMS = ('username', 'role', 'is_staff')
+
+# Cache por worker de usuarios completos: {user_id: (expira, estado, user)}
+_user_cache = {}
+USER_CACHE_MAX_ENTRIES = 2048
+
+# Estado compartido entre workers de un usuario que cambió: (versión, is_active)
+USER_STATE_CACHE_KEY = 'jwt:user:{user_id}'
+
+
+def get_user_state(user_id):
+    """Estado compartido del usuario, o None si no cambió en el último rato"""
+    return cache.get(USER_STATE_CACHE_KEY.format(user_id=user_id))
+
+
+def _load_user(user_id):
+    now = time.monotonic()
+    state = get_user_state(user_id)
+    entry = _user_cache.get(user_id)
+    # Una entrada cargada antes del último cambio (en cualquier worker) ya no vale
+    hit = bool(entry and entry[0] > now and entry[1] == state)
+    record_cache('jwt_user', hit)
+    if hit:
+        return entry[2]
+
+    try:
+        user = User.objects.select_related('profile', 'reputation').get(pk=user_id)
+    except User.DoesNotExist:
+        raise AuthenticationFailed('Usuario no encontrado', code='user_not_found')
+
+    if len(_user_cache) >= USER_CACHE_MAX_ENTRIES:
+        _user_cache.clear()
+    _user_cache[user_id] = (now + settings.JWT_USER_CACHE_TTL, state, user)
+    return user
+
+
+def get_cached_user(user_id):
+    """
+    Obtener el usuario completo (con profile y reputation) desde el cache del worker.
+    Solo consulta la base si la entrada no existe o venció. Devuelve una copia:
+    la instancia cacheada la comparten todos los threads del worker.
+    """
+    return copy.deepcopy(_load_user(user_id))
+
+
+def invalidate_cached_user(user_id, is_active=True):
+    """
+    Descartar el usuario cacheado en todos los workers (cambio de contraseña,
+    desactivación, cambio de rol o de staff). El estado dura lo que un access token:
+    mientras exista, los claims de tokens previos se ignoran y un usuario desactivado
+    no puede seguir leyendo. Llega a todos los workers solo con un cache compartido
+    (Redis); con LocMemCache cada worker ve únicamente sus propios cambios.
+    """
+    _user_cache.pop(user_id, None)
+    timeout = max(settings.JWT_USER_CACHE_TTL, jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    cache.set(USER_STATE_CACHE_KEY.format(user_id=user_id), (time.time_ns(), is_active), timeout)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token que incluye los datos básicos del usuario como claims"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """
+    Usuario liviano construido desde los claims del token.
+    id, username, role e is_staff salen del token sin tocar la base, salvo que el
+    usuario haya cambiado después de emitirlo (p. ej. le sacaron el staff): ahí salen
+    del usuario completo. Cualquier otro atributo (email, profile, reputation,
+    check_password...) se resuelve contra el usuario completo cacheado por worker.
+    """
+
+    def __str__(self):
+        return self.username
+
+    @cached_property
+    def full_user(self):
+        """Instancia completa del modelo User, propia de este request"""
+        return get_cached_user(self.pk)
+
+    @cached_property
+    def user_state(self):
+        """Estado compartido del usuario (ver invalidate_cached_user)"""
+        return get_user_state(self.pk)
+
+    @cached_property
+    def claims_outdated(self):
+        """El usuario cambió después de emitido el token"""
+        if self.user_state is None:
+            return False
+        return self.user_state[0] >= self.token.get('iat', 0) * 1_000_000_000
+
+    def _claim(self, name):
+        # Tokens emitidos antes de agregar los claims, o con claims viejos
+        if name not in self.token or self.claims_outdated:
+            return getattr(self.full_user, name)
+        return self.token[name]
+
+    @property
+    def username(self):
+        return self._claim('username')
+
+    @property
+    def role(self):
+        return self._claim('role')
+
+    @property
+    def is_staff(self):
+        return self._claim('is_staff')
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.full_user, attr)
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenUser, Model)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    # Operaciones que necesitan el modelo real
+    def save(self, *args, **kwargs):
+        return self.full_user.save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self.full_user.delete(*args, **kwargs)
+
+    def set_password(self, raw_password):
+        return self.full_user.set_password(raw_password)
+
+    def check_password(self, raw_password):
+        return self.full_user.check_password(raw_password)
+
+    @property
+    def groups(self):
+        return self.full_user.groups
+
+    @property
+    def user_permissions(self):
+        return self.full_user.user_permissions
+
+    def get_group_permissions(self, obj=None):
+        return self.full_user.get_group_permissions(obj)
+
+    def get_all_permissions(self, obj=None):
+        return self.full_user.get_all_permissions(obj)
+
+    def has_perm(self, perm, obj=None):
+        return self.full_user.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj=None):
+        return self.full_user.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module):
+        return self.full_user.has_module_perms(module)
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Autenticación JWT sin consulta de usuario por request.
+
+    En métodos seguros (GET, HEAD, OPTIONS) devuelve un ClaimsUser armado con los
+    claims del token; is_active sale del estado compartido si el usuario cambió.
+    En escrituras devuelve el User completo desde el cache del worker, porque las
+    vistas lo asignan a claves foráneas.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is None:
+            return None
+
+        user, validated_token = result
+        if request.method in SAFE_METHODS:
+            state = user.user_state
+            is_active = state is None or state[1]
+        else:
+            user = user.full_user
+            is_active = user.is_active
+        if not is_active:
+            raise AuthenticationFailed('Usuario inactivo', code='user_inactive')
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        # La clase base valida el claim de id; acá solo cambiamos la clase del usuario
+        super().get_user(validated_token)
+        return ClaimsUser(validated_token)
+
+
+async def get_request_user_id(request):
+    """
+    Id del usuario de un request en vistas async (o None si es anónimo).
+    Con token JWT sale de los claims sin consultar la base; si no, de la sesión.
+    Solo para métodos seguros (@require_safe): en escrituras authenticate()
+    carga el usuario completo con el ORM sync.
+    """
+    try:
+        result = ClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if result is not None:
+        return result[0].pk
+
+    user = await request.auser()
+    return user.pk if user.is_authenticated else None
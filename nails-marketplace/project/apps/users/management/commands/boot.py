@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from decouple import config
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Arranque en un solo proceso: migra solo si hay migraciones pendientes, '
+        'sincroniza el superusuario y lanza gunicorn en el mismo intérprete'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-server',
+            action='store_true',
+            help='Ejecutar solo migraciones y superusuario, sin lanzar el servidor'
+        )
+        parser.add_argument(
+            'server_args',
+            nargs='*',
+            help='Argumentos extra para gunicorn (usar después de --)'
+        )
+
+    def handle(self, *args, **options):
+        self.timings = []
+
+        with self.phase('migraciones'):
+            self.migrate_if_needed()
+
+        with self.phase('superusuario'):
+            self.sync_superuser()
+
+        self.report()
+
+        if not options['no_server']:
+            self.run_server(options['server_args'])
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        yield
+        self.timings.append((name, time.perf_counter() - start))
+
+    def report(self):
+        for name, seconds in self.timings:
+            self.stdout.write(f'   ⏱  {name}: {seconds * 1000:.0f} ms')
+
+    def migrate_if_needed(self):
+        """
+        Comparar las migraciones en disco con django_migrations (una sola consulta)
+        y ejecutar migrate solo si falta alguna.
+        """
+        graph = MigrationLoader(None, ignore_no_migrations=True).graph
+        try:
+            applied = set(MigrationRecorder.Migration.objects.values_list('app', 'name'))
+        except DatabaseError:
+            # Base nueva: la tabla django_migrations todavía no existe
+            applied = set()
+
+        pending = [key for key in graph.nodes if key not in applied]
+        if not pending:
+            self.stdout.write(self.style.SUCCESS('✓ Sin migraciones pendientes'))
+            return
+
+        self.stdout.write('→ Hay migraciones pendientes, ejecutando migrate...')
+        call_command('migrate', interactive=False, verbosity=1)
+
+    def sync_superuser(self):
+        """Crear o actualizar el superusuario solo si algo no coincide"""
+        username = config('DJANGO_SUPERUSER_USERNAME', default='admin')
+        email = config('DJANGO_SUPERUSER_EMAIL', default='admin@example.com')
+        password = config('DJANGO_SUPERUSER_PASSWORD', default='changeme123')
+
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            User.objects.create_superuser(username, email, password)
+            self.stdout.write(self.style.SUCCESS(f'✓ Superusuario creado: {username}'))
+            return
+
+        update_fields = []
+        if not (user.is_superuser and user.is_staff):
+            user.is_superuser = user.is_staff = True
+            update_fields += ['is_superuser', 'is_staff']
+        # check_password verifica contra el hash guardado; solo se rehashea si cambió
+        if not user.check_password(password):
+            user.set_password(password)
+            update_fields.append('password')
+
+        if update_fields:
+            user.save(update_fields=update_fields)
+            self.stdout.write(self.style.SUCCESS(f'✓ Superusuario actualizado: {username}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✓ Superusuario al día: {username}'))
+
+    def run_server(self, server_args):
+        """Lanzar gunicorn en este mismo intérprete (Django ya está cargado)"""
+        from gunicorn.app.wsgiapp import WSGIApplication
+
+        # No compartir conexiones abiertas con los workers que va a forkear gunicorn
+        connections.close_all()
+
+        sys.argv = ['gunicorn', *server_args]
+        # gunicorn.conf.py (cargado por defecto desde el directorio actual) define wsgi_app
+        if not os.path.exists('gunicorn.conf.py') and '-c' not in server_args and '--config' not in server_args:
+            sys.argv.append('config.wsgi:application')
+        self.stdout.write('→ Iniciando gunicorn...')
+        self.stdout.flush()
+        WSGIApplication('%(prog)s [OPTIONS] [APP_MODULE]').run()
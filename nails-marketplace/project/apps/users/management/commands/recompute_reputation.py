@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+from decimal import Decimal
+from apps.users.models import Reputation, Review
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la reputación de todos los usuarios a partir de sus reseñas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Cantidad de reputaciones por bulk_update (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # Un único GROUP BY reviewed_id con contadores y promedio real de estrellas
+        stats = {
+            row['reviewed_id']: row
+            for row in Review.objects.order_by().values('reviewed_id').annotate(
+                positive=Count('id', filter=Q(rating__gte=Review.POSITIVE_THRESHOLD)),
+                negative=Count('id', filter=Q(rating__lt=Review.POSITIVE_THRESHOLD)),
+                average=Avg('rating'),
+            )
+        }
+
+        now = timezone.now()
+        fields = ['positive_reviews', 'negative_reviews', 'average_rating', 'updated_at']
+        reputations = Reputation.objects.only('id', 'user_id', *fields).order_by('id')
+        changed = 0
+        last_id = 0
+
+        with transaction.atomic():
+            # Recorrer por rangos de id para no mantener un cursor abierto mientras se escribe
+            while True:
+                batch = list(reputations.filter(id__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                pending = []
+                for reputation in batch:
+                    row = stats.get(reputation.user_id)
+                    positive = row['positive'] if row else 0
+                    negative = row['negative'] if row else 0
+                    average = Decimal(str(round(row['average'], 2))) if row else Decimal('0.00')
+
+                    current = (reputation.positive_reviews, reputation.negative_reviews, reputation.average_rating)
+                    if current == (positive, negative, average):
+                        continue
+
+                    reputation.positive_reviews = positive
+                    reputation.negative_reviews = negative
+                    reputation.average_rating = average
+                    reputation.updated_at = now
+                    pending.append(reputation)
+
+                if pending:
+                    changed += Reputation.objects.bulk_update(pending, fields)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Reputaciones recalculadas: {changed} actualizadas, '
+            f'{len(stats)} usuarios con reseñas'
+        ))
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from apps.users.models import User, Profile, Reputation
+
+
+class Command(BaseCommand):
+    help = 'Crea los Profile/Reputation faltantes y elimina duplicados con consultas por conjuntos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo informar lo que se repararía, sin escribir en la base'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Cantidad de filas por INSERT/DELETE (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+
+        summary = []
+        for model, related_name in ((Profile, 'profile'), (Reputation, 'reputation')):
+            # Anti-join: usuarios sin fila relacionada (LEFT JOIN ... IS NULL)
+            missing = list(
+                User.objects.filter(**{f'{related_name}__isnull': True})
+                .order_by('id')
+                .values_list('id', flat=True)
+            )
+            # Duplicados: todo lo que no sea la primera fila de cada usuario
+            duplicates = list(
+                model.objects.annotate(
+                    row=Window(RowNumber(), partition_by=[F('user_id')], order_by=F('id').asc())
+                )
+                .filter(row__gt=1)
+                .values_list('id', flat=True)
+            )
+
+            if not dry_run:
+                self.repair(model, missing, duplicates, batch_size)
+            summary.append((model._meta.verbose_name_plural, len(missing), len(duplicates)))
+
+        self.print_summary(summary, dry_run)
+
+    def repair(self, model, missing, duplicates, batch_size):
+        """Eliminar duplicados e insertar faltantes por lotes"""
+        for start in range(0, len(duplicates), batch_size):
+            with transaction.atomic():
+                model.objects.filter(id__in=duplicates[start:start + batch_size]).delete()
+
+        for start in range(0, len(missing), batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    [model(user_id=user_id) for user_id in missing[start:start + batch_size]],
+                    ignore_conflicts=True
+                )
+
+    def print_summary(self, summary, dry_run):
+        title = '🔍 Simulación (--dry-run), no se escribió nada' if dry_run else '🔧 Reparación completada'
+        self.stdout.write(title)
+        for name, missing, duplicates in summary:
+            self.stdout.write(f'   {name}: {missing} faltantes, {duplicates} duplicados')
+
+        if not any(missing or duplicates for _, missing, duplicates in summary):
+            self.stdout.write(self.style.SUCCESS('✓ Base de datos limpia'))
+        elif dry_run:
+            self.stdout.write(self.style.WARNING('⚠ Hay relaciones para reparar'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ Relaciones reparadas'))
@@ -1,8 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg, F, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.dispatch import receiver 
-from django.db.models.signals import post_save
 
 class User(AbstractUser):
     """
@@ -65,15 +66,6 @@ class Profile(models.Model):
     def __str__(self):
         return f"Perfil de {self.user.username}"
 
-    @receiver(post_save, sender=User)
-    def create_user_profile(sender, instance, created, **kwargs):
-        if created:
-            Profile.objects.create(user=instance)
-
-    @receiver(post_save, sender=User)
-    def save_user_profile(sender, instance, **kwargs):
-        instance.profile.save()
-
 
 class Reputation(models.Model):
     """
@@ -111,17 +103,42 @@ class Reputation(models.Model):
         return f"Reputación de {self.user.username} - {self.average_rating}★"
     
     def calculate_average_rating(self):
-        """Calcular calificación promedio"""
-        total_reviews = self.positive_reviews + self.negative_reviews
-        if total_reviews == 0:
-            return 0.00
-        
-        # Asumiendo positivas = 5★ y negativas = 1★
-        total_points = (self.positive_reviews * 5) + (self.negative_reviews * 1)
-        self.average_rating = round(total_points / total_reviews, 2)
-        self.save()
+        """Calcular calificación promedio a partir de las estrellas reales"""
+        average = self.user.reviews_received.aggregate(avg=Avg('rating'))['avg'] or 0
+        self.average_rating = round(average, 2)
+        self.save(update_fields=['average_rating', 'updated_at'])
         return self.average_rating
 
+    @classmethod
+    def apply_review_delta(cls, user_id, positive=0, negative=0, create=True):
+        """
+        Actualizar contadores y promedio con un único UPDATE (expresiones F).
+        El promedio se recalcula en la base con una subconsulta sobre las reseñas,
+        así que no se pierden incrementos con escrituras concurrentes.
+        Debe llamarse dentro de la misma transacción que guarda la reseña.
+        Con create=False no crea la reputación que falte (descuentos, borrados).
+        """
+        rating_field = models.DecimalField(max_digits=3, decimal_places=2)
+        average = Subquery(
+            Review.objects.filter(reviewed_id=OuterRef('user_id'))
+            .values('reviewed_id')
+            .annotate(avg=Cast(Avg('rating'), rating_field))
+            .values('avg')[:1]
+        )
+        updates = {
+            'average_rating': Coalesce(average, Value(0), output_field=rating_field),
+            'updated_at': timezone.now(),
+        }
+        if positive:
+            updates['positive_reviews'] = F('positive_reviews') + positive
+        if negative:
+            updates['negative_reviews'] = F('negative_reviews') + negative
+
+        if not cls.objects.filter(user_id=user_id).update(**updates) and create:
+            # Usuario sin reputación (datos previos a los signals): crearla y reintentar
+            cls.objects.create(user_id=user_id)
+            cls.objects.filter(user_id=user_id).update(**updates)
+
 
 class Review(models.Model):
     """
@@ -156,12 +173,68 @@ class Review(models.Model):
     def __str__(self):
         return f"{self.reviewer.username} → {self.reviewed.username}: {self.rating}★"
     
+    POSITIVE_THRESHOLD = 4  # 4★ o más cuenta como reseña positiva
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Recordar calificación y reseñado guardados para ajustar la reputación al editar
+        instance._stored_rating = instance.__dict__.get('rating')
+        instance._stored_reviewed_id = instance.__dict__.get('reviewed_id')
+        return instance
+
+    @classmethod
+    def rating_summary(cls, user_id):
+        """
+        Distribución de estrellas, promedio y total de reseñas recibidas
+        por un usuario, calculados con una sola consulta agrupada por rating.
+        """
+        histogram = {value: 0 for value, _ in cls.RATING_CHOICES}
+        rows = (
+            cls.objects.filter(reviewed_id=user_id)
+            .order_by()
+            .values('rating')
+            .annotate(total=models.Count('id'))
+        )
+        for row in rows:
+            histogram[row['rating']] = row['total']
+
+        count = sum(histogram.values())
+        points = sum(rating * total for rating, total in histogram.items())
+        average = round(points / count, 2) if count else 0
+        return {'count': count, 'average': average, 'histogram': histogram}
+
+    def is_positive(self, rating=None):
+        """Indicar si la calificación cuenta como positiva"""
+        rating = self.rating if rating is None else rating
+        return rating >= self.POSITIVE_THRESHOLD
+
+    def reputation_delta(self, rating=None, sign=1):
+        """(positivas, negativas) que suma (sign=1) o resta (sign=-1) la reseña"""
+        return (sign, 0) if self.is_positive(rating) else (0, sign)
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Actualizar reputación del usuario reseñado
-        reputation, created = Reputation.objects.get_or_create(user=self.reviewed)
-        if self.rating >= 4:
-            reputation.positive_reviews += 1
-        else:
-            reputation.negative_reviews += 1
-        reputation.calculate_average_rating()
\ No newline at end of file
+        """Guardar la reseña y actualizar la reputación del reseñado en la misma transacción"""
+        with transaction.atomic():
+            adding = self._state.adding
+            previous = getattr(self, '_stored_rating', None)
+            previous_reviewed_id = getattr(self, '_stored_reviewed_id', None)
+            super().save(*args, **kwargs)
+
+            if not adding and previous_reviewed_id not in (None, self.reviewed_id):
+                # Reasignada a otro usuario: sale entera de la reputación anterior
+                # y entra en la nueva como una reseña nueva
+                positive, negative = self.reputation_delta(previous, sign=-1)
+                Reputation.apply_review_delta(previous_reviewed_id, positive=positive, negative=negative, create=False)
+                adding = True
+
+            positive = negative = 0
+            if adding:
+                positive, negative = self.reputation_delta()
+            elif previous is not None and self.is_positive(previous) != self.is_positive():
+                # Cambió de positiva a negativa o viceversa
+                positive, negative = (1, -1) if self.is_positive() else (-1, 1)
+
+            Reputation.apply_review_delta(self.reviewed_id, positive=positive, negative=negative)
+        self._stored_rating = self.rating
+        self._stored_reviewed_id = self.reviewed_id
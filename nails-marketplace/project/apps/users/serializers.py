@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .authentication import ClaimsRefreshToken
 from .models import User, Profile, Reputation, Review
 
 
@@ -148,4 +150,9 @@ class ReviewSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Crear reseña y actualizar reputación"""
         validated_data['reviewer'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login JWT que emite tokens con username, role e is_staff como claims"""
+    token_class = ClaimsRefreshToken
@@ -1,23 +1,45 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import User, Profile, Reputation
+from .authentication import invalidate_cached_user
+from .models import User, Profile, Reputation, Review
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """
-    Crear automáticamente Profile y Reputation cuando se crea un usuario
+    Crear Profile y Reputation una sola vez, cuando se crea el usuario.
+    Los guardados posteriores del usuario (last_login, edición de datos)
+    no tocan estas tablas.
     """
-    if created:
-        # get_or_create evita duplicados por si acaso
-        Profile.objects.get_or_create(user=instance)
-        Reputation.objects.get_or_create(user=instance)
+    if not created:
+        return
+
+    with transaction.atomic():
+        # Usuario recién insertado: no puede tener perfil previo, no hace falta get_or_create.
+        # bulk_create deja ambos objetos cacheados en la instancia (user.profile / user.reputation).
+        Profile.objects.bulk_create([Profile(user=instance)])
+        Reputation.objects.bulk_create([Reputation(user=instance)])
+
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def user_changed(sender, instance, created, **kwargs):
+    """
+    Invalidar el usuario cacheado detrás de los JWT en todos los workers.
+    Los update() no disparan signals: llamar invalidate_cached_user a mano.
+    """
+    if not created:
+        user_id, is_active = instance.pk, instance.is_active
+        transaction.on_commit(lambda: invalidate_cached_user(user_id, is_active))
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
     """
-    Guardar el perfil cuando se guarda el usuario
+    Descontar la reseña de la reputación del reseñado. Como signal cubre también
+    QuerySet.delete() y los borrados en cascada (p. ej. al borrar al autor).
+    Corre dentro de la transacción del borrado.
     """
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
-    if hasattr(instance, 'reputation'):
-        instance.reputation.save()
\ No newline at end of file
+    reviewed_id = getattr(instance, '_stored_reviewed_id', None) or instance.reviewed_id
+    positive, negative = instance.reputation_delta(getattr(instance, '_stored_rating', None), sign=-1)
+    # Si se está borrando al reseñado su reputación se va con él: no recrearla
+    Reputation.apply_review_delta(reviewed_id, positive=positive, negative=negative, create=False)
@@ -0,0 +1,299 @@
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory
+from rest_framework.request import Request
+from .authentication import ClaimsJWTAuthentication, _user_cache
+from .models import User, Profile, Reputation, Review
+
+
+class ReputationAggregationTests(TestCase):
+    """Reputación mantenida por las reseñas"""
+
+    def setUp(self):
+        self.seller = User.objects.create_user('vendedora', 'vendedora@example.com', 'clave-segura-123')
+        self.buyers = [
+            User.objects.create_user(f'compradora{i}', f'compradora{i}@example.com', 'clave-segura-123')
+            for i in range(3)
+        ]
+
+    def reputation(self):
+        return Reputation.objects.get(user=self.seller)
+
+    def test_average_uses_real_stars(self):
+        for buyer, rating in zip(self.buyers, [5, 4, 2]):
+            Review.objects.create(reviewer=buyer, reviewed=self.seller, rating=rating)
+
+        reputation = self.reputation()
+        self.assertEqual(reputation.positive_reviews, 2)
+        self.assertEqual(reputation.negative_reviews, 1)
+        self.assertEqual(reputation.average_rating, Decimal('3.67'))
+
+    def test_resave_does_not_double_count(self):
+        review = Review.objects.create(reviewer=self.buyers[0], reviewed=self.seller, rating=5)
+        review.comment = 'Excelente atención'
+        review.save()
+
+        reputation = self.reputation()
+        self.assertEqual((reputation.positive_reviews, reputation.negative_reviews), (1, 0))
+
+        # Pasar de positiva a negativa mueve el contador
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 1
+        review.save()
+
+        reputation = self.reputation()
+        self.assertEqual((reputation.positive_reviews, reputation.negative_reviews), (0, 1))
+        self.assertEqual(reputation.average_rating, Decimal('1.00'))
+
+    def test_delete_discounts_review(self):
+        review = Review.objects.create(reviewer=self.buyers[0], reviewed=self.seller, rating=2)
+        review.delete()
+
+        reputation = self.reputation()
+        self.assertEqual((reputation.positive_reviews, reputation.negative_reviews), (0, 0))
+        self.assertEqual(reputation.average_rating, Decimal('0.00'))
+
+    def test_queryset_and_cascade_deletes_discount_reviews(self):
+        for buyer, rating in zip(self.buyers, [5, 4, 2]):
+            Review.objects.create(reviewer=buyer, reviewed=self.seller, rating=rating)
+
+        Review.objects.filter(reviewer=self.buyers[0]).delete()
+        self.buyers[2].delete()
+
+        reputation = self.reputation()
+        self.assertEqual((reputation.positive_reviews, reputation.negative_reviews), (1, 0))
+        self.assertEqual(reputation.average_rating, Decimal('4.00'))
+
+        # Borrar al reseñado no le recrea la reputación
+        self.seller.delete()
+        self.assertFalse(Reputation.objects.filter(user_id=self.seller.pk).exists())
+
+    def test_reassigned_review_moves_between_users(self):
+        other = User.objects.create_user('otra', 'otra@example.com', 'clave-segura-123')
+        review = Review.objects.create(reviewer=self.buyers[0], reviewed=self.seller, rating=5)
+
+        review = Review.objects.get(pk=review.pk)
+        review.reviewed = other
+        review.rating = 2
+        review.save()
+
+        reputation = self.reputation()
+        self.assertEqual((reputation.positive_reviews, reputation.negative_reviews), (0, 0))
+        self.assertEqual(reputation.average_rating, Decimal('0.00'))
+        reputation = Reputation.objects.get(user=other)
+        self.assertEqual((reputation.positive_reviews, reputation.negative_reviews), (0, 1))
+        self.assertEqual(reputation.average_rating, Decimal('2.00'))
+
+    def test_recompute_reputation_command(self):
+        for buyer, rating in zip(self.buyers, [5, 3, 3]):
+            Review.objects.create(reviewer=buyer, reviewed=self.seller, rating=rating)
+        Reputation.objects.filter(user=self.seller).update(
+            positive_reviews=10, negative_reviews=10, average_rating=1
+        )
+
+        call_command('recompute_reputation', stdout=StringIO())
+
+        reputation = self.reputation()
+        self.assertEqual((reputation.positive_reviews, reputation.negative_reviews), (1, 2))
+        self.assertEqual(reputation.average_rating, Decimal('3.67'))
+
+
+class ReviewSummaryTests(TestCase):
+    """Endpoint de resumen de reseñas"""
+
+    def test_summary_histogram(self):
+        seller = User.objects.create_user('vendedora', 'vendedora@example.com', 'clave-segura-123')
+        for i, rating in enumerate([5, 5, 4, 1]):
+            buyer = User.objects.create_user(f'compradora{i}', f'compradora{i}@example.com', 'clave-segura-123')
+            Review.objects.create(reviewer=buyer, reviewed=seller, rating=rating)
+
+        response = self.client.get('/api/v1/users/reviews/summary/', {'reviewed': seller.id})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(data['average'], 3.75)
+        self.assertEqual(data['histogram'], {'1': 1, '2': 0, '3': 0, '4': 1, '5': 2})
+        self.assertEqual(len(data['recent']), 4)
+
+    def test_recent_is_clamped_and_validated(self):
+        seller = User.objects.create(username='vendedora', email='vendedora@example.com')
+        buyer = User.objects.create(username='compradora', email='compradora@example.com')
+        Review.objects.create(reviewer=buyer, reviewed=seller, rating=5)
+        url = '/api/v1/users/reviews/summary/'
+
+        response = self.client.get(url, {'reviewed': seller.id, 'recent': -1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['recent']), 1)
+
+        response = self.client.get(url, {'reviewed': seller.id, 'recent': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+
+class UserProvisioningQueryTests(TestCase):
+    """Regresión: login y registro no deben reescribir Profile/Reputation"""
+
+    def test_registration_creates_profile_and_reputation_once(self):
+        payload = {
+            'username': 'nueva',
+            'email': 'nueva@example.com',
+            'password': 'Clave-segura-123',
+            'password_confirm': 'Clave-segura-123',
+        }
+        # 2 validaciones de unicidad + INSERT usuario + savepoint/INSERT perfil/INSERT reputación/release
+        # + UPDATE del contador de usuarios del home
+        with self.assertNumQueries(8):
+            response = self.client.post('/api/v1/users/users/register/', payload)
+
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username='nueva')
+        self.assertEqual(Profile.objects.filter(user=user).count(), 1)
+        self.assertEqual(Reputation.objects.filter(user=user).count(), 1)
+
+    def test_login_only_updates_last_login(self):
+        User.objects.create_user('existente', 'existente@example.com', 'clave-segura-123')
+
+        # SELECT usuario + UPDATE last_login; el resto es el manejo de la sesión
+        with self.assertNumQueries(16):
+            self.client.login(username='existente', password='clave-segura-123')
+
+    def test_user_save_does_not_touch_profile(self):
+        user = User.objects.create_user('existente', 'existente@example.com', 'clave-segura-123')
+        user = User.objects.get(pk=user.pk)
+
+        with self.assertNumQueries(1):
+            user.first_name = 'Ana'
+            user.save()
+
+    def test_jwt_login(self):
+        User.objects.create_user('existente', 'existente@example.com', 'clave-segura-123')
+
+        with self.assertNumQueries(1):
+            response = self.client.post('/api/v1/users/auth/login/', {
+                'username': 'existente',
+                'password': 'clave-segura-123',
+            })
+        self.assertEqual(response.status_code, 200)
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    """Autenticación JWT basada en claims"""
+
+    def setUp(self):
+        _user_cache.clear()
+        cache.clear()
+        self.user = User.objects.create_user(
+            'vendedora', 'vendedora@example.com', 'clave-segura-123', role='seller'
+        )
+        response = self.client.post('/api/v1/users/auth/login/', {
+            'username': 'vendedora',
+            'password': 'clave-segura-123',
+        })
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {response.json()['access']}"}
+
+    def test_token_carries_user_claims(self):
+        request = RequestFactory().get('/', **self.auth)
+        with self.assertNumQueries(0):
+            user, token = ClaimsJWTAuthentication().authenticate(Request(request))
+            self.assertEqual((user.pk, user.username, user.role, user.is_staff),
+                             (self.user.pk, 'vendedora', 'seller', False))
+            self.assertEqual(user, self.user)
+
+    def test_full_user_is_cached_per_worker(self):
+        with self.assertNumQueries(1):
+            self.client.get('/api/v1/users/users/profile/', **self.auth)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/users/users/profile/', **self.auth)
+        self.assertEqual(response.json()['email'], 'vendedora@example.com')
+
+    def test_change_password_invalidates_cache(self):
+        self.client.get('/api/v1/users/users/profile/', **self.auth)
+        self.assertIn(self.user.pk, _user_cache)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/users/users/change_password/', {
+                'old_password': 'clave-segura-123',
+                'new_password': 'Nueva-clave-456',
+                'new_password_confirm': 'Nueva-clave-456',
+            }, **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.user.pk, _user_cache)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('Nueva-clave-456'))
+
+    def test_each_request_gets_its_own_user(self):
+        request = Request(RequestFactory().post('/', **self.auth))
+        first, _ = ClaimsJWTAuthentication().authenticate(request)
+        with self.assertNumQueries(0):
+            second, _ = ClaimsJWTAuthentication().authenticate(request)
+
+        first.first_name = 'Modificado'
+        self.assertEqual(second.first_name, '')
+        self.assertIsNot(first.profile, second.profile)
+
+    def test_deactivated_user_loses_read_access(self):
+        self.assertEqual(self.client.get('/api/v1/users/users/profile/', **self.auth).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(self.client.get('/api/v1/users/users/profile/', **self.auth).status_code, 401)
+
+    def test_demoted_user_loses_staff_access(self):
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.post('/api/v1/users/auth/login/', {
+            'username': 'vendedora',
+            'password': 'clave-segura-123',
+        })
+        auth = {'HTTP_AUTHORIZATION': f"Bearer {response.json()['access']}"}
+        self.assertEqual(self.client.get('/metrics/', **auth).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_staff = False
+            self.user.role = 'buyer'
+            self.user.save()
+
+        self.assertEqual(self.client.get('/metrics/', **auth).status_code, 403)
+        user, _ = ClaimsJWTAuthentication().authenticate(Request(RequestFactory().get('/', **auth)))
+        self.assertEqual((user.role, user.is_staff), ('buyer', False))
+
+
+class RepairUserRelationsTests(TestCase):
+    """Comando repair_user_relations"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('sin-perfil', 'sin-perfil@example.com', 'clave-segura-123')
+        Profile.objects.filter(user=self.user).delete()
+        Reputation.objects.filter(user=self.user).delete()
+
+    def test_dry_run_reports_without_writing(self):
+        out = StringIO()
+        call_command('repair_user_relations', '--dry-run', stdout=out)
+
+        self.assertIn('Perfiles: 1 faltantes, 0 duplicados', out.getvalue())
+        self.assertFalse(Profile.objects.filter(user=self.user).exists())
+
+    def test_creates_missing_relations(self):
+        call_command('repair_user_relations', stdout=StringIO())
+
+        self.assertEqual(Profile.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(Reputation.objects.filter(user=self.user).count(), 1)
+
+
+class BootCommandTests(TestCase):
+    """Comando boot (sin lanzar el servidor)"""
+
+    def test_superuser_only_written_when_needed(self):
+        call_command('boot', '--no-server', stdout=StringIO())
+        admin = User.objects.get(username='admin')
+        self.assertTrue(admin.is_superuser)
+
+        out = StringIO()
+        with self.assertNumQueries(2):  # django_migrations + SELECT del superusuario
+            call_command('boot', '--no-server', stdout=out)
+        self.assertIn('Superusuario al día', out.getvalue())
@@ -2,8 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from .authentication import ClaimsRefreshToken
 from .models import User, Profile, Review
 from .serializers import (
     UserSerializer,
@@ -54,7 +54,7 @@ class UserViewSet(viewsets.ModelViewSet):
         user = serializer.save()
         
         # Generar tokens JWT
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         
         return Response({
             'user': UserSerializer(user, context={'request': request}).data,
@@ -125,6 +125,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     - GET /api/v1/reviews/{id}/ - Detalle de reseña
     - GET /api/v1/reviews/received/ - Reseñas recibidas
     - GET /api/v1/reviews/given/ - Reseñas dadas
+    - GET /api/v1/reviews/summary/?reviewed={id} - Distribución de estrellas y últimas reseñas
     """
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
@@ -143,7 +144,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def received(self, request):
         """Reseñas recibidas por el usuario actual"""
-        reviews = Review.objects.filter(reviewed=request.user)
+        reviews = Review.objects.filter(reviewed_id=request.user.pk).select_related('reviewer', 'reviewed')
         
         page = self.paginate_queryset(reviews)
         if page is not None:
@@ -156,7 +157,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def given(self, request):
         """Reseñas dadas por el usuario actual"""
-        reviews = Review.objects.filter(reviewer=request.user)
+        reviews = Review.objects.filter(reviewer_id=request.user.pk).select_related('reviewer', 'reviewed')
         
         page = self.paginate_queryset(reviews)
         if page is not None:
@@ -164,4 +165,40 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return self.get_paginated_response(serializer.data)
         
         serializer = self.get_serializer(reviews, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def summary(self, request):
+        """Resumen de reseñas de un usuario: histograma 1-5, promedio, total y recientes"""
+        reviewed_id = request.query_params.get('reviewed')
+        if not reviewed_id:
+            if not request.user.is_authenticated:
+                return Response(
+                    {'error': 'Debe indicar el parámetro reviewed'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            reviewed_id = request.user.pk
+        
+        try:
+            reviewed_id = int(reviewed_id)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'El parámetro reviewed debe ser un id de usuario'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            recent_limit = max(1, min(int(request.query_params.get('recent', 5)), 20))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'El parámetro recent debe ser un número entre 1 y 20'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        recent = Review.objects.filter(
+            reviewed_id=reviewed_id
+        ).select_related('reviewer', 'reviewed')[:recent_limit]
+        
+        data = Review.rating_summary(reviewed_id)
+        data['recent'] = self.get_serializer(recent, many=True).data
+        return Response(data)
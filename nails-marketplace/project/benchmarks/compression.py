@@ -0,0 +1,98 @@
+"""
+Compresión de respuestas (config/compression.py): bytes ahorrados contra CPU.
+
+Toma respuestas reales sin comprimir (API de productos con 20 y 100 ítems y las
+páginas HTML) sobre un catálogo sintético y, para cada una, mide tamaño y tiempo
+de compresión con gzip (nivel 6, el de GZipMiddleware) y Brotli en varias calidades.
+La última columna estima cuánto tarda en bajar lo ahorrado en una conexión móvil
+lenta (--mbps), para compararlo con el costo de CPU.
+El middleware usa Brotli solo para la API: las páginas HTML van siempre con gzip
+(BREACH, ver config/compression.py), la fila de Brotli en el HTML es de referencia.
+
+Ejecutar desde nails-marketplace/project:
+    python benchmarks/compression.py
+    python benchmarks/compression.py --qualities 1,4,5,6 --mbps 1.6
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from endpoints import build_scenarios, prepare_catalog, setup_django  # noqa: E402
+from json_renderer import product_pages  # noqa: E402
+
+SCENARIOS = ('api_products', 'api_product_detail', 'api_categories', 'html_home',
+             'html_products_list', 'html_category_detail', 'html_product_detail')
+
+
+def collect_payloads(page_size):
+    """{nombre: cuerpo sin comprimir}"""
+    from django.test import Client
+    from rest_framework.renderers import JSONRenderer
+
+    client = Client()
+    payloads = {}
+    for name, method, url, needs_login in build_scenarios():
+        if name in SCENARIOS:
+            response = client.get(url)
+            if response.status_code != 200 or response.has_header('Content-Encoding'):
+                raise RuntimeError(f'{url} respondió {response.status_code}')
+            payloads[name] = response.content
+    for name, data in product_pages(page_size).items():
+        payloads[f'api_{page_size}_{name}'] = JSONRenderer().render(data)
+    return payloads
+
+
+def median_ms(func, data, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = func(data)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--qualities', default='4,5', help='Calidades de Brotli a medir')
+    parser.add_argument('--mbps', type=float, default=1.6, help='Ancho de banda móvil de referencia (Mbit/s)')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--products', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(Path(tmp) / 'bench.sqlite3')
+        from django.utils.text import compress_string
+        from config.compression import brotli
+
+        print(f'→ Generando catálogo ({args.users} usuarios, {args.products} productos)...')
+        prepare_catalog(args)
+        payloads = collect_payloads(args.page_size)
+
+    codecs = [('gzip-6', lambda data: compress_string(data, max_random_bytes=100))]
+    if brotli is None:
+        print('   Brotli no está instalado: solo gzip')
+    else:
+        codecs += [(f'br-{quality}', lambda data, q=int(quality): brotli.compress(data, quality=q))
+                   for quality in args.qualities.split(',')]
+
+    print(f"{'respuesta':<24}{'original':>10}{'códec':>8}{'comprimido':>12}{'ahorro':>8}"
+          f"{'CPU':>10}{f'red @{args.mbps:g} Mbps':>17}")
+    for name, body in payloads.items():
+        for index, (codec, compress) in enumerate(codecs):
+            cpu_ms, size = median_ms(compress, body, args.iterations)
+            saved = len(body) - size
+            network_ms = saved * 8 / (args.mbps * 1e6) * 1000
+            label, original = (name, f'{len(body) / 1024:.1f} KB') if index == 0 else ('', '')
+            print(f'{label:<24}{original:>10}{codec:>8}{size / 1024:>9.1f} KB{saved / len(body):>8.0%}'
+                  f'{cpu_ms:>8.2f}ms{network_ms:>13.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
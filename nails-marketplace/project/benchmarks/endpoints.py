@@ -0,0 +1,265 @@
+"""
+Benchmark de endpoints con baseline: latencia p50/p95/p99, consultas por request y memoria pico.
+
+Genera un catálogo sintético (generate_fake_catalog) en una base SQLite temporal y
+recorre los endpoints con el test client de Django, dentro del mismo proceso.
+
+Ejecutar desde nails-marketplace/project:
+    python benchmarks/endpoints.py                          # comparar contra benchmarks/baseline.json
+    python benchmarks/endpoints.py --save-baseline          # regrabar el baseline
+    python benchmarks/endpoints.py --only api_products,html_products_list
+
+Sale con código 1 si algún endpoint empeora más que --threshold respecto del baseline:
+más consultas que antes (siempre es regresión), o p50 / memoria pico por encima del margen.
+p95 y p99 se registran pero no cortan: con pocas iteraciones son demasiado ruidosos.
+Un cambio que mueve la cantidad de consultas de un endpoint (para arriba o para abajo)
+regraba el baseline con --save-baseline en el mismo commit: el baseline siempre
+refleja HEAD y el chequeo pasa en cada commit.
+Las latencias se comparan normalizadas por una calibración de CPU medida en cada corrida,
+para que una máquina más lenta (o más cargada) no aparezca como regresión.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+# Diferencias de latencia menores a esto se consideran ruido
+MIN_LATENCY_DELTA_MS = 3.0
+
+
+def calibrate():
+    """Tiempo (ms) de una carga fija de CPU en Python: mínimo de varias corridas"""
+    payload = [{'id': n, 'title': f'Producto {n}', 'price': n * 1.5} for n in range(200)]
+    timings = []
+    for _ in range(7):
+        start = time.perf_counter()
+        for _ in range(50):
+            json.loads(json.dumps(payload))
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def setup_django(db_path):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.update({
+        'DJANGO_SETTINGS_MODULE': 'config.settings',
+        'DATABASE_URL': f'sqlite:///{db_path}',
+        'DEBUG': 'False',
+        'SECURE_SSL_REDIRECT': 'False',
+        'ALLOWED_HOSTS': 'testserver,localhost',
+        # Con DEBUG=False las imágenes usan Cloudinary; las URLs se arman localmente
+        'CLOUDINARY_CLOUD_NAME': os.environ.get('CLOUDINARY_CLOUD_NAME') or 'benchmark',
+    })
+    import django
+    django.setup()
+
+
+def prepare_catalog(args):
+    from io import StringIO
+    from django.core.management import call_command
+    call_command('migrate', interactive=False, verbosity=0)
+    call_command(
+        'generate_fake_catalog', users=args.users, products=args.products,
+        seed=args.seed, stdout=StringIO()
+    )
+
+
+def build_scenarios():
+    """(nombre, método, url, necesita login) sobre el catálogo generado"""
+    from apps.products.models import Category, Product
+
+    available = Product.objects.filter(status='available')
+    product_id = available.order_by('-views').values_list('id', flat=True).first()
+    category = Category.objects.order_by('slug').values_list('slug', 'id').first()
+    last_page = max(1, -(-available.count() // 20))
+
+    return [
+        ('api_products', 'get', '/api/v1/products/', False),
+        ('api_products_search', 'get', '/api/v1/products/?search=esmalte', False),
+        ('api_products_filters', 'get', f'/api/v1/products/?category={category[1]}&min_price=2000&max_price=20000&condition=new', False),
+        ('api_products_ordering', 'get', '/api/v1/products/?ordering=-price', False),
+        ('api_products_deep_page', 'get', f'/api/v1/products/?page={last_page}', False),
+        ('api_product_detail', 'get', f'/api/v1/products/{product_id}/', False),
+        ('api_similar', 'get', f'/api/v1/products/{product_id}/similar/', False),
+        ('api_featured', 'get', '/api/v1/products/featured/', False),
+        ('api_categories', 'get', '/api/v1/categories/', False),
+        ('catalog_products', 'get', '/api/v1/catalog/products/', False),
+        ('catalog_product_detail', 'get', f'/api/v1/catalog/products/{product_id}/', False),
+        ('catalog_categories', 'get', '/api/v1/catalog/categories/', False),
+        ('cart_add', 'post', f'/cart/add/{product_id}/', True),
+        ('cart_view', 'get', '/cart/', True),
+        ('cart_summary', 'get', '/api/v1/cart/summary/', True),
+        ('html_home', 'get', '/', False),
+        ('html_products_list', 'get', '/products/', False),
+        ('html_category_detail', 'get', f'/category/{category[0]}/', False),
+        ('html_product_detail', 'get', f'/products/{product_id}/', False),
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(request, url):
+    """Un request: (latencia en ms, consultas)"""
+    from apps.monitoring.queries import track_queries
+
+    with track_queries() as stats:
+        start = time.perf_counter()
+        response = request(url)
+        elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code >= 400:
+        raise RuntimeError(f'{url} respondió {response.status_code}')
+    return elapsed, stats.count
+
+
+def peak_memory_kb(request, url):
+    """Memoria pico de un request (pasada aparte: tracemalloc distorsiona la latencia)"""
+    tracemalloc.start()
+    request(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def run_scenarios(scenarios, iterations, warmup):
+    """
+    Medir los escenarios intercalados (una vuelta por todos, `iterations` veces):
+    así una ráfaga de carga de la máquina se reparte entre endpoints en lugar de
+    inflar las muestras de uno solo.
+    """
+    for _, request, url in scenarios:
+        for _ in range(warmup):
+            request(url)
+
+    samples = {name: ([], []) for name, _, _ in scenarios}
+    for _ in range(iterations):
+        for name, request, url in scenarios:
+            latency, queries = measure(request, url)
+            samples[name][0].append(latency)
+            samples[name][1].append(queries)
+
+    results = {}
+    for name, request, url in scenarios:
+        latencies, queries = samples[name]
+        results[name] = {
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'queries': max(queries),
+            'peak_kb': peak_memory_kb(request, url),
+        }
+    return results
+
+
+def compare(results, baseline, threshold, speed=1.0):
+    """
+    Lista de regresiones respecto del baseline.
+    `speed` es calibración del baseline / calibración actual (latencias a escala del baseline).
+    """
+    failures = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current['queries'] > base['queries']:
+            failures.append(f"{name}: consultas {base['queries']} → {current['queries']}")
+        p50 = current['p50_ms'] * speed
+        if p50 > base['p50_ms'] * (1 + threshold) and p50 - base['p50_ms'] > MIN_LATENCY_DELTA_MS:
+            failures.append(f"{name}: p50 {base['p50_ms']} ms → {p50:.2f} ms (normalizado)")
+        if current['peak_kb'] > base['peak_kb'] * (1 + threshold):
+            failures.append(f"{name}: memoria pico {base['peak_kb']} KB → {current['peak_kb']} KB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200, help='Usuarios del catálogo generado')
+    parser.add_argument('--products', type=int, default=2000, help='Productos del catálogo generado')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=30, help='Requests medidos por endpoint')
+    parser.add_argument('--warmup', type=int, default=3, help='Requests de calentamiento por endpoint')
+    parser.add_argument('--only', default='', help='Endpoints a medir, separados por coma')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Guardar los resultados como baseline')
+    parser.add_argument('--threshold', type=float, default=0.5, help='Margen tolerado de p50 y memoria (0.5 = 50%%)')
+    parser.add_argument('--output', type=Path, help='Guardar también los resultados en este JSON')
+    args = parser.parse_args()
+
+    calibration = calibrate()
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(Path(tmp) / 'bench.sqlite3')
+        from django.test import Client
+        from django.test.utils import setup_test_environment
+        from apps.users.models import User
+
+        setup_test_environment()
+        print(f'→ Generando catálogo ({args.users} usuarios, {args.products} productos)...')
+        prepare_catalog(args)
+
+        anonymous = Client()
+        logged_in = Client()
+        logged_in.force_login(User.objects.filter(username__startswith='fake-').order_by('id').first())
+
+        only = set(filter(None, args.only.split(',')))
+        scenarios = [
+            (name, getattr(logged_in if needs_login else anonymous, method), url)
+            for name, method, url, needs_login in build_scenarios()
+            if not only or name in only
+        ]
+        results = run_scenarios(scenarios, args.iterations, args.warmup)
+
+    print(f"{'endpoint':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'SQL':>6}{'memoria':>13}")
+    for name, r in results.items():
+        print(f"{name:<26}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+              f"{r['queries']:>6}{r['peak_kb']:>10.1f} KB")
+
+    report = {
+        'meta': {
+            'users': args.users, 'products': args.products, 'seed': args.seed,
+            'iterations': args.iterations, 'python': platform.python_version(),
+            'calibration_ms': round(calibration, 2),
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + '\n')
+        print(f'✓ Baseline guardado en {args.baseline}')
+        return
+
+    if not args.baseline.exists():
+        print(f'⚠ No hay baseline en {args.baseline}; usar --save-baseline')
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if {k: baseline['meta'].get(k) for k in ('users', 'products', 'seed')} != \
+            {k: report['meta'][k] for k in ('users', 'products', 'seed')}:
+        print('⚠ El baseline se grabó con otro catálogo; las comparaciones pueden no ser válidas')
+
+    speed = baseline['meta'].get('calibration_ms', calibration) / calibration
+    print(f'   calibración: {calibration:.2f} ms (baseline {baseline["meta"].get("calibration_ms")} ms)')
+    failures = compare(results, baseline['results'], args.threshold, speed)
+    if failures:
+        print('✗ Regresiones respecto del baseline:')
+        for failure in failures:
+            print(f'   {failure}')
+        sys.exit(1)
+    print('✓ Sin regresiones respecto del baseline')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Renderer/parser JSON de la API: DRF (json de la stdlib) contra config/renderers.py (orjson).
+
+Arma páginas de 100 productos con los serializers reales (listado y detalle)
+sobre un catálogo sintético, verifica que ambos renderers produzcan los mismos
+bytes y mide render y parseo por página (mediana de --iterations).
+
+Ejecutar desde nails-marketplace/project:
+    python benchmarks/json_renderer.py
+    python benchmarks/json_renderer.py --page-size 100 --iterations 300
+"""
+import argparse
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from endpoints import prepare_catalog, setup_django  # noqa: E402
+
+
+def product_pages(page_size):
+    """Payload paginado de listado y de detalle, como lo devuelve la API"""
+    from django.test import RequestFactory
+    from rest_framework.request import Request
+    from apps.products.models import Product
+    from apps.products.serializers import ProductDetailSerializer, ProductListSerializer
+
+    request = Request(RequestFactory().get('/api/v1/products/'))
+    products = list(
+        Product.objects.filter(status='available')
+        .select_related('seller', 'category').prefetch_related('images')[:page_size]
+    )
+    pages = {}
+    for name, serializer in (('listado', ProductListSerializer), ('detalle', ProductDetailSerializer)):
+        pages[name] = {
+            'count': len(products),
+            'next': 'http://testserver/api/v1/products/?page=2',
+            'previous': None,
+            'results': serializer(products, many=True, context={'request': request}).data,
+        }
+    return pages
+
+
+def median_ms(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--products', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(Path(tmp) / 'bench.sqlite3')
+        from rest_framework.parsers import JSONParser
+        from rest_framework.renderers import JSONRenderer
+        from config.parsers import FastJSONParser
+        from config.renderers import FastJSONRenderer, orjson
+
+        if orjson is None:
+            print('✗ orjson no está instalado: FastJSONRenderer usa el renderer de DRF')
+            sys.exit(1)
+        print(f'→ Generando catálogo ({args.users} usuarios, {args.products} productos)...')
+        prepare_catalog(args)
+        pages = product_pages(args.page_size)
+
+    print(f"{'página':<10}{'KB':>7}{'render DRF':>13}{'render orjson':>15}{'x':>7}"
+          f"{'parse DRF':>12}{'parse orjson':>14}{'x':>7}")
+    for name, data in pages.items():
+        body = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != body:
+            print(f'✗ {name}: los renderers no producen los mismos bytes')
+            sys.exit(1)
+
+        render = [median_ms(lambda r=renderer: r.render(data), args.iterations)
+                  for renderer in (JSONRenderer(), FastJSONRenderer())]
+        parse = [median_ms(lambda p=parser: p.parse(io.BytesIO(body)), args.iterations)
+                 for parser in (JSONParser(), FastJSONParser())]
+        print(f'{name:<10}{len(body) / 1024:>7.1f}'
+              f'{render[0]:>11.3f}ms{render[1]:>13.3f}ms{render[0] / render[1]:>6.1f}x'
+              f'{parse[0]:>10.3f}ms{parse[1]:>12.3f}ms{parse[0] / parse[1]:>6.1f}x')
+    print(f'✓ Salida idéntica en páginas de {args.page_size} productos')
+
+
+if __name__ == '__main__':
+    main()
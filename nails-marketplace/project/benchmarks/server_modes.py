@@ -0,0 +1,164 @@
+"""
+Benchmark de modos de servidor: sync, gthread y ASGI.
+
+Levanta gunicorn con gunicorn.conf.py en cada modo contra una base SQLite local
+(sembrada con seed_catalog --demo) y mide el listado de productos de la API.
+
+Ejecutar desde nails-marketplace/project:
+    python benchmarks/server_modes.py --duration 15 --concurrency 32
+
+Para comparar las vistas async del catálogo (ASGI) contra la API de DRF (WSGI):
+    python benchmarks/server_modes.py --modes gthread --endpoint /api/v1/products/
+    python benchmarks/server_modes.py --modes asgi --endpoint /api/v1/catalog/products/
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ENDPOINT = '/api/v1/products/'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def bench_env(db_path, mode, port, workers):
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': f'sqlite:///{db_path}',
+        'DEBUG': 'False',
+        'SECURE_SSL_REDIRECT': 'False',
+        'GUNICORN_MODE': mode,
+        'WEB_CONCURRENCY': str(workers),
+        'PORT': str(port),
+        'GUNICORN_ACCESS_LOG': '',
+    })
+    return env
+
+
+def prepare_database(db_path):
+    """Migrar y sembrar una base SQLite descartable"""
+    env = bench_env(db_path, 'sync', 0, 1)
+    for command in (['migrate', '--no-input'], ['seed_catalog', '--demo']):
+        subprocess.run(
+            [sys.executable, 'manage.py', *command],
+            cwd=PROJECT_DIR, env=env, check=True, stdout=subprocess.DEVNULL
+        )
+
+
+def wait_until_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'El servidor no respondió en {timeout}s: {url}')
+
+
+def load(url, duration, concurrency):
+    """Cada cliente hace requests secuenciales hasta que se acaba el tiempo"""
+    deadline = time.monotonic() + duration
+
+    def client():
+        latencies, errors = [], 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=10).read()
+                latencies.append(time.perf_counter() - start)
+            except OSError:
+                errors += 1
+        return latencies, errors
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(lambda _: client(), range(concurrency)))
+
+    latencies = sorted(l for result in results for l in result[0])
+    errors = sum(result[1] for result in results)
+    return latencies, errors
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_mode(db_path, mode, args):
+    port = free_port()
+    url = f'http://127.0.0.1:{port}{args.endpoint}'
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=PROJECT_DIR, env=bench_env(db_path, mode, port, args.workers),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(url)
+        load(url, 2, args.concurrency)  # calentamiento
+        latencies, errors = load(url, args.duration, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / args.duration, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='sync,gthread,asgi')
+    parser.add_argument('--duration', type=int, default=10, help='Segundos de carga por modo')
+    parser.add_argument('--concurrency', type=int, default=16, help='Clientes concurrentes')
+    parser.add_argument('--workers', type=int, default=2, help='Workers de gunicorn por modo')
+    parser.add_argument('--endpoint', default=DEFAULT_ENDPOINT, help='Ruta a medir')
+    parser.add_argument('--json', action='store_true', help='Imprimir resultados en JSON')
+    args = parser.parse_args()
+
+    modes = args.modes.split(',')
+    if 'asgi' in modes:
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            print('⚠ uvicorn no está instalado, se omite el modo asgi')
+            modes.remove('asgi')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'bench.sqlite3'
+        prepare_database(db_path)
+        results = [run_mode(db_path, mode, args) for mode in modes]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f'\n{args.endpoint}  ({args.workers} workers, {args.concurrency} clientes, {args.duration}s por modo)')
+    print(f"{'modo':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>10}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Costo del tracing por request (apps/monitoring/tracing.py).
+
+Mide cada endpoint intercalando requests sin trazar y trazados (TRACE_SAMPLE_RATE=1)
+y estima el overhead promedio a la tasa de muestreo dada:
+
+    overhead = tasa × (p50 trazado − p50 sin trazar) / p50 sin trazar
+             + costo de los puntos instrumentados cuando no hay traza (una ContextVar por llamada)
+
+Ejecutar desde nails-marketplace/project:
+    python benchmarks/tracing_overhead.py                 # tasa 0.01, falla si algún endpoint supera 1%
+    python benchmarks/tracing_overhead.py --rate 0.05 --max-overhead 2
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from endpoints import build_scenarios, prepare_catalog, setup_django  # noqa: E402
+
+SCENARIOS = ('api_products', 'api_product_detail', 'api_categories', 'catalog_products',
+             'html_category_detail', 'html_product_detail')
+
+
+def noop_call_cost(calls=200_000):
+    """Costo extra (µs) de llamar una función instrumentada fuera de una traza"""
+    from django.core.cache import caches
+    cache = caches['default']
+    traced = type(cache).has_key
+    original = traced.__wrapped__
+    timings = []
+    for func in (original, traced) * 3:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func(cache, 'x')
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return max(0.0, min(timings[1::2]) - min(timings[0::2]))
+
+
+def last_trace_spans(directory):
+    """Cantidad de spans de la última traza escrita"""
+    [path] = Path(directory).glob('traces-*.ndjson')
+    last = path.read_text().splitlines()[-1]
+    return len(json.loads(last)['resourceSpans'][0]['scopeSpans'][0]['spans'])
+
+
+def measure(client, url, iterations):
+    """p50 (ms) sin trazar y trazado, y spans por request trazado"""
+    from django.conf import settings
+    from django.test import override_settings
+
+    plain, traced = [], []
+    for _ in range(iterations):
+        for rate, samples in ((0, plain), (1, traced)):
+            with override_settings(TRACE_SAMPLE_RATE=rate):
+                start = time.perf_counter()
+                response = client.get(url)
+                samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{url} respondió {response.status_code}')
+    return statistics.median(plain), statistics.median(traced), last_trace_spans(settings.TRACE_LOG_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=0.01, help='Tasa de muestreo a evaluar')
+    parser.add_argument('--max-overhead', type=float, default=1.0, help='Overhead máximo tolerado (%%)')
+    parser.add_argument('--iterations', type=int, default=40)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(Path(tmp) / 'bench.sqlite3')
+        from django.conf import settings
+        from django.test import Client
+        from django.test.utils import setup_test_environment
+
+        setup_test_environment()
+        settings.TRACE_LOG_DIR = str(Path(tmp) / 'traces')
+        print(f'→ Generando catálogo ({args.users} usuarios, {args.products} productos)...')
+        prepare_catalog(args)
+
+        noop_us = noop_call_cost()
+        client = Client()
+        rows = []
+        for name, method, url, needs_login in build_scenarios():
+            if name in SCENARIOS and method == 'get' and not needs_login:
+                client.get(url)
+                rows.append((name, *measure(client, url, args.iterations)))
+
+    print(f'   punto instrumentado sin traza: {noop_us:.3f} µs por llamada')
+    print(f"{'endpoint':<24}{'sin traza':>11}{'trazado':>10}{'spans':>7}{f'overhead @{args.rate:g}':>18}")
+    failures = []
+    for name, plain, traced, spans in rows:
+        noop_ms = spans * noop_us / 1000
+        overhead = (args.rate * max(0.0, traced - plain) + noop_ms) / plain * 100
+        print(f'{name:<24}{plain:>9.2f}ms{traced:>8.2f}ms{spans:>7}{overhead:>17.2f}%')
+        if overhead > args.max_overhead:
+            failures.append(name)
+
+    if failures:
+        print(f"✗ Overhead mayor a {args.max_overhead}% en: {', '.join(failures)}")
+        sys.exit(1)
+    print(f'✓ Overhead menor a {args.max_overhead}% en todos los endpoints')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+# Registrar los system checks propios del proyecto (config no es una app instalada)
+from . import checks  # noqa: F401
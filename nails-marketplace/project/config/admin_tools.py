@@ -0,0 +1,72 @@
+"""
+Piezas del admin para tablas grandes.
+
+- EstimatedCountPaginator: en un changelist sin filtros usa la estimación de filas
+  de la base (pg_class.reltuples en PostgreSQL) en vez de un COUNT(*) exacto.
+- PaginatedTabularInline: inline de solo lectura que muestra una página de
+  objetos relacionados por vez, con su paginador propio (?<prefijo>-page=N).
+"""
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Debajo de esta cantidad de filas el COUNT(*) exacto es barato: no se estima
+ESTIMATE_THRESHOLD = 10_000
+
+
+def estimated_rows(model, using='default'):
+    """Filas estimadas de la tabla del modelo, o None si la base no lo soporta"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+    # -1: la tabla nunca se analizó (VACUUM/ANALYZE)
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador con conteo aproximado para tablas enormes.
+    Con filtros o búsqueda el conteo es exacto: ahí la estimación no sirve.
+    Usar junto con show_full_result_count = False en el ModelAdmin.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_rows(self.object_list.model, self.object_list.db)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class PaginatedTabularInline(admin.TabularInline):
+    """
+    Inline paginado: per_page filas por página.
+    Pensado de solo lectura: declarar los mismos campos en fields y readonly_fields.
+    """
+    per_page = 20
+    template = 'admin/edit_inline/paginated_tabular.html'
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        per_page = self.per_page
+
+        class PaginatedFormSet(formset):
+            def get_queryset(self):
+                if not hasattr(self, 'page'):
+                    paginator = Paginator(super().get_queryset(), per_page)
+                    self.page = paginator.get_page(request.GET.get(f'{self.prefix}-page'))
+                    self._queryset = self.page.object_list
+                return self._queryset
+
+        return PaginatedFormSet
@@ -0,0 +1,79 @@
+"""
+Chequeos de deploy.
+
+Toda referencia {% static %} de los templates del proyecto tiene que existir en el
+manifest de collectstatic. Se corre en el build, después de collectstatic:
+    python manage.py check --deploy --tag staticfiles --fail-level ERROR
+
+La autenticación JWT por claims necesita un cache compartido entre workers.
+"""
+import re
+from pathlib import Path
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+STATIC_TAG = re.compile(r"""{%\s*static\s+(['"])(?P<path>[^'"]+)\1""")
+
+
+def project_template_dirs():
+    """Directorios de templates del proyecto (DIRS y las apps propias, no las de terceros)"""
+    from django.template.utils import get_app_template_dirs
+
+    base = Path(settings.BASE_DIR).resolve()
+    dirs = [Path(path) for engine in settings.TEMPLATES for path in engine.get('DIRS', [])]
+    dirs += [Path(path) for path in get_app_template_dirs('templates') if Path(path).resolve().is_relative_to(base)]
+    return [path for path in dirs if path.is_dir()]
+
+
+def static_references(directories):
+    """(archivo, línea, ruta) de cada {% static 'ruta' %} literal"""
+    for directory in directories:
+        for template in sorted(directory.rglob('*.html')):
+            for lineno, line in enumerate(template.read_text(encoding='utf-8').splitlines(), 1):
+                for match in STATIC_TAG.finditer(line):
+                    yield template, lineno, match['path']
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_static_manifest(app_configs, **kwargs):
+    from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+
+    if not isinstance(staticfiles_storage, ManifestFilesMixin):
+        return []
+
+    manifest, _ = staticfiles_storage.load_manifest()
+    if not manifest:
+        return [Error(
+            'No hay manifest de archivos estáticos.',
+            hint='Correr python manage.py collectstatic antes de este chequeo.',
+            id='config.E001',
+        )]
+
+    base = Path(settings.BASE_DIR)
+    return [
+        Error(
+            f'{template.relative_to(base) if template.is_relative_to(base) else template}:{lineno} '
+            f'referencia "{path}", que no está en el manifest de estáticos.',
+            hint='Agregar el archivo a STATICFILES_DIRS o corregir la ruta.',
+            id='config.E002',
+        )
+        for template, lineno, path in static_references(project_template_dirs())
+        if path not in manifest
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    from django.core.cache import caches
+    from django.core.cache.backends.locmem import LocMemCache
+
+    if 'apps.users.authentication.ClaimsJWTAuthentication' not in settings.REST_FRAMEWORK.get('DEFAULT_AUTHENTICATION_CLASSES', []):
+        return []
+    if not isinstance(caches['default'], LocMemCache):
+        return []
+    return [Warning(
+        'ClaimsJWTAuthentication usa un cache local por worker: desactivar un usuario o '
+        'sacarle el staff no llega a los demás workers hasta que venza su access token.',
+        hint='Configurar REDIS_URL si se corre con más de un worker.',
+        id='config.W001',
+    )]
@@ -0,0 +1,179 @@
+"""
+Compresión de respuestas HTML/JSON: Brotli si está instalado y el cliente lo acepta,
+si no gzip (con las mismas funciones que GZipMiddleware de Django).
+
+- BREACH: el HTML lleva el token CSRF junto a texto que el atacante puede reflejar,
+  así que siempre va con gzip y la mitigación de Django (entre 0 y 100 bytes al azar
+  en el header, también en streaming). Brotli no tiene dónde meter ese relleno: se usa
+  solo para el resto (JSON de la API, CSS, JS...).
+- Solo tipos de texto (COMPRESSION_CONTENT_TYPES, más cualquier +json/+xml):
+  imágenes, PDFs, zips y descargas binarias ya vienen comprimidos y no se tocan.
+- No se comprimen respuestas de menos de COMPRESSION_MIN_BYTES, las que ya tienen
+  Content-Encoding, Content-Range, ni las marcadas con Cache-Control: no-transform.
+- Las respuestas streaming (sync o async) se comprimen por partes sin juntarlas en
+  memoria, con un flush por parte para que el cliente reciba cada una a medida que sale.
+- Los estáticos no pasan por acá: WhiteNoise responde antes y los sirve precomprimidos.
+"""
+import secrets
+from gzip import GzipFile
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import StreamingBuffer, compress_string
+from .middleware import HybridMiddleware
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+# Igual que GZipMiddleware.max_random_bytes
+MAX_RANDOM_BYTES = 100
+# Tipos con secretos (token CSRF) que no pueden ir con Brotli
+BREACH_SENSITIVE_TYPES = {'text/html'}
+
+
+def accepted_encodings(header):
+    """Codificaciones con q > 0 de un header Accept-Encoding"""
+    accepted = set()
+    for part in header.lower().split(','):
+        name, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip())
+    return accepted
+
+
+def media_type(content_type):
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def choose_encoding(header, content_type=''):
+    accepted = accepted_encodings(header)
+    if (brotli is not None and settings.COMPRESSION_BROTLI and 'br' in accepted
+            and media_type(content_type) not in BREACH_SENSITIVE_TYPES):
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compressible(content_type):
+    media = media_type(content_type)
+    return media in settings.COMPRESSION_CONTENT_TYPES or media.endswith(('+json', '+xml'))
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return compress_string(data, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+def stream_compressor(encoding):
+    """(procesar, flush, terminar) de un compresor incremental"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+
+    # Como compress_sequence de Django: nombre de archivo de largo aleatorio en el header
+    buffer = StreamingBuffer()
+    gzip_file = GzipFile(
+        filename=b'a' * secrets.randbelow(MAX_RANDOM_BYTES), mode='wb',
+        compresslevel=GZIP_LEVEL, fileobj=buffer, mtime=0,
+    )
+
+    def process(chunk):
+        gzip_file.write(chunk)
+        return buffer.read()
+
+    def flush():
+        gzip_file.flush()
+        return buffer.read()
+
+    def finish():
+        gzip_file.close()
+        return buffer.read()
+
+    return process, flush, finish
+
+
+def compress_stream(chunks, encoding):
+    process, flush, finish = stream_compressor(encoding)
+    for chunk in chunks:
+        data = process(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_stream(chunks, encoding):
+    process, flush, finish = stream_compressor(encoding)
+    async for chunk in chunks:
+        data = process(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware(HybridMiddleware):
+    """
+    Comprime respuestas de texto con Brotli o gzip según Accept-Encoding.
+    Va debajo de WhiteNoise y del monitoreo, así la latencia medida incluye comprimir.
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if not settings.COMPRESSION_ENABLED or not self.should_compress(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), response.get('Content-Type', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # El cuerpo cambió: un ETag fuerte deja de valer byte a byte
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def should_compress(self, response):
+        if response.has_header('Content-Encoding') or response.has_header('Content-Range'):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        if not compressible(response.get('Content-Type', '')):
+            return False
+        if response.streaming:
+            # Con largo conocido (FileResponse) se respeta el umbral
+            length = response.get('Content-Length')
+            return not (length and length.isdigit() and int(length) < settings.COMPRESSION_MIN_BYTES)
+        return len(response.content) >= settings.COMPRESSION_MIN_BYTES
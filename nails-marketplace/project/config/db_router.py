@@ -0,0 +1,120 @@
+"""
+Ruteo de lecturas a la réplica (REPLICA_DATABASE_URL).
+
+- Solo se leen de la réplica los requests GET/HEAD/OPTIONS fuera del admin.
+- Escrituras, transacciones y tablas sensibles (sesiones, admin, allauth) van al primario.
+- Read-your-writes: un request que escribe lee del primario desde ese momento, y si
+  además es POST/PUT/PATCH/DELETE el cliente queda fijado al primario por
+  REPLICA_PIN_SECONDS (cookie para navegadores, cache por usuario para JWT).
+
+Prueba local con dos SQLite (la réplica es una copia "atrasada" del primario):
+    cp db.sqlite3 replica.sqlite3
+    REPLICA_DATABASE_URL=sqlite:///replica.sqlite3 python manage.py runserver
+"""
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE = 'db_pin'
+PIN_CACHE_KEY = 'db:pin:{user_id}'
+
+# Apps cuyas lecturas siempre van al primario (se escriben justo antes de leerse)
+PRIMARY_ONLY_APPS = {'sessions', 'admin', 'account', 'socialaccount'}
+PRIMARY_ONLY_PATHS = ('/admin/', '/accounts/')
+
+
+class RoutingState:
+    """Estado de ruteo del request en curso"""
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+_routing = ContextVar('db_routing', default=None)
+
+
+class PrimaryReplicaRouter:
+    """Lecturas a la réplica solo cuando el request lo permite; todo lo demás al primario"""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.use_replica:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        # Dentro de una transacción se lee lo que se acaba de escribir
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            # El resto del request (y el pin posterior) lee del primario
+            state.use_replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplica tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def pin_cache_key(user_id):
+    return PIN_CACHE_KEY.format(user_id=user_id)
+
+
+def token_user_id(request):
+    """Id de usuario del token JWT (sin consultar la base), o None"""
+    auth = JWTStatelessUserAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return auth.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except InvalidToken:
+        return None
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Decidir por request si las lecturas pueden ir a la réplica y fijar al primario tras escribir"""
+
+    def process_request(self, request):
+        if not settings.REPLICA_DATABASE_URL:
+            return
+        request.db_pin_user_id = token_user_id(request)
+        pinned = (
+            request.method not in SAFE_METHODS
+            or request.path.startswith(PRIMARY_ONLY_PATHS)
+            or PIN_COOKIE in request.COOKIES
+            or (request.db_pin_user_id is not None and cache.get(pin_cache_key(request.db_pin_user_id)))
+        )
+        request.db_routing = RoutingState(use_replica=not pinned)
+        _routing.set(request.db_routing)
+
+    def process_response(self, request, response):
+        state = getattr(request, 'db_routing', None)
+        if state is None:
+            return response
+        _routing.set(None)
+        # Las escrituras de analytics en un GET (visitas) no fijan al cliente
+        if not state.wrote or request.method in SAFE_METHODS:
+            return response
+
+        seconds = settings.REPLICA_PIN_SECONDS
+        response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+        if request.db_pin_user_id is not None:
+            cache.set(pin_cache_key(request.db_pin_user_id), True, seconds)
+        return response
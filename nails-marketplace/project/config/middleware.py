@@ -0,0 +1,22 @@
+"""
+Base de los middlewares propios (monitoreo, compresión).
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
+class HybridMiddleware:
+    """
+    Middleware que corre igual en WSGI y en ASGI, como los de Django.
+
+    Con una cadena async (vistas async bajo ASGI) Django llama a __acall__ sin
+    pasar el request a un thread; las subclases definen __call__ y __acall__
+    y despachan con `if self.async_mode: return self.__acall__(request)`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
@@ -0,0 +1,29 @@
+"""
+Parser JSON de la API con orjson, si está instalado (ver config/renderers.py).
+
+Lo que orjson rechaza (JSON inválido, enteros de más de 64 bits, NaN con
+STRICT_JSON en False, otra codificación que no sea UTF-8) lo vuelve a
+intentar el parser de DRF, que además arma el mismo mensaje de error de siempre.
+"""
+import codecs
+import io
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser de DRF con orjson como decoder"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
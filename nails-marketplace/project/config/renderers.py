@@ -0,0 +1,38 @@
+"""
+Renderer JSON de la API con orjson, si está instalado.
+
+Produce los mismos bytes que el JSONRenderer de DRF para nuestros datos: JSON
+compacto en UTF-8, datetime ISO 8601 con 'Z' para UTC, date/time/UUID como texto
+y \\u2028/\\u2029 escapados. Lo que orjson no serializa solo (Decimal, lazy
+strings, querysets...) pasa por el encoder de DRF, así que un Decimal sale como
+float igual que antes (los serializers ya los convierten a texto).
+
+Se usa el renderer de DRF cuando hace falta indentar (API navegable,
+'application/json; indent=4'), con UNICODE_JSON/COMPACT_JSON en False, si el
+dato no entra en orjson (enteros de más de 64 bits) o si orjson no está instalado.
+Diferencias conocidas: floats de 1e16 o más se escriben '1e16' en vez de '1e+16',
+y NaN/Infinity salen como null en vez de error.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer de DRF con orjson como encoder"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Igual que DRF: JSON que también sea un subconjunto estricto de JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -24,9 +24,11 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
-    'cloudinary_storage', 
-    'cloudinary',
     'django.contrib.staticfiles',
+    # Después de staticfiles: Cloudinary se usa solo para media, y su collectstatic
+    # (que no copia los archivos sin hash) no debe reemplazar al de Django
+    'cloudinary_storage',
+    'cloudinary',
     'django.contrib.sites',
 
     # apps de terceros
@@ -45,6 +47,7 @@ INSTALLED_APPS = [
     'apps.users',
     'apps.products',
     'apps.cart',
+    'apps.monitoring',
 ]
 
 SITE_ID = 1
@@ -100,7 +103,14 @@ SOCIALACCOUNT_PROVIDERS = {
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.monitoring.middleware.TracingMiddleware',
+    'apps.monitoring.middleware.MetricsMiddleware',
+    'apps.monitoring.middleware.QueryBudgetMiddleware',
+    'apps.monitoring.middleware.SlowQueryMiddleware',
+    'apps.monitoring.middleware.TrafficRecorderMiddleware',
+    'config.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'config.db_router.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -108,35 +118,47 @@ MIDDLEWARE = [
     'allauth.account.middleware.AccountMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.monitoring.middleware.ProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
-#configuración de Whitenoise
-STORAGES = {
-    "default": {
-        "BACKEND": "cloudinary_storage.storage.MediaCloudinaryStorage",
-    },
-    "staticfiles": {
-        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
-    },
-}
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.cart.context_processors.cart',
+                'apps.products.context_processors.fragments',
+            ],
+            # Producción: templates compilados una sola vez por proceso.
+            # En desarrollo se recargan en cada request.
+            'loaders': [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ] if DEBUG else [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
 ]
 
+# Fragmentos de templates cacheados ({% cache %}: navbar, sidebar de categorías).
+# La clave incluye FRAGMENT_CACHE_VERSION (por defecto el commit desplegado, que Render
+# expone en RENDER_GIT_COMMIT); el sidebar además la versión del catálogo (apps/products/services.py)
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+FRAGMENT_CACHE_VERSION = config('FRAGMENT_CACHE_VERSION', default=config('RENDER_GIT_COMMIT', default='dev')[:12])
+# Segundos que cada proceso reutiliza los contadores del home (tabla SiteCounter)
+SITE_COUNTERS_TTL = config('SITE_COUNTERS_TTL', default=60, cast=int)
+
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # ==========================================
@@ -164,7 +186,112 @@ else:
         }
     }
     print("✓ Usando SQLite (build/desarrollo)")
-    
+
+# Réplica de solo lectura: los GET leen de acá (ver config/db_router.py)
+REPLICA_DATABASE_URL = config('REPLICA_DATABASE_URL', default='')
+# Segundos que un cliente lee del primario después de escribir (read-your-writes)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        REPLICA_DATABASE_URL,
+        conn_max_age=600,
+        conn_health_checks=True
+    )
+    # En tests la réplica es un alias del primario
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['config.db_router.PrimaryReplicaRouter']
+    print("✓ Lecturas GET ruteadas a la réplica")
+
+# ==========================================
+# CACHE - Redis si existe REDIS_URL, memoria local si no
+# ==========================================
+# Con memoria local cada worker tiene su propio cache: la invalidación del usuario
+# detrás de los JWT (desactivación, cambio de rol o de staff) no llega a los demás
+# workers hasta JWT_USER_CACHE_TTL / ACCESS_TOKEN_LIFETIME. En producción con más
+# de un worker usar REDIS_URL (check --deploy avisa con config.W001).
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# ==========================================
+# COMPRESIÓN DE RESPUESTAS (config/compression.py)
+# ==========================================
+
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+# Debajo de esto (~un paquete TCP) comprimir no ahorra nada
+COMPRESSION_MIN_BYTES = config('COMPRESSION_MIN_BYTES', default=1024, cast=int)
+# Brotli (si el paquete está instalado); calidad 0-11, 4-5 es lo usual para respuestas dinámicas
+COMPRESSION_BROTLI = config('COMPRESSION_BROTLI', default=True, cast=bool)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=4, cast=int)
+# Además de estos, cualquier tipo +json o +xml
+COMPRESSION_CONTENT_TYPES = {
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/javascript', 'text/xml',
+    'application/json', 'application/javascript', 'application/xml', 'application/x-ndjson',
+    'image/svg+xml',
+}
+
+# ==========================================
+# MONITOREO - Consultas por request
+# ==========================================
+
+# Máximo de consultas por request antes de loguear un warning
+QUERY_BUDGET_DEFAULT = config('QUERY_BUDGET_DEFAULT', default=30, cast=int)
+# Presupuestos por ruta (nombre de la URL), p. ej. {'profile_dashboard': 20}
+QUERY_BUDGETS = {}
+# Repeticiones de una misma forma de SQL que se reportan como posible N+1
+N_PLUS_ONE_THRESHOLD = config('N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+# Header Server-Timing con consultas y tiempo de DB (expone datos internos)
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=DEBUG, cast=bool)
+
+# Consultas lentas (python manage.py slow_queries); 0 = apagado. Se activa por entorno
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', default=0, cast=float)
+# EXPLAIN de cada consulta lenta: corre dentro del request y el plan puede incluir
+# los valores de los parámetros (emails, tokens), así que solo al diagnosticar
+SLOW_QUERY_EXPLAIN = config('SLOW_QUERY_EXPLAIN', default=False, cast=bool)
+SLOW_QUERY_LOG_DIR = config('SLOW_QUERY_LOG_DIR', default=str(BASE_DIR / 'logs' / 'slow_queries'))
+SLOW_QUERY_LOG_MAX_BYTES = config('SLOW_QUERY_LOG_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+SLOW_QUERY_LOG_BACKUPS = config('SLOW_QUERY_LOG_BACKUPS', default=3, cast=int)
+
+# Trazas de requests en JSON de OTLP (apps/monitoring/tracing.py); 0 = solo con traceparent muestreado
+TRACE_SAMPLE_RATE = config('TRACE_SAMPLE_RATE', default=0.0, cast=float)
+TRACE_SERVICE_NAME = config('TRACE_SERVICE_NAME', default='nails-marketplace')
+TRACE_MAX_SPANS = config('TRACE_MAX_SPANS', default=2000, cast=int)
+TRACE_LOG_DIR = config('TRACE_LOG_DIR', default=str(BASE_DIR / 'logs' / 'traces'))
+TRACE_LOG_MAX_BYTES = config('TRACE_LOG_MAX_BYTES', default=50 * 1024 * 1024, cast=int)
+TRACE_LOG_BACKUPS = config('TRACE_LOG_BACKUPS', default=3, cast=int)
+
+# Grabación de tráfico para replay_traffic: fracción de requests (0 = apagado)
+TRAFFIC_RECORD_RATE = config('TRAFFIC_RECORD_RATE', default=0.0, cast=float)
+TRAFFIC_LOG_DIR = config('TRAFFIC_LOG_DIR', default=str(BASE_DIR / 'logs' / 'traffic'))
+TRAFFIC_LOG_MAX_BYTES = config('TRAFFIC_LOG_MAX_BYTES', default=20 * 1024 * 1024, cast=int)
+TRAFFIC_LOG_BACKUPS = config('TRAFFIC_LOG_BACKUPS', default=5, cast=int)
+
+# Métricas en formato Prometheus (GET /metrics/, solo staff)
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# Directorio compartido entre workers (gunicorn.conf.py define uno si no está); vacío = solo el proceso actual
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=5, cast=float)
+
+# Profiler bajo demanda (X-Profile: 1 o ?_profile=1 para staff; listado en /admin/profiles/)
+PROFILER_SAMPLE_EVERY = config('PROFILER_SAMPLE_EVERY', default=0, cast=int)  # 1 de cada N requests, 0 = apagado
+PROFILER_SAMPLE_INTERVAL = config('PROFILER_SAMPLE_INTERVAL', default=0.005, cast=float)  # segundos entre muestras de stack
+PROFILER_DIR = config('PROFILER_DIR', default=str(BASE_DIR / 'logs' / 'profiles'))
+PROFILER_MAX_FILES = config('PROFILER_MAX_FILES', default=50, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -195,16 +322,17 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static'] if (BASE_DIR / 'static').exists() else []
 
-# Storage backends (Django 4.2+)
+# Storage backends (Django 4.2+); "default" se define abajo según DEBUG
+# collectstatic genera nombres con hash de contenido y variantes .gz y .br (con Brotli instalado);
+# WhiteNoise sirve los archivos con hash con Cache-Control: immutable y max-age de 10 años.
+# Una referencia a un archivo que no está en el manifest es un error
+# (python manage.py check --deploy --tag staticfiles lo detecta en el build).
 STORAGES = {
     "staticfiles": {
-        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
 }
 
-# Compatibilidad con cloudinary_storage
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
-
 # Media files 
 MEDIA_URL = '/media/'
 
@@ -237,9 +365,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.User'
 
 # REST Framework
+# JSON de la API con orjson (config/renderers.py y parsers.py); False = los de DRF.
+# Sin orjson instalado los rápidos también caen en los de DRF
+API_FAST_JSON = config('API_FAST_JSON', default=True, cast=bool)
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.FastJSONRenderer' if API_FAST_JSON else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.FastJSONParser' if API_FAST_JSON else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -263,8 +404,12 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.ClaimsTokenObtainPairSerializer',
 }
 
+# Segundos que cada worker cachea el usuario completo detrás de un JWT
+JWT_USER_CACHE_TTL = config('JWT_USER_CACHE_TTL', default=30, cast=int)
+
 # CORS
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='').split(',') if config('CORS_ALLOWED_ORIGINS', default='') else []
 CORS_ALLOW_CREDENTIALS = True
@@ -288,7 +433,7 @@ if not DEBUG:
     print("✓ Modo PRODUCCIÓN activado")
     
     # HTTPS
-    SECURE_SSL_REDIRECT = True
+    SECURE_SSL_REDIRECT = config('SECURE_SSL_REDIRECT', default=True, cast=bool)
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
     
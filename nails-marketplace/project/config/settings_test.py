@@ -0,0 +1,14 @@
+"""
+Settings de los tests: los de producción con lo que los tests no pueden cumplir.
+Lo usan `python manage.py test` y pytest (pytest.ini).
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import STORAGES
+
+# Los tests corren con DEBUG=False y sin collectstatic: no hay manifest que leer
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
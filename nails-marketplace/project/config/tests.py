@@ -0,0 +1,345 @@
+import asyncio
+import datetime
+import gzip
+import io
+import json
+import tempfile
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.sessions.models import Session
+import brotli
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from apps.products.models import Product
+from .admin_tools import EstimatedCountPaginator
+from .checks import check_static_manifest
+from .compression import CompressionMiddleware, accepted_encodings
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .db_router import PIN_COOKIE, PrimaryReplicaRouter, ReplicaRoutingMiddleware, RoutingState, _routing
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """Router de lecturas a la réplica"""
+
+    router = PrimaryReplicaRouter()
+
+    def tearDown(self):
+        _routing.set(None)
+
+    def test_outside_requests_uses_primary(self):
+        self.assertEqual(self.router.db_for_read(Product), 'default')
+
+    def test_safe_request_reads_replica_until_write(self):
+        _routing.set(RoutingState(use_replica=True))
+        self.assertEqual(self.router.db_for_read(Product), 'replica')
+        self.assertEqual(self.router.db_for_read(Session), 'default')
+
+        self.assertEqual(self.router.db_for_write(Product), 'default')
+        self.assertEqual(self.router.db_for_read(Product), 'default')
+
+
+@override_settings(REPLICA_DATABASE_URL='sqlite:///replica.sqlite3')
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    """Decisión por request y read-your-writes"""
+
+    def run_request(self, request, write=False):
+        states = []
+
+        def view(request):
+            states.append(_routing.get().use_replica)
+            if write:
+                PrimaryReplicaRouter().db_for_write(Product)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        self.assertIsNone(_routing.get())
+        return states[0], response
+
+    def test_routing_by_request(self):
+        factory = RequestFactory()
+        self.assertTrue(self.run_request(factory.get('/products/'))[0])
+        self.assertFalse(self.run_request(factory.post('/products/'))[0])
+        self.assertFalse(self.run_request(factory.get('/admin/products/product/'))[0])
+
+    def test_write_pins_client_to_primary(self):
+        factory = RequestFactory()
+        _, response = self.run_request(factory.post('/cart/add/1/'), write=True)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        request = factory.get('/cart/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertFalse(self.run_request(request)[0])
+
+    def test_get_with_analytics_write_does_not_pin(self):
+        _, response = self.run_request(RequestFactory().get('/products/1/'), write=True)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+class StaticManifestCheckTests(SimpleTestCase):
+    """Chequeo de deploy de referencias {% static %} contra el manifest"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / 'templates').mkdir()
+        (self.root / 'templates' / 'page.html').write_text(
+            "{% load static %}\n<link href=\"{% static 'css/app.css' %}\">\n<script src=\"{% static 'js/missing.js' %}\">"
+        )
+        self.settings_override = override_settings(
+            STATIC_ROOT=self.root / 'static',
+            STORAGES={'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'}},
+            TEMPLATES=[{'BACKEND': 'django.template.backends.django.DjangoTemplates', 'DIRS': [self.root / 'templates']}],
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def write_manifest(self, paths):
+        (self.root / 'static').mkdir()
+        (self.root / 'static' / 'staticfiles.json').write_text(json.dumps({'paths': paths, 'version': '1.1'}))
+
+    def test_missing_manifest(self):
+        [error] = check_static_manifest(None)
+        self.assertEqual(error.id, 'config.E001')
+
+    def test_reference_missing_from_manifest(self):
+        self.write_manifest({'css/app.css': 'css/app.0123456789ab.css'})
+        [error] = check_static_manifest(None)
+        self.assertEqual(error.id, 'config.E002')
+        self.assertIn('page.html:3', error.msg)
+        self.assertIn('js/missing.js', error.msg)
+
+    def test_all_references_present(self):
+        self.write_manifest({'css/app.css': 'css/app.0123456789ab.css', 'js/missing.js': 'js/missing.0123456789ab.js'})
+        self.assertEqual(check_static_manifest(None), [])
+
+    @override_settings(STORAGES={'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})
+    def test_skipped_without_manifest_storage(self):
+        self.assertEqual(check_static_manifest(None), [])
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """Conteo estimado solo para listados grandes y sin filtros"""
+
+    def count(self, queryset):
+        return EstimatedCountPaginator(queryset, 100).count
+
+    @mock.patch('config.admin_tools.estimated_rows', return_value=2_000_000)
+    def test_unfiltered_uses_estimate(self, estimated_rows):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.count(Product.objects.all()), 2_000_000)
+
+    @mock.patch('config.admin_tools.estimated_rows', return_value=2_000_000)
+    def test_filtered_counts_exactly(self, estimated_rows):
+        self.assertEqual(self.count(Product.objects.filter(status='sold')), 0)
+        estimated_rows.assert_not_called()
+
+    @mock.patch('config.admin_tools.estimated_rows', return_value=500)
+    def test_small_table_counts_exactly(self, estimated_rows):
+        self.assertEqual(self.count(Product.objects.all()), 0)
+
+
+class FastJSONTests(SimpleTestCase):
+    """Renderer y parser con orjson: mismos bytes y mismos datos que los de DRF"""
+
+    data = {
+        'id': 7,
+        'price': '1500.00',
+        'amount': Decimal('12.50'),
+        'created_at': datetime.datetime(2025, 3, 1, 12, 30, 5, 120000, tzinfo=datetime.timezone.utc),
+        'expires_at': datetime.datetime(2025, 3, 1, 9, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-3))),
+        'date': datetime.date(2025, 3, 1),
+        'token': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'title': 'Esmalte ñandú \u2028 rosa',
+        'label': gettext_lazy('Disponible'),
+        'tags': ('gel', 'uv'),
+        'ids': {1: 'a'},
+        'big': 2 ** 70,
+        'results': [{'ok': True, 'rating': 4.8, 'missing': None}],
+    }
+
+    def assertSameRender(self, data, media_type=None, context=None):
+        expected = JSONRenderer().render(data, media_type, context)
+        self.assertEqual(FastJSONRenderer().render(data, media_type, context), expected)
+
+    def test_render_matches_drf(self):
+        small = {key: value for key, value in self.data.items() if key != 'big'}
+        self.assertSameRender(small)
+        self.assertSameRender(self.data)  # entero de 70 bits: lo resuelve el de DRF
+        self.assertSameRender(None)
+
+    def test_render_indent_and_browsable_context(self):
+        self.assertSameRender(self.data, 'application/json; indent=4')
+        self.assertSameRender(self.data, None, {'indent': 2})
+
+    def test_render_without_orjson(self):
+        with mock.patch('config.renderers.orjson', None):
+            self.assertSameRender(self.data)
+
+    def test_parse_matches_drf(self):
+        body = b'{"title": "Esmalte \\u00f1", "price": "1500.00", "qty": 3, "rating": 4.5, "big": 1180591620717411303424}'
+        parsed = FastJSONParser().parse(io.BytesIO(body))
+        self.assertEqual(parsed, JSONParser().parse(io.BytesIO(body)))
+        self.assertEqual(parsed['big'], 2 ** 70)
+
+    def test_parse_error_message(self):
+        for body in (b'{"title": ', b'{"rating": NaN}'):
+            with self.assertRaises(ParseError) as expected:
+                JSONParser().parse(io.BytesIO(body))
+            with self.assertRaises(ParseError) as fast:
+                FastJSONParser().parse(io.BytesIO(body))
+            self.assertEqual(str(fast.exception.detail), str(expected.exception.detail))
+
+
+class FastJSONApiTests(TestCase):
+    """Respuestas reales de la API: mismos bytes que con el renderer de DRF"""
+
+    def test_product_pages_match_drf(self):
+        from apps.products.models import Category
+        from apps.users.models import User
+
+        seller = User.objects.create(username='vendedora', email='vendedora@example.com')
+        category = Category.objects.create(name='Esmaltes', slug='esmaltes')
+        product = Product.objects.create(
+            seller=seller, category=category, title='Esmalte “rosa” ñ', description='Semipermanente',
+            price='1500.50', latitude='-34.603700', longitude='-58.381600'
+        )
+
+        for url in ('/api/v1/products/', f'/api/v1/products/{product.pk}/', '/api/v1/categories/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+            self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
+@override_settings(COMPRESSION_MIN_BYTES=1024)
+class CompressionMiddlewareTests(TestCase):
+    """Compresión de respuestas según tipo, tamaño y Accept-Encoding"""
+
+    body = json.dumps([{'id': n, 'title': f'Esmalte semipermanente {n}', 'price': '1500.00'} for n in range(100)]).encode()
+
+    def respond(self, response, accept='gzip, deflate, br'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=None, **kwargs):
+        response = HttpResponse(self.body if body is None else body, content_type='application/json', **kwargs)
+        response.headers['Content-Length'] = str(len(response.content))
+        return response
+
+    def test_brotli_preferred(self):
+        response = self.respond(self.json_response())
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_gzip_fallback(self):
+        for accept in ('gzip', 'br;q=0, gzip;q=0.8'):
+            response = self.respond(self.json_response(), accept)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(gzip.decompress(response.content), self.body)
+
+        with mock.patch('config.compression.brotli', None):
+            self.assertEqual(self.respond(self.json_response())['Content-Encoding'], 'gzip')
+
+    def test_skipped_responses(self):
+        small = self.respond(self.json_response(b'{"ok": true}'))
+        image = self.respond(HttpResponse(self.body, content_type='image/png'))
+        encoded = self.json_response()
+        encoded.headers['Content-Encoding'] = 'br'
+        no_transform = self.json_response()
+        no_transform.headers['Cache-Control'] = 'no-transform'
+
+        for response in (small, image, self.respond(encoded), self.respond(no_transform)):
+            self.assertNotEqual(response.get('Content-Encoding'), 'gzip')
+            self.assertIn(response.content, (self.body, b'{"ok": true}'))
+
+    def test_client_without_compression_gets_vary(self):
+        response = self.respond(self.json_response(), accept='identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.body)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_strong_etag_weakened(self):
+        response = self.json_response()
+        response.headers['ETag'] = '"abc"'
+        self.assertEqual(self.respond(response)['ETag'], 'W/"abc"')
+
+    def test_streaming_compressed_per_chunk(self):
+        rows = [f'{n},Esmalte {n},1500.00\n'.encode() for n in range(2000)]
+        for accept, decompress in (('br', brotli.decompress), ('gzip', gzip.decompress)):
+            response = self.respond(StreamingHttpResponse(iter(rows), content_type='text/csv'), accept)
+            chunks = list(response.streaming_content)
+            self.assertEqual(response['Content-Encoding'], accept)
+            self.assertFalse(response.has_header('Content-Length'))
+            self.assertGreater(len(chunks), 1)
+            self.assertEqual(decompress(b''.join(chunks)), b''.join(rows))
+
+    def test_async_streaming(self):
+        async def rows():
+            for n in range(500):
+                yield f'{{"id": {n}}}\n'.encode()
+
+        async def consume(response):
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        response = self.respond(StreamingHttpResponse(rows(), content_type='application/x-ndjson'), 'br')
+        body = brotli.decompress(asyncio.run(consume(response)))
+        self.assertEqual(body.count(b'\n'), 500)
+
+    def test_accept_encoding_parsing(self):
+        self.assertEqual(accepted_encodings('gzip;q=1.0, br; q=0, *;q=0.1'), {'gzip', '*'})
+
+    def test_html_never_uses_brotli(self):
+        # BREACH: el HTML lleva el token CSRF, solo gzip con relleno aleatorio
+        html = (b'<input name="csrfmiddlewaretoken" value="secreto">' + self.body)
+        sizes = set()
+        for _ in range(20):
+            response = self.respond(HttpResponse(html), 'gzip, br')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(gzip.decompress(response.content), html)
+            sizes.add(len(response.content))
+        self.assertGreater(len(sizes), 1)
+        self.assertFalse(self.respond(HttpResponse(html), 'br').has_header('Content-Encoding'))
+
+    def test_streaming_gzip_is_padded(self):
+        rows = [f'{n},Esmalte {n}\n'.encode() for n in range(500)]
+        sizes = set()
+        for _ in range(20):
+            response = self.respond(StreamingHttpResponse(iter(rows), content_type='text/csv'), 'gzip')
+            body = b''.join(response.streaming_content)
+            self.assertEqual(gzip.decompress(body), b''.join(rows))
+            sizes.add(len(body))
+        self.assertGreater(len(sizes), 1)
+
+    def test_installed_for_html_and_api(self):
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Nails', gzip.decompress(response.content))
+
+
+class HybridMiddlewareTests(SimpleTestCase):
+    """Los middlewares del proyecto no obligan a pasar las vistas async por un thread"""
+
+    def test_project_middleware_runs_async(self):
+        async def view(request):
+            return HttpResponse()
+
+        for path in settings.MIDDLEWARE:
+            if path.startswith(('apps.', 'config.')):
+                with self.subTest(path):
+                    middleware = import_string(path)
+                    self.assertTrue(middleware.async_capable)
+                    self.assertTrue(iscoroutinefunction(middleware(view)))
+                    self.assertFalse(iscoroutinefunction(middleware(lambda request: HttpResponse())))
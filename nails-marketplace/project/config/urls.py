@@ -16,13 +16,19 @@ from .views import (home_view,
                     add_to_cart,
                     remove_from_cart, 
                     update_cart_quantity)     
+from apps.products import async_views as catalog_async
+from apps.cart.views import cart_summary
+from apps.monitoring.views import metrics_view, profile_download, profile_list
 
 urlpatterns = [
     # Home
     path('', home_view, name='home'),
 
     # Admin
+    path('admin/profiles/', profile_list, name='profile_list'),
+    path('admin/profiles/<str:profile_id>.<str:extension>', profile_download, name='profile_download'),
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
 
     # AllAuth URLs
     path("accounts/", include("allauth.urls")),  
@@ -48,6 +54,12 @@ urlpatterns = [
     path('cart/remove/<int:item_id>/', remove_from_cart, name='remove_from_cart'),
     path('cart/update/<int:item_id>/', update_cart_quantity, name='update_cart_quantity'),
      
+    # API v1 async (lecturas calientes del catálogo, pensadas para ASGI)
+    path('api/v1/catalog/products/', catalog_async.product_list, name='catalog_products'),
+    path('api/v1/catalog/products/<int:pk>/', catalog_async.product_detail, name='catalog_product_detail'),
+    path('api/v1/catalog/categories/', catalog_async.category_list, name='catalog_categories'),
+    path('api/v1/cart/summary/', cart_summary, name='cart_summary'),
+
     # API v1
     path('api/v1/users/', include('apps.users.urls')),
     path('api/v1/', include('apps.products.urls'))
@@ -6,27 +6,15 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from apps.products.models import Category, Product, ProductView
 from apps.products.forms import ProductForm, ProductImage 
+from apps.products.services import get_site_counters
 from apps.cart.models import Cart, CartItem 
+from apps.cart.services import get_cart_count, refresh_cart_count
 from django.db.models import Q, Count
+from django.core.paginator import Paginator
+
+REVIEWS_PER_PAGE = 10
 
 
-def home_view(request):
-    """Vista principal del home"""
-    from django.contrib.auth import get_user_model
-    
-    User = get_user_model()
-    
-    # Contar usuarios y productos
-    total_users = User.objects.count()
-    total_products = Product.objects.filter(status='available').count()
-    
-    context = {
-        'total_users': total_users,
-        'total_products': total_products,
-    }
-    
-    return render(request, 'home/index.html', context)
-    
 def products_list_view(request):
     """Vista de listado de productos con filtros"""
     # Obtener todos los productos disponibles
@@ -358,11 +346,15 @@ def add_to_cart(request, product_id):
                     'success': False, 
                     'message': 'Stock insuficiente'
                 }, status=400)
+            # La cantidad de items no cambia, usar el contador cacheado
+            cart_count = get_cart_count(request.user)
+        else:
+            cart_count = refresh_cart_count(cart)
         
         return JsonResponse({
             'success': True,
             'message': 'Producto agregado al carrito',
-            'cart_count': cart.items.count()
+            'cart_count': cart_count
         })
     except Product.DoesNotExist:
         return JsonResponse({
@@ -377,13 +369,13 @@ def remove_from_cart(request, item_id):
     """Eliminar item del carrito"""
     try:
         cart = Cart.objects.get(user=request.user)
-        item = CartItem.objects.get(id=item_id, cart=cart)
+        item = cart.items.get(id=item_id)
         item.delete()
         
         return JsonResponse({
             'success': True,
             'message': 'Producto eliminado del carrito',
-            'cart_count': cart.items.count(),
+            'cart_count': refresh_cart_count(cart),
             'cart_total': float(cart.get_total())
         })
     except (Cart.DoesNotExist, CartItem.DoesNotExist):
@@ -434,14 +426,25 @@ def update_cart_quantity(request, item_id):
 # ============================================
 
 def home_view(request):
-    """Vista de la página principal"""
-    return render(request, 'home/index.html')
+    """Vista de la página principal (contadores aproximados, sin consultas de conteo)"""
+    counters = get_site_counters()
+    return render(request, 'home/index.html', {
+        'total_users': counters['users'],
+        'total_products': counters['available_products'],
+    })
 
 
 @login_required
 def profile_dashboard(request):
     """Dashboard del perfil"""
-    return render(request, 'profile/dashboard.html')
+    # Reseñas recibidas paginadas, con el revisor en la misma consulta
+    reviews = request.user.reviews_received.select_related('reviewer')
+    paginator = Paginator(reviews, REVIEWS_PER_PAGE)
+    reviews_page = paginator.get_page(request.GET.get('reviews_page'))
+    
+    return render(request, 'profile/dashboard.html', {
+        'reviews_page': reviews_page,
+    })
 
 
 @login_required
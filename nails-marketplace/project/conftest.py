@@ -0,0 +1,22 @@
+import pytest
+from apps.monitoring.queries import track_queries
+
+
+@pytest.fixture
+def query_ceiling(client):
+    """
+    Pedir un endpoint y fallar si supera un máximo de consultas.
+
+        def test_listado(query_ceiling):
+            query_ceiling('/api/v1/products/', 3)
+
+    El mensaje de error lista las formas de SQL más repetidas (N+1).
+    """
+    def check(url, ceiling, method='get', **kwargs):
+        with track_queries() as stats:
+            response = getattr(client, method)(url, **kwargs)
+        assert response.status_code < 500, f'{url} respondió {response.status_code}'
+        assert stats.count <= ceiling, f'{url} superó el máximo de {ceiling}: {stats.report()}'
+        return response
+
+    return check
@@ -0,0 +1,131 @@
+"""
+Configuración de gunicorn para producción.
+
+Uso: gunicorn -c gunicorn.conf.py   (o python manage.py boot -- -c gunicorn.conf.py)
+
+Variables de entorno:
+- GUNICORN_MODE: 'gthread' (default), 'sync' o 'asgi' (requiere uvicorn)
+- WEB_CONCURRENCY: cantidad fija de workers (si no, se calcula por CPU y memoria)
+- GUNICORN_THREADS: threads por worker en modo gthread (default 4)
+- GUNICORN_WORKER_MEMORY_MB: memoria estimada por worker (default 150)
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: reciclado de workers
+- GUNICORN_ACCESS_LOG: destino del log de accesos ('-' = stdout, vacío = desactivado)
+- PORT: puerto de escucha (Render lo define)
+- METRICS_DIR: directorio donde los workers comparten métricas (default: uno temporal por puerto)
+"""
+import os
+import tempfile
+
+
+def cpu_count():
+    """CPUs disponibles, respetando afinidad y cuota de cgroup (contenedores)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def memory_mb():
+    """Memoria disponible en MB (límite de cgroup o memoria física)"""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        # Sin límite: 'max' en cgroup v2, un número enorme en v1
+        if value.isdigit() and int(value) < 1 << 50:
+            return int(value) // (1024 * 1024)
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (ValueError, OSError):
+        return None
+
+
+def worker_count(mode, cpus, memory):
+    """Workers según el modo, limitados por la memoria disponible"""
+    if os.environ.get('WEB_CONCURRENCY'):
+        return int(os.environ['WEB_CONCURRENCY'])
+
+    if mode == 'sync':
+        workers = 2 * cpus + 1
+    elif mode == 'gthread':
+        workers = cpus + 1
+    else:
+        workers = cpus
+
+    if memory:
+        per_worker = int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', 150))
+        # Dejar ~20% para el master y el sistema
+        workers = min(workers, max(1, int(memory * 0.8) // per_worker))
+    return max(1, workers)
+
+
+mode = os.environ.get('GUNICORN_MODE', 'gthread')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Antes de cargar Django: todos los workers deben ver el mismo directorio de métricas
+os.environ.setdefault(
+    'METRICS_DIR', os.path.join(tempfile.gettempdir(), f"nails-metrics-{os.environ.get('PORT', '8000')}")
+)
+workers = worker_count(mode, cpu_count(), memory_mb())
+
+if mode == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+elif mode == 'gthread':
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+else:
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'sync'
+
+# Cargar Django en el master: los workers comparten memoria copy-on-write
+preload_app = True
+
+# Reciclar workers para acotar fugas de memoria; el jitter evita reinicios simultáneos
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# GUNICORN_ACCESS_LOG='' desactiva el log de accesos (útil en benchmarks)
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Cada worker abre sus propias conexiones a la base (no heredar las del master)"""
+    from django.db import connections
+    connections.close_all()
+
+
+def on_starting(server):
+    """Descartar las métricas de una corrida anterior"""
+    from apps.monitoring.metrics import clear_directory
+    clear_directory(os.environ['METRICS_DIR'])
+
+
+def worker_exit(server, worker):
+    """Último volcado de métricas del worker antes de salir"""
+    from apps.monitoring.metrics import registry
+    registry.flush(force=True)
+
+
+def child_exit(server, worker):
+    """Sumar las métricas del worker que terminó al archivo consolidado"""
+    from apps.monitoring.metrics import archive_process
+    archive_process(worker.pid, os.environ['METRICS_DIR'])